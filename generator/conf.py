@@ -19,9 +19,64 @@ OUTPUT_DIR_MODULE_DRIVER = PKG_ROOT.parent / "src/zhinst/qcodes/driver/modules/"
 MODULE_DRIVERS = ["BaseModule", "DAQModule", "ScopeModule", "SweeperModule"]
 TOOLKIT_MODULE_MODULE = "zhinst.toolkit.driver.modules"
 
+# Modules whose results can be recorded to a file with ``record_to``. Keys are
+# the names of the toolkit classes, values the recording mode (see
+# ``zhinst.qcodes.recording.Recorder``) and the name of the module in the
+# docstring examples.
+MODULE_RECORDING = {
+    "DAQModule": ("append", "daq_module"),
+    "ScopeModule": ("append", "scope_module"),
+    "SweeperModule": ("replace", "sweeper"),
+}
+
 # Typing
 # Weird typing infos that can be replaced with the right term
 TYPE_HINT_REPLACEMENTS = {
     "<built-in function array>": "np.array",
     "~Numpy2DArray": "np.ndarray",
 }
+
+# Functions that are implemented by a helper of the QCoDeS driver instead of
+# being forwarded to the toolkit object. The helper is called with the QCoDeS
+# node as first argument. Keys are either the function name or
+# "<toolkit class>.<function name>" (takes precedence).
+FUNCTION_HELPERS = {
+    "compile_sequencer_program": "sequencer.compile_sequencer_program",
+    "load_sequencer_program": "sequencer.load_sequencer_program",
+    "write_to_waveform_memory": "waveform_memory.write_to_waveform_memory",
+    "Generator.write_to_waveform_memory": "waveform_memory.write_pulses",
+    "read_from_waveform_memory": "waveform_memory.read_from_waveform_memory",
+    "Generator.read_from_waveform_memory": "waveform_memory.read_pulses",
+    "Readout.write_integration_weights": "waveform_memory.write_integration_weights",
+    "Readout.read_integration_weights": "waveform_memory.read_integration_weights",
+    "factory_reset": "waveform_memory.factory_reset",
+    "wait_done": "waiting.wait_done",
+}
+
+# Additional keyword only arguments of functions that are implemented by a
+# helper. Each argument is a tuple of name, type hint, default and docstring.
+# Keys follow the same rules as for FUNCTION_HELPERS.
+FUNCTION_EXTRA_ARGUMENTS = {
+    "write_to_waveform_memory": [
+        (
+            "force",
+            "bool",
+            "False",
+            "Flag if all waveforms should be uploaded, even the ones that did "
+            "not change since the last upload. (default = False)",
+        )
+    ],
+}
+
+# Helpers that return the parameter and value indicating that a node is done
+# (used to wait for the node without polling its ``wait_done`` function).
+# Keys are the toolkit class names.
+DONE_CONDITIONS = {
+    "AWG": "waiting.sequencer_done",
+    "AWGCore": "waiting.sequencer_done",
+    "Generator": "waiting.sequencer_done",
+    "Readout": "waiting.result_done",
+    "Spectroscopy": "waiting.result_done",
+    "SHFScope": "waiting.enable_done",
+    "PQSC": "waiting.execution_done",
+}
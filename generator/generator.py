@@ -3,6 +3,7 @@ from collections import namedtuple
 import typing
 import inspect
 import re
+import textwrap
 import importlib
 import jinja2
 import isort
@@ -202,6 +203,57 @@ def generate_parameter_info(parameters: list, class_type: object) -> list:
     return parameter_info, has_node_param
 
 
+def get_function_config(config: dict, class_name: str, name: str) -> typing.Any:
+    """Get the configuration of a function.
+
+    Args:
+        config (dict): configuration by "<class>.<function>" or "<function>".
+        class_name (str): name of the toolkit class.
+        name (str): name of the function.
+
+    Returns:
+        configuration of the function or None if the function has none.
+    """
+    return config.get(f"{class_name}.{name}", config.get(name))
+
+
+def add_extra_arguments(
+    signature_str: str, call_signature: str, docstring: str, arguments: list
+) -> typing.Tuple[str, str, str]:
+    """Add additional keyword only arguments to a function.
+
+    Args:
+        signature_str (str): signature of the function.
+        call_signature (str): arguments of the forwarded call.
+        docstring (str): docstring of the function.
+        arguments (list): additional arguments (name, type hint, default,
+            docstring).
+
+    Returns:
+        (str) updated signature
+        (str) updated call signature
+        (str) updated docstring
+    """
+    parameters, return_annotation = signature_str.rsplit(")", 1)
+    for name, type_hint, default, doc in arguments:
+        separator = ", " if "*" in parameters else ", *, "
+        parameters += f"{separator}{name}: {type_hint} = {default}"
+        call_signature += f", {name}={name}"
+        args_match = re.search(r"Args:\n( *)\S(.|\n)*?(?=\n\n|\n *$)", docstring)
+        if args_match:
+            indent = args_match.group(1)
+            doc_lines = textwrap.wrap(
+                f"{name}: {doc}",
+                width=80 - len(indent),
+                subsequent_indent="    ",
+            )
+            doc_str = "".join(f"\n{indent}{line}" for line in doc_lines)
+            docstring = (
+                docstring[: args_match.end()] + doc_str + docstring[args_match.end() :]
+            )
+    return parameters + ")" + return_annotation, call_signature, docstring
+
+
 def generate_functions_info(functions: list, toolkit_class: object) -> list:
     """Gather information for the functions.
 
@@ -270,14 +322,26 @@ def generate_functions_info(functions: list, toolkit_class: object) -> list:
             else:
                 call_parameter_str.append(f"{param}={param}")
         call_signature = ", ".join(call_parameter_str)
+        docstring = docstring if docstring else ""
+
+        extra_arguments = get_function_config(
+            conf.FUNCTION_EXTRA_ARGUMENTS, toolkit_class.__name__, name
+        )
+        if extra_arguments:
+            signature_str, call_signature, docstring = add_extra_arguments(
+                signature_str, call_signature, docstring, extra_arguments
+            )
 
         functions_info.append(
             {
                 "name": name,
                 "decorator": decorator,
                 "signature": signature_str,
-                "docstring": docstring if docstring else "",
+                "docstring": docstring,
                 "call_signature": call_signature,
+                "helper": get_function_config(
+                    conf.FUNCTION_HELPERS, toolkit_class.__name__, name
+                ),
                 "return_annotation": str(signature.return_annotation)
                 if signature.return_annotation
                 else "",
@@ -327,6 +391,7 @@ def generate_qcodes_class_info(
             "parameters": parameter_info,
             "has_node_param": has_node_param,
             "is_list": is_list_element,
+            "done_condition": conf.DONE_CONDITIONS.get(class_type.__name__),
         }
     )
     return gathered_info
@@ -425,6 +490,8 @@ def generate_qcodes_driver_modules(
         else "ZIBaseModule",
         "functions": function_info,
         "node_param": node_param,
+        "recording_mode": conf.MODULE_RECORDING.get(name, (None, None))[0],
+        "module_var": conf.MODULE_RECORDING.get(name, (None, None))[1],
     }
     templateLoader = jinja2.FileSystemLoader(searchpath=template_path)
     templateEnv = jinja2.Environment(loader=templateLoader)
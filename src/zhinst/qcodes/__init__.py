@@ -1,6 +1,9 @@
 """QCoDeS Drivers for Zurich Instruments devices."""
 
 from zhinst.qcodes.session import ZISession
+from zhinst.qcodes.nodetree_cache import NodetreeCache
+from zhinst.qcodes.async_session import AsyncSession
+from zhinst.qcodes.sequencer import CompileCache
 from zhinst.qcodes.device_creator import (
     HDAWG,
     MFLI,
@@ -31,6 +34,9 @@ except ModuleNotFoundError:
 
 __all__ = [
     "ZISession",
+    "NodetreeCache",
+    "AsyncSession",
+    "CompileCache",
     "HDAWG",
     "MFLI",
     "MFIA",
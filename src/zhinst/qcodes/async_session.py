@@ -0,0 +1,287 @@
+"""asyncio facade for the session and the device drivers."""
+import asyncio
+import functools
+import typing as t
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+from zhinst.toolkit.session import PollFlags
+
+from zhinst.qcodes.qcodes_adaptions import ZIParameter
+from zhinst.qcodes.waiting import NodeWaiter, done_condition
+
+if t.TYPE_CHECKING:
+    import zhinst.qcodes.driver.devices as ZIDevices
+    from zhinst.qcodes.session import Session
+
+T = t.TypeVar("T")
+
+
+class AsyncSession:
+    """asyncio facade for a session to a data server.
+
+    All blocking calls to the data server are executed in a dedicated
+    executor (by default a single worker thread, which guarantees that the
+    underlying connection is never used concurrently). Waiting functions do
+    not block the executor while waiting. If the session has a node waiter
+    the wait is executed in the default executor of the event loop and wakes
+    up on the value change of the node. Otherwise the awaited condition is
+    checked with a single get and the coroutine sleeps asynchronously
+    between the checks. An event loop can therefore wait for many devices at
+    the same time.
+
+    Examples:
+        >>> async_session = AsyncSession(ZISession("localhost"))
+        >>> await asyncio.gather(
+        ...     async_session.wait_done(hdawg.awgs[0]),
+        ...     async_session.wait_done(shfqa.qachannels[0].readout),
+        ... )
+
+    Args:
+        session: Session to the data server.
+        executor: Executor in which the blocking calls are executed. If not
+            specified a single threaded executor is created. (default = None)
+    """
+
+    def __init__(self, session: "Session", *, executor: t.Optional[Executor] = None):
+        self._session = session
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="zhinst-qcodes"
+        )
+
+    async def __aenter__(self) -> "AsyncSession":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the executor (if it was created by this object)."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    async def run(self, function: t.Callable[..., T], *args, **kwargs) -> T:
+        """Run an arbitrary blocking function in the executor.
+
+        Args:
+            function: Blocking function (e.g. a driver function).
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            Return value of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs)
+        )
+
+    async def connect_device(self, serial: str, **kwargs) -> "ZIDevices.DeviceType":
+        """Establish a connection to a device.
+
+        Args:
+            serial: Serial number of the device, e.g. *'dev12000'*.
+            **kwargs: Forwarded to :meth:`Session.connect_device`.
+
+        Returns:
+            Device object
+        """
+        return await self.run(self._session.connect_device, serial, **kwargs)
+
+    async def sync(self) -> None:
+        """Synchronize all connected devices (see :meth:`Session.sync`)."""
+        return await self.run(self._session.sync)
+
+    async def poll(
+        self,
+        recording_time: float = 0.1,
+        timeout: float = 0.5,
+        flags: PollFlags = PollFlags.DEFAULT,
+    ) -> t.Dict[ZIParameter, t.Dict[str, t.Any]]:
+        """Polls all subscribed data (see :meth:`Session.poll`).
+
+        Args:
+            recording_time: defines the duration of the poll. (default = 0.1)
+            timeout: Adds an additional timeout in seconds on top of
+                `recording_time`. (default = 0.5)
+            flags: Flags for the polling (see :class `PollFlags`:)
+
+        Returns:
+            Polled data in a dictionary.
+        """
+        return await self.run(
+            self._session.poll,
+            recording_time=recording_time,
+            timeout=timeout,
+            flags=flags,
+        )
+
+    async def poll_columnar(
+        self,
+        recording_time: float = 0.1,
+        timeout: float = 0.5,
+        flags: PollFlags = PollFlags.DEFAULT,
+    ) -> t.Dict[ZIParameter, t.Any]:
+        """Polls all subscribed data (see :meth:`Session.poll_columnar`).
+
+        Args:
+            recording_time: defines the duration of the poll. (default = 0.1)
+            timeout: Adds an additional timeout in seconds on top of
+                `recording_time`. (default = 0.5)
+            flags: Flags for the polling (see :class `PollFlags`:)
+
+        Returns:
+            Polled data in a dictionary.
+        """
+        return await self.run(
+            self._session.poll_columnar,
+            recording_time=recording_time,
+            timeout=timeout,
+            flags=flags,
+        )
+
+    async def get(self, parameter: ZIParameter, **kwargs) -> t.Any:
+        """Get the value of a parameter.
+
+        Args:
+            parameter: QCoDeS parameter.
+            **kwargs: Forwarded to the get of the parameter (e.g. deep).
+
+        Returns:
+            Value of the parameter.
+        """
+        return await self.run(parameter, **kwargs)
+
+    async def set(self, parameter: ZIParameter, value: t.Any, **kwargs) -> t.Any:
+        """Set the value of a parameter.
+
+        Args:
+            parameter: QCoDeS parameter.
+            value: Value that should be set.
+            **kwargs: Forwarded to the set of the parameter (e.g. deep).
+
+        Returns:
+            Acknowledged value if the set was deep.
+        """
+        return await self.run(parameter, value, **kwargs)
+
+    async def wait_for_state_change(
+        self,
+        parameter: ZIParameter,
+        value: int,
+        *,
+        invert: bool = False,
+        timeout: float = 2,
+        sleep_time: float = 0.005,
+    ) -> None:
+        """Waits until the node has the expected state/value.
+
+        WARNING: Only supports integer values as reference.
+
+        Args:
+            parameter: QCoDeS parameter.
+            value: expected value of the node.
+            invert: Instead of waiting for the value, the function will wait for
+                any value except the passed value instead. (default = False)
+            timeout: max wait time. (default = 2)
+            sleep_time: sleep interval in seconds. (default = 0.005)
+
+        Raises:
+            TimeoutError: If the node did not change to the expected value
+                within the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = getattr(self._session, "node_waiter", None)
+        if isinstance(waiter, NodeWaiter) and waiter.enabled:
+            # The default executor keeps the session executor free while waiting.
+            await loop.run_in_executor(
+                None,
+                functools.partial(
+                    waiter.wait_for_state_change,
+                    parameter,
+                    value,
+                    invert=invert,
+                    timeout=timeout,
+                    sleep_time=sleep_time,
+                ),
+            )
+            return
+        deadline = loop.time() + timeout
+        while True:
+            current_value = await self.run(parameter, enum=False)
+            if (current_value == value) != invert:
+                return
+            if loop.time() >= deadline:
+                raise TimeoutError(
+                    f"{parameter.zi_node} did not change to the expected value "
+                    f"within {timeout}s. {value} "
+                    f"{'==' if invert else '!='} {current_value}"
+                )
+            await asyncio.sleep(sleep_time)
+
+    async def wait_done(
+        self, node: t.Any, *, timeout: float = 10, sleep_time: float = 0.005
+    ) -> None:
+        """Wait until a node is finished.
+
+        Supports every driver object with a ``wait_done`` function, e.g. AWG
+        cores, generators, readout, spectroscopy, SHF scopes, the PQSC and
+        LabOne modules. Objects with an unknown done condition execute their
+        blocking ``wait_done`` in the executor.
+
+        Args:
+            node: Driver object to wait for.
+            timeout: The maximum waiting time in seconds. (default = 10)
+            sleep_time: Sleep interval in seconds. (default = 0.005)
+
+        Raises:
+            RuntimeError: If an AWG core is in continuous mode.
+            TimeoutError: If the node did not finish within the timeout.
+        """
+        if hasattr(node, "raw_module"):
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while not await self.run(node.raw_module.finished):
+                if loop.time() >= deadline:
+                    raise TimeoutError(f"{node.name} timed out.")
+                await asyncio.sleep(sleep_time)
+            return
+        condition = await self.run(done_condition, node)
+        if condition is None:
+            await self.run(node.wait_done, timeout=timeout, sleep_time=sleep_time)
+            return
+        parameter, value = condition
+        await self.wait_for_state_change(
+            parameter, value, timeout=timeout, sleep_time=sleep_time
+        )
+
+    async def read(self, node: t.Any, *, timeout: float = 10) -> t.Any:
+        """Wait until the recording is finished and read the data.
+
+        Asynchronous variant of the ``read`` function of the ``Readout`` and
+        ``Spectroscopy`` nodes.
+
+        Args:
+            node: Readout or Spectroscopy node.
+            timeout: Maximum time to wait for data in seconds. (default = 10)
+
+        Returns:
+            Result logger data.
+        """
+        await self.wait_done(node, timeout=timeout, sleep_time=0.05)
+        return await self.run(node.read, timeout=timeout)
+
+    async def enable_sequencer(self, node: t.Any, *, single: bool) -> None:
+        """Starts the sequencer of an AWG core.
+
+        Args:
+            node: AWG core or generator.
+            single: Flag if the sequencer should be disabled after finishing
+                execution.
+        """
+        return await self.run(node.enable_sequencer, single=single)
+
+    @property
+    def session(self) -> "Session":
+        """Underlying synchronous session."""
+        return self._session
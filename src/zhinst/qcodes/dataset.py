@@ -0,0 +1,293 @@
+"""Writing of streamed node data into QCoDeS datasets."""
+import threading
+import time
+import typing as t
+import warnings
+
+import numpy as np
+from qcodes.dataset.measurements import DataSaver, Measurement
+from zhinst.toolkit.session import PollFlags
+
+from zhinst.qcodes.qcodes_adaptions import ZIParameter
+from zhinst.qcodes.streaming import Stream, to_structured_array
+
+if t.TYPE_CHECKING:
+    from qcodes.dataset.data_set_protocol import DataSetProtocol
+    from qcodes.dataset.experiment_container import Experiment
+    from qcodes.station import Station
+
+    from zhinst.qcodes.session import Session
+
+
+class DatasetWriter:
+    """Writes the streamed data of parameters into a QCoDeS dataset.
+
+    The data of the parameters is collected in the ring buffers of a
+    :class:`Stream` (polled on a dedicated connection or fed with the results
+    of ``Session.poll``). A background thread periodically drains the
+    buffers and inserts the new samples of each parameter with a single
+    ``add_result`` call. Instead of one database row per sample there is
+    therefore only one row per parameter and write interval, which keeps up
+    with demodulator rates of several hundred kSa/s.
+
+    Each column of the streamed data (e.g. ``x``, ``y`` and ``frequency`` of
+    a demodulator sample) is registered as array valued QCoDeS parameter
+    named ``<parameter full name>_<column>`` with the ``timestamp`` column as
+    setpoint, the same layout a ``ParameterWithSetpoints`` results in. Since
+    the columns are only known once data arrives, the measurement is started
+    as soon as every parameter delivered data (or after the registration
+    timeout).
+
+    The writer can be used as a context manager.
+
+    Examples:
+        >>> device.demods[0].enable(True)
+        >>> with session.start_dataset_writer([device.demods[0].sample]) as writer:
+        ...     time.sleep(10)
+        >>> writer.dataset.get_parameter_data()
+
+    Args:
+        session: Session to the data server.
+        parameters: Parameters that should be written.
+        name: Name of the measurement. (default = "zhinst_stream")
+        experiment: Experiment of the dataset. If not specified the default
+            experiment is used. (default = None)
+        station: Station of the measurement. (default = None)
+        poll: Flag if the parameters should be polled on a dedicated
+            connection. If False the data needs to be passed to :meth:`write`.
+            (default = True)
+        buffer_size: Number of samples each ring buffer holds. Unwritten
+            samples are overwritten (and counted as overflow) once the buffer
+            is full. (default = 1_000_000)
+        write_interval: Time in seconds between two inserts into the dataset.
+            (default = 0.5)
+        registration_timeout: Maximum time in seconds to wait for the data of
+            all parameters before the measurement is started. Parameters
+            without data are not written. (default = 1)
+        recording_time: Duration of a single poll in seconds.
+            (default = 0.05)
+        timeout: Additional timeout in seconds for a single poll.
+            (default = 0.1)
+        flags: Flags for the polling (see :class `PollFlags`:)
+    """
+
+    def __init__(
+        self,
+        session: "Session",
+        parameters: t.Iterable[ZIParameter],
+        *,
+        name: str = "zhinst_stream",
+        experiment: t.Optional["Experiment"] = None,
+        station: t.Optional["Station"] = None,
+        poll: bool = True,
+        buffer_size: int = 1_000_000,
+        write_interval: float = 0.5,
+        registration_timeout: float = 1,
+        recording_time: float = 0.05,
+        timeout: float = 0.1,
+        flags: PollFlags = PollFlags.DEFAULT,
+    ):
+        self._parameters = {
+            parameter.zi_node.lower(): parameter for parameter in parameters
+        }
+        self._stream = Stream(
+            session,
+            self._parameters.values(),
+            buffer_size=buffer_size,
+            recording_time=recording_time,
+            timeout=timeout,
+            flags=flags,
+        )
+        self._name = name
+        self._experiment = experiment
+        self._station = station
+        self._poll = poll
+        self._write_interval = write_interval
+        self._registration_timeout = registration_timeout
+        self._columns: t.Dict[ZIParameter, t.Tuple[str, ...]] = {}
+        self._dataset: t.Optional["DataSetProtocol"] = None
+        self._samples = 0
+        self._thread: t.Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._exception: t.Optional[Exception] = None
+
+    def __enter__(self) -> "DatasetWriter":
+        if not self.is_running:
+            self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Start the polling (if enabled) and the writer thread.
+
+        Raises:
+            RuntimeError: If the writer is already running.
+        """
+        if self.is_running:
+            raise RuntimeError("The dataset writer is already running.")
+        if self._poll:
+            self._stream.start()
+        self._exception = None
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="zhinst-qcodes-dataset-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling, write the remaining data and finish the dataset.
+
+        Raises:
+            Exception: The exception that terminated the polling or the writer
+                thread (if any).
+        """
+        try:
+            if self._poll:
+                self._stream.stop()
+        finally:
+            self._stop_event.set()
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+        if self._exception is not None:
+            exception, self._exception = self._exception, None
+            raise exception
+
+    def write(self, polled_data: t.Mapping[t.Any, t.Any]) -> None:
+        """Add polled data to the buffers of the writer.
+
+        Data of nodes that are not written by the writer is ignored.
+
+        Args:
+            polled_data: Result of ``Session.poll`` (or a flat poll of
+                ``zhinst.core``).
+
+        Raises:
+            TypeError: If the data of a parameter can not be converted into
+                a table of samples.
+        """
+        for key, data in polled_data.items():
+            path = getattr(key, "zi_node", key)
+            parameter = self._parameters.get(str(path).lower())
+            if parameter is None:
+                continue
+            samples = to_structured_array(data)
+            if samples is None:
+                raise TypeError(
+                    f"The data of {parameter.zi_node} can not be written into a "
+                    "dataset."
+                )
+            self._stream.buffers[parameter].append(samples)
+
+    def _run(self) -> None:
+        """Write loop of the background thread."""
+        try:
+            pending: t.Dict[ZIParameter, t.List[np.ndarray]] = {
+                parameter: [] for parameter in self._parameters.values()
+            }
+            deadline = time.monotonic() + self._registration_timeout
+            stopping = False
+            while not all(pending.values()):
+                if stopping or time.monotonic() >= deadline:
+                    break
+                stopping = self._stop_event.wait(self._write_interval)
+                for parameter, samples in self._drain():
+                    pending[parameter].append(samples)
+            if not any(pending.values()):
+                return
+            measurement = self._measurement(pending)
+            with measurement.run() as datasaver:
+                self._dataset = datasaver.dataset
+                for parameter, chunks in pending.items():
+                    for samples in chunks:
+                        self._add_result(datasaver, parameter, samples)
+                pending.clear()
+                while not stopping:
+                    stopping = self._stop_event.wait(self._write_interval)
+                    for parameter, samples in self._drain():
+                        self._add_result(datasaver, parameter, samples)
+        except Exception as e:
+            self._exception = e
+
+    def _drain(self) -> t.Iterator[t.Tuple[ZIParameter, np.ndarray]]:
+        """Unread samples of all parameters (parameters without data omitted)."""
+        for parameter, samples in self._stream.drain().items():
+            if len(samples):
+                yield parameter, samples
+
+    def _measurement(
+        self, pending: t.Dict[ZIParameter, t.List[np.ndarray]]
+    ) -> Measurement:
+        """Measurement with the columns of all parameters that have data."""
+        measurement = Measurement(
+            exp=self._experiment, station=self._station, name=self._name
+        )
+        for parameter, chunks in pending.items():
+            if not chunks:
+                warnings.warn(
+                    f"{parameter.zi_node} did not deliver any data within the "
+                    "registration timeout and is not written to the dataset."
+                )
+                continue
+            columns = chunks[0].dtype.names or ()
+            self._columns[parameter] = columns
+            # Compact parameters have no label
+            label = getattr(parameter, "label", parameter.name)
+            setpoints: t.Tuple[str, ...] = tuple()
+            if "timestamp" in columns:
+                setpoints = (self._column_name(parameter, "timestamp"),)
+                measurement.register_custom_parameter(
+                    setpoints[0], label="Timestamp", paramtype="array"
+                )
+            for column in columns:
+                if column == "timestamp":
+                    continue
+                measurement.register_custom_parameter(
+                    self._column_name(parameter, column),
+                    label=f"{label} {column}",
+                    setpoints=setpoints,
+                    paramtype="array",
+                )
+        return measurement
+
+    @staticmethod
+    def _column_name(parameter: ZIParameter, column: str) -> str:
+        """Name of the QCoDeS parameter of a column."""
+        return f"{parameter.full_name}_{column}"
+
+    def _add_result(
+        self, datasaver: DataSaver, parameter: ZIParameter, samples: np.ndarray
+    ) -> None:
+        """Insert the samples of a parameter with a single call."""
+        columns = self._columns.get(parameter)
+        if columns is None:
+            return
+        datasaver.add_result(
+            *(
+                (self._column_name(parameter, column), samples[column])
+                for column in columns
+            )
+        )
+        self._samples += len(samples)
+
+    @property
+    def dataset(self) -> t.Optional["DataSetProtocol"]:
+        """Dataset the data is written to (None before the measurement starts)."""
+        return self._dataset
+
+    @property
+    def samples(self) -> int:
+        """Number of samples that were written."""
+        return self._samples
+
+    @property
+    def overflows(self) -> t.Dict[ZIParameter, int]:
+        """Number of samples for each parameter that were lost."""
+        return self._stream.overflows
+
+    @property
+    def is_running(self) -> bool:
+        """Flag if the writer thread is running."""
+        return self._thread is not None and self._thread.is_alive()
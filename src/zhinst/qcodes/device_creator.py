@@ -29,6 +29,10 @@ class ZIDevice(ZIBaseInstrument):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -48,11 +52,15 @@ class ZIDevice(ZIBaseInstrument):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -70,6 +78,10 @@ class SHFQA(SHFQADriver):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -89,11 +101,15 @@ class SHFQA(SHFQADriver):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -111,6 +127,10 @@ class SHFSG(SHFSGDriver):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -130,11 +150,15 @@ class SHFSG(SHFSGDriver):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -152,6 +176,10 @@ class HDAWG(HDAWGDriver):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -171,11 +199,15 @@ class HDAWG(HDAWGDriver):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -193,6 +225,10 @@ class PQSC(PQSCDriver):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -212,11 +248,15 @@ class PQSC(PQSCDriver):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -234,6 +274,10 @@ class SHFQC(SHFQCDriver):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -253,11 +297,15 @@ class SHFQC(SHFQCDriver):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -275,6 +323,10 @@ class UHFLI(UHFLIDriver):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -294,11 +346,15 @@ class UHFLI(UHFLIDriver):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -316,6 +372,10 @@ class UHFQA(UHFQADriver):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -335,11 +395,15 @@ class UHFQA(UHFQADriver):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -357,6 +421,10 @@ class MFLI(ZIBaseInstrument):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -376,11 +444,15 @@ class MFLI(ZIBaseInstrument):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -398,6 +470,10 @@ class MFIA(ZIBaseInstrument):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -417,11 +493,15 @@ class MFIA(ZIBaseInstrument):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=False, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
 
 
@@ -439,6 +519,10 @@ class HF2(ZIBaseInstrument):
         name: Name of the instrument in qcodes.
         raw: Flag if qcodes instance should only created with the nodes and
             not forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters should only be created once they
+            are accessed for the first time. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters. (default = False)
         new_session: By default zhinst-qcodes reuses already existing data
             server session (within itself only), meaning only one session to a
             data server exists. Setting the flag will create a new session.
@@ -458,9 +542,13 @@ class HF2(ZIBaseInstrument):
         interface: t.Optional[str] = None,
         name=None,
         raw=False,
+        lazy=False,
+        compact=False,
         new_session: bool = False,
     ):
         session = ZISession(host, port, hf2=True, new_session=new_session)
         tk_device = session.toolkit_session.connect_device(serial, interface=interface)
-        super().__init__(tk_device, session, name=name, raw=raw)
+        super().__init__(
+            tk_device, session, name=name, raw=raw, lazy=lazy, compact=compact
+        )
         session.devices[self.serial] = self
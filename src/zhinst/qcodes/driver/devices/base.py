@@ -1,9 +1,21 @@
 """Base modules for the Zurich Instrument specific QCoDeS driver."""
 import typing as t
+from contextlib import contextmanager
+from datetime import datetime
 
 from zhinst.toolkit.driver.devices import DeviceType
 
-from zhinst.qcodes.qcodes_adaptions import init_nodetree, ZIInstrument
+from zhinst.qcodes import waveform_memory
+from zhinst.qcodes.qcodes_adaptions import (
+    cache_transaction,
+    get_entry_value,
+    init_nodetree,
+    NodeDict,
+    tk_node_to_parameter,
+    ZICompactParameter,
+    ZIInstrument,
+    ZIParameter,
+)
 
 if t.TYPE_CHECKING:
     from zhinst.qcodes.session import ZISession, Session
@@ -24,6 +36,13 @@ class ZIBaseInstrument(ZIInstrument):
         name: Name of the instrument in qcodes. (default = "zi_{dev_type}_{serial}")
         raw: Flag if qcodes instance should only created with the nodes and not
             forwarding the toolkit functions. (default = False)
+        lazy: Flag if the QCoDeS parameters and submodules should only be
+            created once they are accessed for the first time. Speeds up the
+            creation of devices with a large nodetree. (default = False)
+        compact: Flag if lightweight parameters should be created instead of
+            QCoDeS parameters (see :class:`ZICompactParameter`). Reduces the
+            memory usage of devices with a large nodetree. Always used for raw
+            devices. (default = False)
     """
 
     def __init__(
@@ -32,6 +51,8 @@ class ZIBaseInstrument(ZIInstrument):
         session: t.Union["ZISession", "Session", "Instrument"],
         name: t.Optional[str] = None,
         raw: bool = False,
+        lazy: bool = False,
+        compact: bool = False,
     ):
         self._tk_object = tk_object
         self._session = session
@@ -43,7 +64,17 @@ class ZIBaseInstrument(ZIInstrument):
 
         if not raw:
             self._init_additional_nodes()
-        init_nodetree(self, self._tk_object.root, self._snapshot_cache)
+        nodetree_cache = getattr(session, "nodetree_cache", None)
+        init_nodetree(
+            self,
+            self._tk_object.root,
+            self._snapshot_cache,
+            lazy=lazy,
+            compact=compact or raw,
+            skeleton=nodetree_cache.skeleton(self._tk_object)
+            if nodetree_cache
+            else None,
+        )
 
     def get_idn(self) -> t.Dict[str, t.Optional[str]]:
         """Fake a standard VISA ``*IDN?`` response."""
@@ -65,7 +96,7 @@ class ZIBaseInstrument(ZIInstrument):
                 should be performed between the device and the data
                 server after loading the factory preset (default: True).
         """
-        return self._tk_object.factory_reset(deep=deep)
+        return waveform_memory.factory_reset(self, deep=deep)
 
     def check_compatibility(self) -> None:
         """Check if the software stack is compatible.
@@ -85,11 +116,122 @@ class ZIBaseInstrument(ZIInstrument):
         """
         self._tk_object.check_compatibility
 
+    def get(self, param_name: str) -> t.Any:
+        """Get the value of a parameter.
+
+        Besides the QCoDeS name of a parameter also node paths relative to the
+        device are supported. Paths with wildcards are resolved with a single
+        get to the data server.
+
+        Examples:
+            >>> device.get("oscs/*/freq")
+            {'/dev1234/oscs/0/freq': 10e6, '/dev1234/oscs/1/freq': 12e6}
+
+        Args:
+            param_name: Name of the parameter or node path relative to the
+                device (e.g. "oscs/*/freq").
+
+        Returns:
+            Value of the parameter. For a path with wildcards a
+            :class:`NodeDict` with the values of all matching parameters.
+        """
+        if "/" not in param_name and "*" not in param_name:
+            return super().get(param_name)
+        result = self._get_paths(f"/{self.serial}/{param_name.strip('/')}")
+        if "*" in param_name:
+            return result
+        return next(iter(result.to_dict().values()))
+
+    def get_many(
+        self,
+        parameters: t.Iterable[t.Union[ZIParameter, ZICompactParameter]],
+        *,
+        enum: bool = True,
+        parse: bool = True,
+    ) -> NodeDict:
+        """Get the values of multiple parameters with a single request.
+
+        The QCoDeS cache of every parameter is updated.
+
+        Examples:
+            >>> result = device.get_many([device.oscs[0].freq, device.sigouts[0].on])
+            >>> result[device.oscs[0].freq]
+            10e6
+
+        Args:
+            parameters: Parameters of the device.
+            enum: Flag if enumerated values should return the enum value as
+                string or return the raw number. (default = True)
+            parse: Flag if the GetParser, if present, should be applied or
+                not. (default = True)
+
+        Returns:
+            Values of the parameters. Can be indexed with the parameters or
+            their node paths.
+        """
+        by_path = {parameter.zi_node.lower(): parameter for parameter in parameters}
+        if not by_path:
+            return NodeDict({})
+        return self._get_paths(",".join(by_path), by_path, enum=enum, parse=parse)
+
+    def _get_paths(
+        self,
+        path: str,
+        parameters: t.Optional[t.Dict[str, t.Any]] = None,
+        *,
+        enum: bool = True,
+        parse: bool = True,
+    ) -> NodeDict:
+        """Get the values of one or multiple node paths with a single request.
+
+        Args:
+            path: Node path(s). Multiple paths are separated by a comma and
+                may contain wildcards.
+            parameters: Known parameters of the paths. The parameters of all
+                other paths are resolved from the nodetree. (default = None)
+            enum: Flag if enumerated values should return the enum value as
+                string or return the raw number. (default = True)
+            parse: Flag if the GetParser, if present, should be applied or
+                not. (default = True)
+
+        Returns:
+            Values of the paths.
+
+        Raises:
+            KeyError: If the path does not resolve to at least one node.
+        """
+        parameters = parameters or {}
+        root = self._tk_object.root
+        raw_result = root.connection.get(path, flat=True, settingsonly=False)
+        if not raw_result:
+            raise KeyError(path)
+        timestamp = datetime.now()
+        result = {}
+        for node_path, raw_value in raw_result.items():
+            node_path = node_path.lower()
+            tk_node = root.raw_path_to_node(node_path)
+            value = tk_node._parse_get_value(
+                get_entry_value(raw_value), enum=enum, parse=parse
+            )
+            parameter = parameters.get(node_path)
+            if parameter is None:
+                try:
+                    parameter = tk_node_to_parameter(self, tk_node)
+                except (KeyError, IndexError):
+                    parameter = None
+            if parameter is not None:
+                parameter.cache._update_with(
+                    value=value, raw_value=value, timestamp=timestamp
+                )
+            result[node_path] = value
+        return NodeDict(result)
+
     def get_streamingnodes(self) -> list:
         """Create a dictionary with all streaming nodes available."""
         return self._tk_object.get_streamingnodes()
 
-    def set_transaction(self):
+    @contextmanager
+    def set_transaction(self, *, skip_unchanged: bool = False) -> t.Iterator[None]:
         """Context manager for a transactional set.
 
         Can be used as a context in a with statement and bundles all node set
@@ -101,6 +243,10 @@ class ZIBaseInstrument(ZIInstrument):
         (All other operations, e.g. getting the value of a node, will not be
         affected)
 
+        The validation and the cache update of the QCoDeS parameters are
+        done once per parameter when the transaction is committed. If the
+        transaction fails the caches are left untouched.
+
         Warning:
             The set is always performed as deep set if called on device nodes.
 
@@ -108,8 +254,18 @@ class ZIBaseInstrument(ZIInstrument):
             >>> with device.set_transaction():
                     device.test[0].a(1)
                     device.test[1].a(2)
+
+        Args:
+            skip_unchanged: Flag if sets of values that are known to be
+                unchanged should be skipped (see :attr:`set_if_changed`).
+                (default = False)
         """
-        return self._tk_object.set_transaction()
+        with cache_transaction(
+            [self._tk_object.root], skip_unchanged=skip_unchanged
+        ) as transaction:
+            with self._tk_object.set_transaction():
+                yield
+                transaction.validate()
 
     @property
     def serial(self) -> str:
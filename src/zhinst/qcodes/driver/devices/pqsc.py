@@ -1,5 +1,6 @@
 """Autogenerated module for the PQSC QCoDeS driver."""
 from typing import List, Union
+from zhinst.qcodes import waiting
 from zhinst.qcodes.driver.devices.base import ZIBaseInstrument
 
 
@@ -93,7 +94,7 @@ class PQSC(ZIBaseInstrument):
             TimeoutError: If the PQSC is not done sending out all
                 triggers and processing feedback before the timeout.
         """
-        return self._tk_object.wait_done(timeout=timeout, sleep_time=sleep_time)
+        return waiting.wait_done(self, timeout=timeout, sleep_time=sleep_time)
 
     def check_ref_clock(self, *, timeout: int = 30, sleep_time: int = 1) -> bool:
         """Check if reference clock is locked successfully.
@@ -137,3 +138,7 @@ class PQSC(ZIBaseInstrument):
         return self._tk_object.check_zsync_connection(
             ports=ports, timeout=timeout, sleep_time=sleep_time
         )
+
+    def _done_condition(self):
+        """Parameter and value that indicate that the node is done."""
+        return waiting.execution_done(self)
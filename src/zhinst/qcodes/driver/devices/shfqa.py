@@ -4,6 +4,7 @@ import numpy as np
 from zhinst.toolkit import Sequence, Waveforms
 from zhinst.toolkit.interface import AveragingMode, SHFQAChannelMode
 from zhinst.utils.shfqa.multistate import QuditSettings
+from zhinst.qcodes import sequencer, waiting, waveform_memory
 from zhinst.qcodes.driver.devices.base import ZIBaseInstrument
 from zhinst.qcodes.qcodes_adaptions import ZINode, ZIChannelList
 
@@ -72,7 +73,7 @@ class Generator(ZINode):
             TimeoutError: If the sequencer program did not finish within
                 the specified timeout time
         """
-        return self._tk_object.wait_done(timeout=timeout, sleep_time=sleep_time)
+        return waiting.wait_done(self, timeout=timeout, sleep_time=sleep_time)
 
     def compile_sequencer_program(
         self, sequencer_program: Union[str, Sequence], **kwargs: Union[str, int]
@@ -111,8 +112,8 @@ class Generator(ZINode):
 
         .. versionadded:: 0.4.0
         """
-        return self._tk_object.compile_sequencer_program(
-            sequencer_program=sequencer_program, **kwargs
+        return sequencer.compile_sequencer_program(
+            self, sequencer_program=sequencer_program, **kwargs
         )
 
     def load_sequencer_program(
@@ -161,12 +162,16 @@ class Generator(ZINode):
             program. This speeds of the compilation and also enables parallel
             compilation/upload.
         """
-        return self._tk_object.load_sequencer_program(
-            sequencer_program=sequencer_program, **kwargs
+        return sequencer.load_sequencer_program(
+            self, sequencer_program=sequencer_program, **kwargs
         )
 
     def write_to_waveform_memory(
-        self, pulses: Union[Waveforms, dict], *, clear_existing: bool = True
+        self,
+        pulses: Union[Waveforms, dict],
+        *,
+        clear_existing: bool = True,
+        force: bool = False,
     ) -> None:
         """Writes pulses to the waveform memory.
 
@@ -174,9 +179,11 @@ class Generator(ZINode):
             pulses: Waveforms that should be uploaded.
             clear_existing: Flag whether to clear the waveform memory before the
                 present upload. (default = True)
+            force: Flag if all waveforms should be uploaded, even the ones that
+                did not change since the last upload. (default = False)
         """
-        return self._tk_object.write_to_waveform_memory(
-            pulses=pulses, clear_existing=clear_existing
+        return waveform_memory.write_pulses(
+            self, pulses=pulses, clear_existing=clear_existing, force=force
         )
 
     def read_from_waveform_memory(self, slots: List[int] = None) -> Waveforms:
@@ -189,7 +196,7 @@ class Generator(ZINode):
         Returns:
             Mutable mapping of the downloaded waveforms.
         """
-        return self._tk_object.read_from_waveform_memory(slots=slots)
+        return waveform_memory.read_pulses(self, slots=slots)
 
     def configure_sequencer_triggering(
         self, *, aux_trigger: str, play_pulse_delay: float = 0.0
@@ -205,6 +212,10 @@ class Generator(ZINode):
             aux_trigger=aux_trigger, play_pulse_delay=play_pulse_delay
         )
 
+    def _done_condition(self):
+        """Parameter and value that indicate that the node is done."""
+        return waiting.sequencer_done(self)
+
     @property
     def available_aux_trigger_inputs(self) -> List:
         """List of available aux trigger sources for the generator."""
@@ -383,7 +394,7 @@ class Readout(ZINode):
             TimeoutError: if the readout recording is not completed within the
                 given time.
         """
-        return self._tk_object.wait_done(timeout=timeout, sleep_time=sleep_time)
+        return waiting.wait_done(self, timeout=timeout, sleep_time=sleep_time)
 
     def read(self, *, timeout: float = 10) -> np.array:
         """Waits until the logger finished recording and returns the measured data.
@@ -414,7 +425,8 @@ class Readout(ZINode):
             clear_existing: Flag whether to clear the waveform memory before
                 the present upload. (default = True)
         """
-        return self._tk_object.write_integration_weights(
+        return waveform_memory.write_integration_weights(
+            self,
             weights=weights,
             integration_delay=integration_delay,
             clear_existing=clear_existing,
@@ -430,7 +442,11 @@ class Readout(ZINode):
         Returns:
             Mutable mapping of the downloaded weights.
         """
-        return self._tk_object.read_integration_weights(slots=slots)
+        return waveform_memory.read_integration_weights(self, slots=slots)
+
+    def _done_condition(self):
+        """Parameter and value that indicate that the node is done."""
+        return waiting.result_done(self)
 
 
 class Spectroscopy(ZINode):
@@ -505,7 +521,7 @@ class Spectroscopy(ZINode):
                 given time.
 
         """
-        return self._tk_object.wait_done(timeout=timeout, sleep_time=sleep_time)
+        return waiting.wait_done(self, timeout=timeout, sleep_time=sleep_time)
 
     def read(self, *, timeout: float = 10) -> np.array:
         """Waits until the logger finished recording and returns the measured data.
@@ -519,6 +535,10 @@ class Spectroscopy(ZINode):
         """
         return self._tk_object.read(timeout=timeout)
 
+    def _done_condition(self):
+        """Parameter and value that indicate that the node is done."""
+        return waiting.result_done(self)
+
 
 class QAChannel(ZINode):
     """Quantum Analyzer Channel for the SHFQA.
@@ -673,7 +693,7 @@ class SHFScope(ZINode):
             TimeoutError: The scope did not finish within the specified
                 timeout.
         """
-        return self._tk_object.wait_done(timeout=timeout, sleep_time=sleep_time)
+        return waiting.wait_done(self, timeout=timeout, sleep_time=sleep_time)
 
     def configure(
         self,
@@ -730,6 +750,10 @@ class SHFScope(ZINode):
         """
         return self._tk_object.read(timeout=timeout)
 
+    def _done_condition(self):
+        """Parameter and value that indicate that the node is done."""
+        return waiting.enable_done(self)
+
     @property
     def available_trigger_inputs(self) -> List:
         """List of the available trigger sources for the scope."""
@@ -798,7 +822,7 @@ class SHFQA(ZIBaseInstrument):
                 should be performed between the device and the data
                 server after loading the factory preset (default: True).
         """
-        return self._tk_object.factory_reset(deep=deep)
+        return waveform_memory.factory_reset(self, deep=deep)
 
     def start_continuous_sw_trigger(
         self, *, num_triggers: int, wait_time: float
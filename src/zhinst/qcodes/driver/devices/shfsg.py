@@ -1,6 +1,7 @@
 """Autogenerated module for the SHFSG QCoDeS driver."""
 from typing import Any, Dict, List, Tuple, Union
 from zhinst.toolkit import CommandTable, Waveforms, Sequence
+from zhinst.qcodes import sequencer, waiting, waveform_memory
 from zhinst.qcodes.driver.devices.base import ZIBaseInstrument
 from zhinst.qcodes.qcodes_adaptions import ZINode, ZIChannelList
 
@@ -151,7 +152,7 @@ class AWGCore(ZINode):
             TimeoutError: If the sequencer program did not finish within
                 the specified timeout time
         """
-        return self._tk_object.wait_done(timeout=timeout, sleep_time=sleep_time)
+        return waiting.wait_done(self, timeout=timeout, sleep_time=sleep_time)
 
     def compile_sequencer_program(
         self, sequencer_program: Union[str, Sequence], **kwargs: Union[str, int]
@@ -190,8 +191,8 @@ class AWGCore(ZINode):
 
         .. versionadded:: 0.4.0
         """
-        return self._tk_object.compile_sequencer_program(
-            sequencer_program=sequencer_program, **kwargs
+        return sequencer.compile_sequencer_program(
+            self, sequencer_program=sequencer_program, **kwargs
         )
 
     def load_sequencer_program(
@@ -240,12 +241,12 @@ class AWGCore(ZINode):
             program. This speeds of the compilation and also enables parallel
             compilation/upload.
         """
-        return self._tk_object.load_sequencer_program(
-            sequencer_program=sequencer_program, **kwargs
+        return sequencer.load_sequencer_program(
+            self, sequencer_program=sequencer_program, **kwargs
         )
 
     def write_to_waveform_memory(
-        self, waveforms: Waveforms, indexes: list = None
+        self, waveforms: Waveforms, indexes: list = None, *, force: bool = False
     ) -> None:
         """Writes waveforms to the waveform memory.
 
@@ -256,14 +257,16 @@ class AWGCore(ZINode):
             indexes: Specify a list of indexes that should be uploaded. If
                 nothing is specified all available indexes in waveforms will
                 be uploaded. (default = None)
+            force: Flag if all waveforms should be uploaded, even the ones that
+                did not change since the last upload. (default = False)
 
         .. versionchanged:: 0.4.2
 
             Removed `validate` flag and functionality. The validation check is
             now done in the `Waveforms.validate` function.
         """
-        return self._tk_object.write_to_waveform_memory(
-            waveforms=waveforms, indexes=indexes
+        return waveform_memory.write_to_waveform_memory(
+            self, waveforms=waveforms, indexes=indexes, force=force
         )
 
     def read_from_waveform_memory(self, indexes: List[int] = None) -> Waveforms:
@@ -276,7 +279,7 @@ class AWGCore(ZINode):
         Returns:
             Waveform object with the downloaded waveforms.
         """
-        return self._tk_object.read_from_waveform_memory(indexes=indexes)
+        return waveform_memory.read_from_waveform_memory(self, indexes=indexes)
 
     def configure_marker_and_trigger(
         self, *, trigger_in_source: str, trigger_in_slope: str, marker_out_source: str
@@ -300,6 +303,10 @@ class AWGCore(ZINode):
             marker_out_source=marker_out_source,
         )
 
+    def _done_condition(self):
+        """Parameter and value that indicate that the node is done."""
+        return waiting.sequencer_done(self)
+
     @property
     def available_trigger_inputs(self) -> List:
         """List the available trigger sources for the sequencer."""
@@ -489,4 +496,4 @@ class SHFSG(ZIBaseInstrument):
                 should be performed between the device and the data
                 server after loading the factory preset (default: True).
         """
-        return self._tk_object.factory_reset(deep=deep)
+        return waveform_memory.factory_reset(self, deep=deep)
@@ -1,12 +1,16 @@
 """Autogenerated module for the DAQModule QCoDeS driver."""
 import typing as t
+from pathlib import Path
 from zhinst.toolkit.driver.modules.daq_module import DAQModule as TKDAQModule
 
+from zhinst.qcodes import recording
 from zhinst.qcodes.driver.modules.base_module import ZIBaseModule
 
 from zhinst.qcodes.qcodes_adaptions import (
     NodeDict,
+    ZIParameter,
 )
+from zhinst.qcodes.streaming import DAQChunk, stream_daq_module
 
 if t.TYPE_CHECKING:
     from zhinst.qcodes.session import Session
@@ -96,4 +100,77 @@ class ZIDAQModule(ZIBaseModule):
         Returns:
             Result of the burst grouped by the signals.
         """
-        return NodeDict(self._tk_object.read(raw=raw, clk_rate=clk_rate))
+        return recording.record(
+            self, NodeDict(self._tk_object.read(raw=raw, clk_rate=clk_rate))
+        )
+
+    def stream(
+        self, *, chunk_size: t.Optional[int] = None, poll_interval: float = 0.05
+    ) -> t.Iterator[t.Dict[t.Union[ZIParameter, str], DAQChunk]]:
+        """Iterate over the new bursts of the running module.
+
+        In contrast to :meth:`read` every burst is only returned once. The
+        memory consumption therefore stays bounded, also for long continuous
+        acquisitions. The iteration ends once the module is finished.
+
+        Examples:
+            >>> daq_module.execute()
+            >>> for chunk in daq_module.stream(chunk_size=10):
+            ...     for signal, data in chunk.items():
+            ...         print(signal, data.value.shape)
+
+        Args:
+            chunk_size: Maximum number of bursts per signal in a single chunk.
+                If not specified all new bursts are yielded at once.
+                (default = None)
+            poll_interval: Time in seconds between two reads of the module.
+                (default = 0.05)
+
+        Yields:
+            New bursts of each signal keyed by the QCoDeS parameter (or the
+            node path if the node does not belong to a created device).
+        """
+        return stream_daq_module(
+            self, chunk_size=chunk_size, poll_interval=poll_interval
+        )
+
+    def record_to(
+        self,
+        path: t.Union[str, Path],
+        *,
+        compression: str = "gzip",
+        compression_level: int = 4,
+    ) -> t.ContextManager[recording.Recorder]:
+        """Record the results of the module to a HDF5 or NetCDF file.
+
+        While the context is active every result that is read from the module
+        is written to the file by a background thread. Each field of a node is
+        stored in a chunked and compressed dataset named
+        ``<node path>/<field>``. Records that were written before are skipped,
+        the module can therefore be read repeatedly.
+
+        Files with the suffix ``.nc`` are written as NetCDF4 files (requires
+        h5netcdf), all others as HDF5 files (requires h5py).
+
+        Examples:
+            >>> with daq_module.record_to("result.h5"):
+            ...     daq_module.execute()
+            ...     while not daq_module.finished():
+            ...         daq_module.read()
+
+        Args:
+            path: Path of the file. An existing file is overwritten.
+            compression: Compression filter of the datasets. (default = "gzip")
+            compression_level: Compression level of the datasets.
+                (default = 4)
+
+        Returns:
+            Context manager that yields the recorder.
+        """
+        return recording.record_to(
+            self,
+            path,
+            mode="append",
+            compression=compression,
+            compression_level=compression_level,
+        )
@@ -1,7 +1,9 @@
 """Autogenerated module for the ScopeModule QCoDeS driver."""
 import typing as t
+from pathlib import Path
 from zhinst.toolkit.driver.modules.scope_module import ScopeModule as TKScopeModule
 
+from zhinst.qcodes import recording
 from zhinst.qcodes.driver.modules.base_module import ZIBaseModule
 
 from zhinst.qcodes.qcodes_adaptions import (
@@ -82,4 +84,45 @@ class ZIScopeModule(ZIBaseModule):
         Returns:
             Scope data.
         """
-        return NodeDict(self._tk_object.read())
+        return recording.record(self, NodeDict(self._tk_object.read()))
+
+    def record_to(
+        self,
+        path: t.Union[str, Path],
+        *,
+        compression: str = "gzip",
+        compression_level: int = 4,
+    ) -> t.ContextManager[recording.Recorder]:
+        """Record the results of the module to a HDF5 or NetCDF file.
+
+        While the context is active every result that is read from the module
+        is written to the file by a background thread. Each field of a node is
+        stored in a chunked and compressed dataset named
+        ``<node path>/<field>``. Records that were written before are skipped,
+        the module can therefore be read repeatedly.
+
+        Files with the suffix ``.nc`` are written as NetCDF4 files (requires
+        h5netcdf), all others as HDF5 files (requires h5py).
+
+        Examples:
+            >>> with scope_module.record_to("result.h5"):
+            ...     scope_module.execute()
+            ...     while scope_module.progress() < 1:
+            ...         scope_module.read()
+
+        Args:
+            path: Path of the file. An existing file is overwritten.
+            compression: Compression filter of the datasets. (default = "gzip")
+            compression_level: Compression level of the datasets.
+                (default = 4)
+
+        Returns:
+            Context manager that yields the recorder.
+        """
+        return recording.record_to(
+            self,
+            path,
+            mode="append",
+            compression=compression,
+            compression_level=compression_level,
+        )
@@ -1,9 +1,11 @@
 """Autogenerated module for the SweeperModule QCoDeS driver."""
 import typing as t
+from pathlib import Path
 from zhinst.toolkit.driver.modules.sweeper_module import (
     SweeperModule as TKSweeperModule,
 )
 
+from zhinst.qcodes import recording
 from zhinst.qcodes.driver.modules.base_module import ZIBaseModule
 
 from zhinst.qcodes.qcodes_adaptions import (
@@ -78,4 +80,45 @@ class ZISweeperModule(ZIBaseModule):
 
         .. versionchanged:: 0.4.4 return NodeDict instead of raw dict.
         """
-        return NodeDict(self._tk_object.read())
+        return recording.record(self, NodeDict(self._tk_object.read()))
+
+    def record_to(
+        self,
+        path: t.Union[str, Path],
+        *,
+        compression: str = "gzip",
+        compression_level: int = 4,
+    ) -> t.ContextManager[recording.Recorder]:
+        """Record the results of the module to a HDF5 or NetCDF file.
+
+        While the context is active every result that is read from the module
+        is written to the file by a background thread. Each field of a node is
+        stored in a chunked and compressed dataset named
+        ``<node path>/<field>``. The datasets always contain the sweeps of the
+        latest read.
+
+        Files with the suffix ``.nc`` are written as NetCDF4 files (requires
+        h5netcdf), all others as HDF5 files (requires h5py).
+
+        Examples:
+            >>> with sweeper.record_to("result.h5"):
+            ...     sweeper.execute()
+            ...     while sweeper.progress() < 1:
+            ...         sweeper.read()
+
+        Args:
+            path: Path of the file. An existing file is overwritten.
+            compression: Compression filter of the datasets. (default = "gzip")
+            compression_level: Compression level of the datasets.
+                (default = 4)
+
+        Returns:
+            Context manager that yields the recorder.
+        """
+        return recording.record_to(
+            self,
+            path,
+            mode="replace",
+            compression=compression,
+            compression_level=compression_level,
+        )
@@ -0,0 +1,224 @@
+"""Persistent cache for the QCoDeS parameter skeleton of devices."""
+import hashlib
+import json
+import os
+import sys
+import typing as t
+import warnings
+from pathlib import Path
+
+from zhinst.toolkit.driver.devices import DeviceType
+
+from zhinst.qcodes.qcodes_adaptions import ParameterSkeleton, nodetree_skeleton
+
+_CACHE_FORMAT = 1
+# The serial in the node paths is replaced by a placeholder that keeps its case.
+_SERIAL_PLACEHOLDERS = {"/{SERIAL}/": str.upper, "/{serial}/": str.lower}
+
+
+def default_cache_directory() -> Path:
+    """Default directory of the nodetree cache.
+
+    Uses the platform specific user cache directory.
+
+    Returns:
+        Path of the cache directory.
+    """
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData/Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "zhinst-qcodes" / "nodetree"
+
+
+def _package_version() -> str:
+    """Version of zhinst-qcodes (empty if unknown)."""
+    try:
+        from zhinst.qcodes._version import version
+    except ModuleNotFoundError:
+        return ""
+    return version
+
+
+class NodetreeCache:
+    """Persistent on-disk cache of the QCoDeS parameter skeleton of devices.
+
+    Creating the QCoDeS parameters of a device requires converting every
+    node of the device into a QCoDeS path, unit, validator and snapshot
+    configuration. The result only depends on the device type, its options
+    and the firmware revision and is therefore stored on disk and reused for
+    every later connection to a device with the same properties (even across
+    processes).
+
+    The cache is used by all devices that are created through a session with
+    an attached cache.
+
+    Examples:
+        >>> session = ZISession("localhost")
+        >>> session.nodetree_cache = NodetreeCache()
+        >>> device = session.connect_device("dev1234")
+
+    Args:
+        directory: Directory in which the cache files are stored. If not
+            specified the user cache directory is used.
+            (default = None)
+    """
+
+    def __init__(self, directory: t.Optional[t.Union[str, Path]] = None):
+        self._directory = Path(directory) if directory else default_cache_directory()
+
+    def skeleton(
+        self, tk_device: DeviceType, blacklist: tuple = tuple()
+    ) -> t.List[ParameterSkeleton]:
+        """Get the parameter skeleton for a device.
+
+        The skeleton is loaded from the cache if it exists. Otherwise it is
+        generated from the nodetree of the device and stored in the cache.
+
+        Args:
+            tk_device: Toolkit device.
+            blacklist: nodes to be blacklisted.
+
+        Returns:
+            Parameter skeleton of the device.
+        """
+        key = self.key(tk_device, blacklist)
+        skeleton = self.load(key, tk_device.serial)
+        if skeleton is None:
+            skeleton = nodetree_skeleton(tk_device.root, blacklist)
+            self.store(key, skeleton, tk_device.serial)
+        return skeleton
+
+    @staticmethod
+    def key(tk_device: DeviceType, blacklist: tuple = tuple()) -> t.Dict[str, t.Any]:
+        """Properties of a device that define its parameter skeleton.
+
+        Args:
+            tk_device: Toolkit device.
+            blacklist: nodes to be blacklisted.
+
+        Returns:
+            Cache key of the device.
+        """
+        try:
+            fwrevision = tk_device.system.fwrevision()
+        except (AttributeError, KeyError, RuntimeError):
+            fwrevision = None
+        try:
+            server_revision = tk_device.root.connection.getInt("/zi/about/revision")
+        except (AttributeError, RuntimeError):
+            server_revision = None
+        return {
+            "format": _CACHE_FORMAT,
+            "package": _package_version(),
+            "device_type": tk_device.device_type,
+            "options": tk_device.device_options,
+            "fwrevision": fwrevision,
+            "server_revision": server_revision,
+            "blacklist": sorted(blacklist),
+        }
+
+    def _path(self, key: t.Dict[str, t.Any]) -> Path:
+        """Path of the cache file for a key."""
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+        return self._directory / f"{key['device_type']}_{digest[:24]}.json".lower()
+
+    def load(
+        self, key: t.Dict[str, t.Any], serial: str
+    ) -> t.Optional[t.List[ParameterSkeleton]]:
+        """Load a parameter skeleton from the cache.
+
+        Args:
+            key: Cache key (see :meth:`key`).
+            serial: Serial of the device the skeleton is loaded for.
+
+        Returns:
+            Parameter skeleton or None if the cache does not contain a valid
+            skeleton for the key.
+        """
+        try:
+            with self._path(key).open("r", encoding="UTF-8") as file:
+                content = json.load(file)
+            if content["key"] != json.loads(json.dumps(key)):
+                return None
+            return [
+                ParameterSkeleton(
+                    raw_tree=tuple(raw_tree),
+                    qcodes_list=qcodes_list,
+                    zi_node=self._insert_serial(zi_node, serial),
+                    docstring=docstring,
+                    unit=unit,
+                    is_complex=is_complex,
+                    do_snapshot=do_snapshot,
+                )
+                for (
+                    raw_tree,
+                    qcodes_list,
+                    zi_node,
+                    docstring,
+                    unit,
+                    is_complex,
+                    do_snapshot,
+                ) in content["nodes"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def store(
+        self, key: t.Dict[str, t.Any], skeleton: t.List[ParameterSkeleton], serial: str
+    ) -> None:
+        """Store a parameter skeleton in the cache.
+
+        The serial of the device is removed from the node paths so that the
+        skeleton can be reused for all devices with the same properties.
+
+        Args:
+            key: Cache key (see :meth:`key`).
+            skeleton: Parameter skeleton.
+            serial: Serial of the device the skeleton was generated for.
+        """
+        nodes = [
+            item._replace(zi_node=self._remove_serial(item.zi_node, serial))
+            for item in skeleton
+        ]
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="UTF-8") as file:
+                json.dump({"key": key, "nodes": nodes}, file)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            warnings.warn(f"Nodetree cache could not be written to {path}: {e}")
+
+    @staticmethod
+    def _remove_serial(zi_node: str, serial: str) -> str:
+        """Replace the serial in a node path with a placeholder."""
+        prefix = f"/{serial}/"
+        if not zi_node.lower().startswith(prefix.lower()):
+            return zi_node
+        for placeholder, convert in _SERIAL_PLACEHOLDERS.items():
+            if zi_node.startswith(convert(prefix)):
+                return placeholder + zi_node[len(prefix) :]  # noqa: E203
+        return zi_node
+
+    @staticmethod
+    def _insert_serial(zi_node: str, serial: str) -> str:
+        """Replace the placeholder in a node path with a serial."""
+        for placeholder, convert in _SERIAL_PLACEHOLDERS.items():
+            if zi_node.startswith(placeholder):
+                path = zi_node[len(placeholder) :]  # noqa: E203
+                return f"/{convert(serial)}/" + path
+        return zi_node
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for path in self._directory.glob("*.json"):
+            path.unlink()
+
+    @property
+    def directory(self) -> Path:
+        """Directory in which the cache files are stored."""
+        return self._directory
@@ -1,5 +1,8 @@
 """Base modules for the Zurich Instrument specific QCoDeS driver."""
 import re
+import threading
+import time
+import weakref
 from datetime import datetime
 import typing as t
 from contextlib import contextmanager, nullcontext
@@ -10,10 +13,57 @@ from qcodes.instrument.base import Instrument
 from qcodes.instrument.channel import ChannelList, InstrumentChannel
 from qcodes.instrument.parameter import Parameter
 from qcodes.utils.validators import ComplexNumbers
+from zhinst.core import ziDAQServer
 from zhinst.toolkit.nodetree import Node, NodeTree
 from zhinst.toolkit.nodetree.helper import NodeDict as TKNodeDict
 from zhinst.toolkit.nodetree.node import NodeInfo
 
+from zhinst.qcodes import waiting
+
+_SNAPSHOT_BLACKLIST = ["fwlog", "values"]
+_IS_COMPLEX = re.compile("demods/./sample")
+
+
+def decode_values(result: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+    """Convert the result of a flat get into a table of scalar values.
+
+    Takes the first value of every node, converts numpy types into standard
+    python types and complex numbers into strings. Instead of converting
+    each value separately the values are grouped by their data type and
+    converted with a single numpy call per group.
+
+    Args:
+        result: Result of a flat get. HF2 results without a timestamp
+            (no dictionary per node) are supported as well.
+
+    Returns:
+        Dictionary with the lower case node path as key and the scalar
+        value as value. Nodes without a value are omitted.
+    """
+    values: t.Dict[str, t.Any] = {}
+    groups: t.Dict[np.dtype, t.Tuple[t.List[str], t.List[np.ndarray]]] = {}
+    for path, data in result.items():
+        # HF2 has no timestamp -> no dict
+        node_values = data["value"] if isinstance(data, Mapping) else data
+        if isinstance(node_values, np.ndarray) and node_values.ndim == 1:
+            if node_values.size:
+                paths, arrays = groups.setdefault(node_values.dtype, ([], []))
+                paths.append(path.lower())
+                arrays.append(node_values[:1])
+        elif len(node_values):
+            value = node_values[0]
+            # convert numpy types to standart types
+            value = value.item() if hasattr(value, "item") else value
+            # convert complex into string
+            value = str(value) if isinstance(value, complex) else value
+            values[path.lower()] = value
+    for dtype, (paths, arrays) in groups.items():
+        converted = np.concatenate(arrays).tolist()
+        if dtype.kind == "c":
+            converted = [str(value) for value in converted]
+        values.update(zip(paths, converted))
+    return values
+
 
 class ZISnapshotHelper:
     """Helper class for the snapshot with Zurich Instrument devices.
@@ -21,14 +71,54 @@ class ZISnapshotHelper:
     Instead of getting each node with a single get command this class bundles
     the get into a single command and stores the returned values into a
     temporary dictionary.
+
+    If a time-to-live is set the values are kept after the snapshot and
+    reused by all following snapshots of the same (or a contained) subtree
+    until they expire or :meth:`invalidate` is called.
+
+    Alternatively a live mirror of the nodes can be started with
+    :meth:`start_live_mirror`. The nodes are read once and subscribed to on a
+    dedicated connection. A background thread applies all value changes to
+    the mirror, which makes a snapshot a purely local operation.
+
+    Parameters that are not part of the bundled get (e.g. nodes that the data
+    server does not return for a wildcard) are not fetched one by one.
+    The first miss of a snapshot fetches all missing nodes of the subtree
+    with a single additional get. The number of misses is recorded and can
+    be inspected with :attr:`misses`, :attr:`fallbacks` and
+    :attr:`missed_nodes`.
+
+    Args:
+        nodetree: Nodetree of the instrument.
+        is_module: Flag if the nodetree belongs to a LabOne module.
+            (default = False)
+        ttl: Time-to-live in seconds of the values of a snapshot. 0 disables
+            the reuse of values across snapshots. (default = 0)
     """
 
-    def __init__(self, nodetree: NodeTree, is_module: bool = False):
+    def __init__(self, nodetree: NodeTree, is_module: bool = False, ttl: float = 0):
         self._is_running = False
         self._value_dict: t.Dict[str, t.Any] = {}
+        self._values: t.Optional[t.Dict[str, t.Any]] = None
         self._start = datetime.now()
         self._nodetree = nodetree
         self._is_module = is_module
+        self._ttl = ttl
+        self._fetched_path: t.Optional[str] = None
+        self._fetched_at = 0.0
+        self._mirror: t.Dict[str, t.Any] = {}
+        self._mirror_path: t.Optional[str] = None
+        self._mirror_lock = threading.Lock()
+        self._mirror_connection: t.Optional[ziDAQServer] = None
+        self._mirror_thread: t.Optional[threading.Thread] = None
+        self._mirror_stop = threading.Event()
+        self._mirror_error: t.Optional[Exception] = None
+        self.set_if_changed = SetIfChanged(self)
+        self._snapshot_subtree = "/"
+        self._misses_fetched = False
+        self._misses = 0
+        self._fallbacks = 0
+        self._missed_nodes: t.Set[str] = set()
 
     @contextmanager
     def snapshot(self, name: t.Optional[str] = None):
@@ -42,6 +132,40 @@ class ZISnapshotHelper:
             if is_owner:
                 self._stop_snapshot()
 
+    def _snapshot_path(self, name: t.Optional[str] = None) -> str:
+        """Node path of the subtree a snapshot is taken of.
+
+        Args:
+            name: Name (relative path) or absolute node path of the subnode.
+                If not specified the path of the whole nodetree is returned.
+                (default = None)
+
+        Returns:
+            Path of the subtree (without trailing wildcard).
+        """
+        prefix = self._nodetree.prefix_hide
+        if not name:
+            return prefix if prefix else ""
+        if name.startswith("/"):
+            return name
+        return "/" + prefix + "/" + name
+
+    def _is_fresh(self, path: str) -> bool:
+        """Check if the stored values are valid for a snapshot of a subtree.
+
+        Args:
+            path: Path of the subtree.
+
+        Returns:
+            Flag if the stored values cover the subtree and are not expired.
+        """
+        if self._fetched_path is None or self._ttl <= 0:
+            return False
+        if time.monotonic() - self._fetched_at > self._ttl:
+            return False
+        fetched = self._fetched_path.lower().strip("/")
+        return not fetched or path.lower().lstrip("/").startswith(fetched + "/")
+
     def _start_snapshot(self, name: t.Optional[str] = None) -> bool:
         """Start a snapshot and make a single get to the device.
 
@@ -56,6 +180,17 @@ class ZISnapshotHelper:
         if not self._nodetree or self._is_running:
             return False
         self._is_running = True
+        path = self._snapshot_path(name)
+        self._snapshot_subtree = self._subtree(path)
+        self._misses_fetched = False
+        if self._is_mirrored(path + "/"):
+            with self._mirror_lock:
+                self._value_dict = dict(self._mirror)
+            self._values = None
+            self._start = datetime.now()
+            return True
+        if self._is_fresh(path + "/"):
+            return True
         if not self._is_module:
             kwargs = {
                 "excludestreaming": True,
@@ -65,51 +200,320 @@ class ZISnapshotHelper:
             }
         else:
             kwargs = {"flat": True}
-        prefix = self._nodetree.prefix_hide
-        if not name:
-            name = prefix if prefix else ""
-        else:
-            name = "/" + prefix + "/" + name
-        self._value_dict = self._nodetree.connection.get(f"{name}/*", **kwargs)
+        self._value_dict = self._nodetree.connection.get(f"{path}/*", **kwargs)
+        self._values = None
         self._start = datetime.now()
+        self._fetched_path = path
+        self._fetched_at = time.monotonic()
         return True
 
     def _stop_snapshot(self) -> None:
         """Stop a snapshot to prevent use of outdate data by accident."""
         self._is_running = False
+        if self._ttl <= 0:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """Discard the stored values.
+
+        The next snapshot gets all values from the data server again.
+        """
         self._value_dict = {}
+        self._values = None
+        self._fetched_path = None
+
+    @staticmethod
+    def _subtree(path: str) -> str:
+        """Lower case prefix of all node paths of a subtree.
+
+        Args:
+            path: Path of the subtree.
+
+        Returns:
+            Absolute path of the subtree with a trailing slash.
+        """
+        return f"/{path.lower().strip('/')}/".replace("//", "/")
+
+    def _is_mirrored(self, path: str) -> bool:
+        """Check if a subtree is covered by the live mirror.
+
+        Args:
+            path: Path of the subtree.
+
+        Returns:
+            Flag if the live mirror covers the subtree.
+
+        Raises:
+            RuntimeError: If the live mirror stopped because of an error.
+        """
+        if self._mirror_path is None:
+            return False
+        if self._mirror_error is not None:
+            raise RuntimeError(
+                f"Live mirror of {self._mirror_path} failed: {self._mirror_error}"
+            ) from self._mirror_error
+        mirrored = self._mirror_path.lower().strip("/")
+        return not mirrored or path.lower().lstrip("/").startswith(mirrored + "/")
+
+    def start_live_mirror(
+        self,
+        name: t.Optional[str] = None,
+        *,
+        connection: t.Optional[ziDAQServer] = None,
+        poll_interval: float = 0.05,
+    ) -> None:
+        """Start a live mirror of the nodes.
+
+        All nodes (except streaming and vector nodes) are subscribed to on a
+        dedicated connection and read once. A background thread polls the
+        value changes and applies them to the mirror. All following snapshots
+        of the mirrored subtree are served from the mirror without a request
+        to the data server.
+
+        Args:
+            name: Name (relative path) or absolute node path of the subtree
+                that should be mirrored. If not specified the whole nodetree
+                is mirrored. (default = None)
+            connection: Dedicated connection to the data server. The
+                connection is owned by the mirror and disconnected once the
+                mirror is stopped. If not specified a new connection to the
+                data server of the nodetree is created. (default = None)
+            poll_interval: Duration of a single poll in seconds.
+                (default = 0.05)
+
+        Raises:
+            RuntimeError: If the nodetree belongs to a LabOne module.
+        """
+        if self._is_module:
+            raise RuntimeError("A live mirror is not supported for LabOne modules.")
+        self.stop_live_mirror()
+        path = self._snapshot_path(name)
+        if connection is None:
+            main_connection = self._nodetree.connection
+            is_hf2 = "HF2" in main_connection.getString("/zi/about/dataserver")
+            connection = ziDAQServer(
+                main_connection.host, main_connection.port, 1 if is_hf2 else 6
+            )
+        subtree = self._subtree(path)
+        nodes = [
+            info["Node"].lower()
+            for _, info in self._nodetree
+            if info["Node"].lower().startswith(subtree)
+            and "Stream" not in info.get("Properties", "")
+            and "Vector" not in info.get("Type", "")
+        ]
+        if nodes:
+            connection.subscribe(nodes)
+        # Subscribe before the initial get so that no change is lost.
+        mirror = connection.get(
+            f"{path}/*",
+            excludestreaming=True,
+            settingsonly=False,
+            excludevectors=True,
+            flat=True,
+        )
+        with self._mirror_lock:
+            self._mirror = {key.lower(): value for key, value in mirror.items()}
+        self._mirror_connection = connection
+        self._mirror_error = None
+        self._mirror_stop.clear()
+        self._mirror_thread = threading.Thread(
+            target=self._run_live_mirror,
+            args=(connection, poll_interval),
+            name=f"zhinst-qcodes-mirror-{path}",
+            daemon=True,
+        )
+        self._mirror_path = path
+        self._mirror_thread.start()
+
+    def _run_live_mirror(self, connection: ziDAQServer, poll_interval: float) -> None:
+        """Apply all value changes to the mirror until it is stopped."""
+        try:
+            while not self._mirror_stop.is_set():
+                self._apply_changes(connection.poll(poll_interval, 0, flat=True))
+        except Exception as e:
+            self._mirror_error = e
+
+    def _apply_changes(self, events: t.Dict[str, t.Any]) -> None:
+        """Apply polled value changes to the mirror.
+
+        Only the latest value of each node is kept. Changes older than the
+        value in the mirror (e.g. received before the initial get) are
+        ignored.
+
+        Args:
+            events: Flat poll result.
+        """
+        with self._mirror_lock:
+            for path, data in events.items():
+                path = path.lower()
+                if isinstance(data, Mapping) and "value" in data:
+                    latest = {
+                        "timestamp": data["timestamp"][-1:],
+                        "value": data["value"][-1:],
+                    }
+                    current = self._mirror.get(path)
+                    if (
+                        isinstance(current, Mapping)
+                        and len(current.get("timestamp", [])) > 0
+                        and current["timestamp"][-1] > latest["timestamp"][-1]
+                    ):
+                        continue
+                    self._mirror[path] = latest
+                else:
+                    # HF2 has no timestamp -> no dict
+                    self._mirror[path] = data[-1:]
+
+    def mirrored_value(self, path: str) -> t.Any:
+        """Value of a node in the live mirror.
 
-    def get(self, parameter: Parameter, fallback_get: t.Callable) -> t.Any:
+        Args:
+            path: Node path.
+
+        Returns:
+            Value of the node. None if the node is not mirrored.
+        """
+        if self._mirror_path is None:
+            return None
+        path = path.lower()
+        with self._mirror_lock:
+            raw_value = self._mirror.get(path)
+        if raw_value is None:
+            return None
+        return decode_values({path: raw_value}).get(path)
+
+    def update_mirror(self, path: str, value: t.Any) -> None:
+        """Write a value that was set by the driver into the live mirror.
+
+        The value is replaced by the next value change of the node that the
+        mirror receives (e.g. the confirmation of the set). Nodes that are
+        not mirrored are ignored.
+
+        Args:
+            path: Node path.
+            value: Value that was set.
+        """
+        path = path.lower()
+        with self._mirror_lock:
+            current = self._mirror.get(path)
+            if current is None:
+                return
+            if isinstance(current, Mapping):
+                # Keep the timestamp so that only newer changes replace the value
+                self._mirror[path] = {
+                    "timestamp": current["timestamp"][-1:],
+                    "value": [value],
+                }
+            else:
+                self._mirror[path] = [value]
+
+    def stop_live_mirror(self) -> None:
+        """Stop the live mirror and close its connection."""
+        if self._mirror_thread is None:
+            return
+        self._mirror_stop.set()
+        self._mirror_thread.join()
+        try:
+            self._mirror_connection.unsubscribe("*")  # type: ignore[union-attr]
+            self._mirror_connection.disconnect()  # type: ignore[union-attr]
+        finally:
+            self._mirror_thread = None
+            self._mirror_connection = None
+            self._mirror_path = None
+            with self._mirror_lock:
+                self._mirror = {}
+
+    def get(
+        self,
+        parameter: t.Union["ZIParameter", "ZICompactParameter"],
+        fallback_get: t.Callable,
+    ) -> t.Any:
         """Get the value for a specific QCoDeS Parameter.
 
         Tries to mimic the behavior of a normal get (e.g. update cache).
         If the value is not found in the dictionary the fallback get is called.
         The fallback get should get the value from the device.
 
+        The stored values are converted once for all parameters (see
+        :func:`decode_values`) and share the timestamp of the snapshot.
+
         Args:
             parameter: QCoDeS Parameter object
             fallback_get: fallback function to get the value from the device
         Returns:
             Value for the Node
         """
-        value = self._value_dict.get(parameter.zi_node.lower())
+        if self._values is None:
+            self._values = decode_values(self._value_dict)
+        path = parameter.zi_node.lower()
+        value = self._values.get(path)
+        if value is None and self._is_running:
+            self._misses += 1
+            self._missed_nodes.add(path)
+            if not self._misses_fetched:
+                self._fetch_misses()
+                value = self._values.get(path)
         if value is not None:
-            try:
-                value = value["value"][0]
-            except (IndexError, TypeError):
-                # HF2 has no timestamp -> no dict
-                value = value[0]
-            # convert numpy types to standart types
-            value = value.item() if hasattr(value, "item") else value
-            # convert complex into string
-            value = str(value) if isinstance(value, complex) else value
             parameter.cache._update_with(
                 value=value, raw_value=value, timestamp=self._start
             )
         else:  # fallback is normal get
+            if self._is_running:
+                self._fallbacks += 1
             value = fallback_get()
         return value
 
+    def _fetch_misses(self) -> None:
+        """Fetch all nodes of the snapshot that are missing with a single get.
+
+        Fetches the node of every parameter of the current snapshot subtree
+        that takes part in the snapshot (see :func:`is_snapshot_node`) and is
+        not part of the stored values. Nodes that are still missing afterwards
+        fall back to a single get.
+        """
+        self._misses_fetched = True
+        if self._is_module:
+            return
+        missing = [
+            path
+            for path in (
+                info.get("Node", "").lower()
+                for _, info in self._nodetree
+                if is_snapshot_node(info)
+            )
+            if path.startswith(self._snapshot_subtree) and path not in self._value_dict
+        ]
+        if not missing:
+            return
+        try:
+            result = self._nodetree.connection.get(",".join(missing), flat=True)
+        except RuntimeError:
+            return
+        self._value_dict.update({key.lower(): value for key, value in result.items()})
+        if self._values is not None:
+            self._values.update(decode_values(result))
+
+    def reset_statistics(self) -> None:
+        """Reset the recorded snapshot misses."""
+        self._misses = 0
+        self._fallbacks = 0
+        self._missed_nodes.clear()
+
+    @property
+    def misses(self) -> int:
+        """Number of parameters that were not part of the bundled get."""
+        return self._misses
+
+    @property
+    def fallbacks(self) -> int:
+        """Number of parameters that were fetched with a single get."""
+        return self._fallbacks
+
+    @property
+    def missed_nodes(self) -> t.List[str]:
+        """Node paths of the parameters that were not part of the bundled get."""
+        return sorted(self._missed_nodes)
+
     @staticmethod
     def print_readable_snapshot(
         qcodes_object: Instrument, update: bool = False, max_chars: int = 80
@@ -176,6 +580,280 @@ class ZISnapshotHelper:
         """Flag if a snapshot is in progress."""
         return self._is_running
 
+    @property
+    def live(self) -> bool:
+        """Flag if a live mirror is running."""
+        return self._mirror_path is not None
+
+    @property
+    def ttl(self) -> float:
+        """Time-to-live in seconds of the values of a snapshot.
+
+        0 disables the reuse of values across snapshots.
+        """
+        return self._ttl
+
+    @ttl.setter
+    def ttl(self, value: float) -> None:
+        self._ttl = value
+        if value <= 0:
+            self.invalidate()
+
+
+class SetIfChanged:
+    """Skip sets of parameters whose value is known to be unchanged.
+
+    Before a parameter is set its value is compared with the latest known
+    value. If both are equal the set is skipped. The latest known value is
+    taken from the live mirror of the snapshot helper if it is running (see
+    :meth:`ZISnapshotHelper.start_live_mirror`) and from the QCoDeS cache of
+    the parameter otherwise. Sets of the driver are written into the mirror
+    right away, the mirror therefore never lags behind the cache. Cached
+    values older than ``max_age`` are not used.
+
+    Examples:
+        >>> device.set_if_changed.enabled = True
+        >>> device.set_if_changed.max_age = 60
+        >>> with device.set_if_changed(max_age=10):
+        ...     device.oscs[0].freq(10e6)
+        >>> device.set_if_changed.changed, device.set_if_changed.skipped
+        (0, 1)
+
+    Args:
+        snapshot_cache: Snapshot helper of the instrument.
+    """
+
+    def __init__(self, snapshot_cache: "ZISnapshotHelper"):
+        self._snapshot_cache = snapshot_cache
+        self.enabled = False
+        self.max_age: t.Optional[float] = None
+        self._changed = 0
+        self._skipped = 0
+
+    @contextmanager
+    def __call__(self, max_age: t.Optional[float] = None):
+        """Enable the mode temporarily.
+
+        Args:
+            max_age: Maximum age in seconds of a cached value. If not
+                specified the configured maximum age is used.
+                (default = None)
+        """
+        enabled, previous_max_age = self.enabled, self.max_age
+        self.enabled = True
+        if max_age is not None:
+            self.max_age = max_age
+        try:
+            yield self
+        finally:
+            self.enabled, self.max_age = enabled, previous_max_age
+
+    def skip(
+        self,
+        parameter: t.Any,
+        value: t.Any,
+        transaction: t.Optional["CacheTransaction"] = None,
+    ) -> bool:
+        """Check if the set of a parameter can be skipped.
+
+        Args:
+            parameter: Parameter that is set.
+            value: Value of the set.
+            transaction: Active cache transaction. (default = None)
+
+        Returns:
+            Flag if the value of the parameter is known to be unchanged.
+        """
+        if not self.enabled and not (transaction and transaction.skip_unchanged):
+            return False
+        if transaction is not None and transaction.has(parameter):
+            known = transaction.value(parameter)
+        else:
+            known = self._known_value(parameter)
+        unchanged = known is not None and _is_equal(value, known)
+        if unchanged:
+            self._skipped += 1
+        else:
+            self._changed += 1
+        return unchanged
+
+    def _known_value(self, parameter: t.Any) -> t.Any:
+        """Latest known value of a parameter. None if it is unknown."""
+        value = self._snapshot_cache.mirrored_value(parameter.zi_node)
+        if value is not None:
+            return value
+        timestamp = parameter.cache.timestamp
+        if timestamp is None or not parameter.cache.valid:
+            return None
+        if (
+            self.max_age is not None
+            and (datetime.now() - timestamp).total_seconds() > self.max_age
+        ):
+            return None
+        return parameter.cache.get(get_if_invalid=False)
+
+    def reset_statistics(self) -> None:
+        """Reset the number of changed and skipped sets."""
+        self._changed = 0
+        self._skipped = 0
+
+    @property
+    def changed(self) -> int:
+        """Number of sets that were sent because the value changed."""
+        return self._changed
+
+    @property
+    def skipped(self) -> int:
+        """Number of sets that were skipped because the value was unchanged."""
+        return self._skipped
+
+
+def _is_equal(value: t.Any, known: t.Any) -> bool:
+    """Check if a value is equal to a known value of a parameter."""
+    try:
+        return np.shape(value) == np.shape(known) and bool(np.all(value == known))
+    except (TypeError, ValueError):
+        return False
+
+
+class CacheTransaction:
+    """Deferred QCoDeS cache updates of a set transaction.
+
+    Within a set transaction the values are only sent to the data server at
+    the end of the transaction. Instead of validating the values and
+    updating the cache of a parameter for every set, the last value of each
+    parameter is recorded. All values are validated once before the
+    transaction is sent and the caches are updated with a shared timestamp
+    once it succeeded. If the transaction fails the caches are left
+    untouched.
+
+    Args:
+        skip_unchanged: Flag if sets of unchanged values should be skipped
+            within the transaction (see :class:`SetIfChanged`).
+            (default = False)
+    """
+
+    def __init__(self, skip_unchanged: bool = False):
+        self._values: t.Dict[t.Any, t.Any] = {}
+        self.skip_unchanged = skip_unchanged
+
+    def add(self, parameter: t.Any, value: t.Any) -> None:
+        """Record the set of a parameter.
+
+        Args:
+            parameter: Parameter that is set.
+            value: Value of the set.
+        """
+        self._values[parameter] = value
+
+    def has(self, parameter: t.Any) -> bool:
+        """Check if a set of a parameter has been recorded.
+
+        Args:
+            parameter: Parameter.
+
+        Returns:
+            Flag if the parameter has been set within the transaction.
+        """
+        return parameter in self._values
+
+    def value(self, parameter: t.Any) -> t.Any:
+        """Recorded value of a parameter.
+
+        Args:
+            parameter: Parameter.
+
+        Returns:
+            Last value the parameter was set to within the transaction.
+        """
+        return self._values[parameter]
+
+    def validate(self) -> None:
+        """Validate the last value of every recorded parameter.
+
+        Raises:
+            ValueError: If a value is invalid for its parameter.
+            TypeError: If a value has the wrong type for its parameter.
+        """
+        for parameter, value in self._values.items():
+            parameter.validate(value)
+
+    def commit(self) -> None:
+        """Update the caches of all recorded parameters."""
+        timestamp = datetime.now()
+        snapshot_caches = {}
+        for parameter, value in self._values.items():
+            parameter.cache._update_with(
+                value=value, raw_value=value, timestamp=timestamp
+            )
+            parameter._snapshot_cache.update_mirror(parameter.zi_node, value)
+            snapshot_caches[id(parameter._snapshot_cache)] = parameter._snapshot_cache
+        for snapshot_cache in snapshot_caches.values():
+            snapshot_cache.invalidate()
+        self._values.clear()
+
+    def discard(self) -> None:
+        """Discard all recorded parameters."""
+        self._values.clear()
+
+
+_CACHE_TRANSACTIONS: "weakref.WeakKeyDictionary[NodeTree, CacheTransaction]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def active_cache_transaction(nodetree: NodeTree) -> t.Optional[CacheTransaction]:
+    """Get the cache transaction a nodetree takes part in.
+
+    Args:
+        nodetree: Toolkit nodetree.
+
+    Returns:
+        Active cache transaction. None if no transaction is in progress.
+    """
+    return _CACHE_TRANSACTIONS.get(nodetree)
+
+
+@contextmanager
+def cache_transaction(
+    nodetrees: t.Iterable[NodeTree], *, skip_unchanged: bool = False
+) -> t.Iterator[CacheTransaction]:
+    """Context manager that defers the cache updates of sets to nodetrees.
+
+    The values are validated with :meth:`CacheTransaction.validate`, which
+    needs to be called before the settings are sent to the data server. The
+    caches are updated once the context exits without an exception.
+
+    Args:
+        nodetrees: Nodetrees that take part in the transaction.
+        skip_unchanged: Flag if sets of unchanged values should be skipped
+            within the transaction (see :class:`SetIfChanged`).
+            (default = False)
+
+    Yields:
+        Cache transaction.
+
+    Raises:
+        RuntimeError: If a nodetree already takes part in a transaction.
+    """
+    transaction = CacheTransaction(skip_unchanged)
+    registered: t.List[NodeTree] = []
+    try:
+        for nodetree in nodetrees:
+            if nodetree in _CACHE_TRANSACTIONS:
+                raise RuntimeError(
+                    "A transaction is already in progress. Only one transaction "
+                    "is possible at a time."
+                )
+            _CACHE_TRANSACTIONS[nodetree] = transaction
+            registered.append(nodetree)
+        yield transaction
+        transaction.commit()
+    finally:
+        transaction.discard()
+        for nodetree in registered:
+            _CACHE_TRANSACTIONS.pop(nodetree, None)
+
 
 class ZIParameter(Parameter):
     """Zurich Instrument specific QCoDeS Parameter.
@@ -257,12 +935,30 @@ class ZIParameter(Parameter):
         get functionality with the returned value. Thus is acts as a set and
         get within on single command without overwriting the QCoDeS specific
         implementation.
+
+        Within a set transaction only the value is sent to the transaction.
+        The validation and the cache update are deferred until the transaction
+        is committed (see :class:`CacheTransaction`).
         """
+        transaction = active_cache_transaction(self._tk_node.root)
+        if not kwargs.get("deep") and self._snapshot_cache.set_if_changed.skip(
+            self, args[0], transaction
+        ):
+            return None
+        if transaction is not None:
+            # The QCoDeS bookkeeping is done once the transaction is committed
+            self.set_raw(*args, **kwargs)
+            transaction.add(self, args[0])
+            return None
         set_return = None
 
         def set_wrapper(*args, **kwargs) -> None:
             nonlocal set_return
             set_return = self.set_raw(*args, **kwargs)
+            self._snapshot_cache.invalidate()
+            self._snapshot_cache.update_mirror(
+                self._zi_node, set_return if set_return is not None else args[0]
+            )
 
         self._wrap_set(set_wrapper)(*args, **kwargs)
         return self._wrap_get(lambda: set_return)() if set_return is not None else None
@@ -343,10 +1039,15 @@ class ZIParameter(Parameter):
 
                 Useful when waiting for value to change from existing one.
             timeout: max wait time. (default = 2)
-            sleep_time: sleep interval in seconds. (default = 0.006)
+            sleep_time: sleep interval in seconds if the node can not be
+                subscribed to. (default = 0.005)
+
+        Raises:
+            TimeoutError: If the node did not change to the expected value
+                within the timeout.
         """
-        self._tk_node.wait_for_state_change(
-            value, invert=invert, timeout=timeout, sleep_time=sleep_time
+        waiting.wait_for_state_change(
+            self, value, invert=invert, timeout=timeout, sleep_time=sleep_time
         )
 
     @property
@@ -365,6 +1066,310 @@ class ZIParameter(Parameter):
         return self._tk_node
 
 
+class _CompactCache:
+    """Minimal cache of a :class:`ZICompactParameter`.
+
+    Offers the parts of the QCoDeS parameter cache that are used by the
+    driver and by the snapshot.
+    """
+
+    __slots__ = ("_value", "_raw_value", "_timestamp")
+
+    def __init__(self):
+        self._value: t.Any = None
+        self._raw_value: t.Any = None
+        self._timestamp: t.Optional[datetime] = None
+
+    def _update_with(
+        self, *, value: t.Any, raw_value: t.Any, timestamp: t.Optional[datetime] = None
+    ) -> None:
+        """Update the cache with a new value."""
+        self._value = value
+        self._raw_value = raw_value
+        self._timestamp = timestamp if timestamp is not None else datetime.now()
+
+    def set(self, value: t.Any) -> None:
+        """Set the cached value without setting it on the device."""
+        self._update_with(value=value, raw_value=value)
+
+    def get(self, get_if_invalid: bool = False) -> t.Any:
+        """Cached value of the parameter.
+
+        Args:
+            get_if_invalid: No effect. The cache is never refreshed
+                automatically. (default = False)
+        """
+        return self._value
+
+    def invalidate(self) -> None:
+        """Mark the cached value as invalid."""
+        self._timestamp = None
+
+    @property
+    def valid(self) -> bool:
+        """Flag if the cache holds a value."""
+        return self._timestamp is not None
+
+    @property
+    def raw_value(self) -> t.Any:
+        """Cached raw value of the parameter."""
+        return self._raw_value
+
+    @property
+    def timestamp(self) -> t.Optional[datetime]:
+        """Time of the last update of the cache."""
+        return self._timestamp
+
+
+class ZICompactParameter:
+    """Lightweight variant of the :class:`ZIParameter`.
+
+    A QCoDeS parameter holds a considerable amount of state per instance.
+    For large nodetrees this adds up to a significant amount of memory per
+    device. The compact parameter only keeps a reference to the shared
+    parameter skeleton, its parent, the nodetree and the snapshot helper.
+    The toolkit node and the cache are created once they are needed.
+
+    The compact parameter supports getting, setting, the snapshot and the
+    node specific functions of the :class:`ZIParameter`. It is however not
+    a QCoDeS parameter and can therefore not be used where QCoDeS expects
+    one (e.g. in a QCoDeS measurement).
+
+    Args:
+        skeleton: Skeleton of the parameter.
+        instrument: QCoDeS parent of the parameter.
+        nodetree: underlying toolkit node tree.
+        snapshot_cache: ZI specific SnapshotHelper object
+    """
+
+    __slots__ = (
+        "_skeleton",
+        "_instrument",
+        "_nodetree",
+        "_snapshot_cache",
+        "_cache",
+        "_tk_node",
+    )
+
+    snapshot_exclude = False
+
+    def __init__(
+        self,
+        skeleton: "ParameterSkeleton",
+        instrument: t.Any,
+        nodetree: NodeTree,
+        snapshot_cache: ZISnapshotHelper,
+    ):
+        self._skeleton = skeleton
+        self._instrument = instrument
+        self._nodetree = nodetree
+        self._snapshot_cache = snapshot_cache
+        self._cache: t.Optional[_CompactCache] = None
+        self._tk_node: t.Optional[Node] = None
+
+    def __repr__(self):
+        return f"<{type(self).__name__}: {self.name} at {self.zi_node}>"
+
+    def __call__(self, *args, **kwargs):
+        """Call operator that either gets (empty) or gets the value of a node.
+
+        Args:
+            value: Optional value that should be set to the node. If not
+                specified the operator will return the value of the node
+                instead.
+            deep: Flag if the operation should block until the device has
+                acknowledged the operation. The operation returns the value
+                acknowledged by the device.
+            enum: Flag if enumerated values should return the enum value as
+                string or return the raw number.
+            parse: Flag if the GetParser or SetParser, if present, should be
+                applied or not.
+
+        Returns:
+            Value of the node for a get operation. If the deep flag is set the
+            acknowledged value from the device is returned (applies also for
+            the set operation).
+        """
+        if len(args) == 0:
+            return self.get(**kwargs)
+        return self.set(*args, **kwargs)
+
+    def get(self, **kwargs) -> t.Any:
+        """Get the value of the node and update the cache.
+
+        Args:
+            **kwargs: Forwarded to the get of the toolkit node (e.g. deep).
+
+        Returns:
+            Value of the node.
+        """
+        value = self.tk_node._get(**kwargs)
+        self.cache._update_with(value=value, raw_value=value)
+        return value
+
+    def set(self, value: t.Any, **kwargs) -> t.Any:
+        """Set the value of the node and update the cache.
+
+        Args:
+            value: Value that should be set.
+            **kwargs: Forwarded to the set of the toolkit node (e.g. deep).
+
+        Returns:
+            Acknowledged value if the set was deep.
+        """
+        transaction = active_cache_transaction(self._nodetree)
+        if not kwargs.get("deep") and self._snapshot_cache.set_if_changed.skip(
+            self, value, transaction
+        ):
+            return None
+        set_return = self.tk_node._set(value, **kwargs)
+        if transaction is not None:
+            transaction.add(self, value)
+            return set_return
+        self._snapshot_cache.invalidate()
+        value = set_return if set_return is not None else value
+        self._snapshot_cache.update_mirror(self.zi_node, value)
+        self.cache._update_with(value=value, raw_value=value)
+        return set_return
+
+    def validate(self, value: t.Any) -> None:
+        """Validate a value.
+
+        Compact parameters have no validators. The value is validated by the
+        toolkit node when it is set.
+
+        Args:
+            value: Value to validate.
+        """
+
+    def snapshot(self, update: t.Optional[bool] = True) -> t.Dict[str, t.Any]:
+        """State of the parameter as a JSON-compatible dict.
+
+        Args:
+            update: If True, update the state through the snapshot helper.
+                Otherwise the cached value is used. (default = True)
+
+        Returns:
+            Snapshot of the parameter.
+        """
+        state: t.Dict[str, t.Any] = {
+            "__class__": f"{type(self).__module__}.{type(self).__name__}",
+            "full_name": self.full_name,
+            "name": self.name,
+            "label": self.name,
+            "unit": self.unit or "",
+            "zi_node": self.zi_node,
+        }
+        if not self._skeleton.do_snapshot:
+            return state
+        if update:
+            self._snapshot_cache.get(self, self.get)
+        cache = self.cache
+        state["value"] = cache.get()
+        state["raw_value"] = cache.raw_value
+        state["ts"] = (
+            cache.timestamp.strftime("%Y-%m-%d %H:%M:%S") if cache.timestamp else None
+        )
+        return state
+
+    def subscribe(self) -> None:
+        """Subscribe to nodes. Fetch data with the poll command."""
+        self.tk_node.subscribe()
+
+    def unsubscribe(self) -> None:
+        """Unsubscribe data stream."""
+        self.tk_node.unsubscribe()
+
+    def get_as_event(self) -> None:
+        """Trigger an event.
+
+        The node data is returned by a subsequent poll command.
+        """
+        self.tk_node.get_as_event()
+
+    def wait_for_state_change(
+        self,
+        value: t.Union[int, str],
+        *,
+        invert: bool = False,
+        timeout: float = 2,
+        sleep_time: float = 0.005,
+    ) -> None:
+        """Waits until the node has the expected state/value.
+
+        WARNING: Only supports integer values as reference.
+
+        Args:
+            value: expected value of the node.
+            invert: Instead of waiting for the value, the function will wait for
+                any value except the passed value instead. (default = False)
+            timeout: max wait time. (default = 2)
+            sleep_time: sleep interval in seconds if the node can not be
+                subscribed to. (default = 0.005)
+
+        Raises:
+            TimeoutError: If the node did not change to the expected value
+                within the timeout.
+        """
+        waiting.wait_for_state_change(
+            self, value, invert=invert, timeout=timeout, sleep_time=sleep_time
+        )
+
+    @property
+    def cache(self) -> _CompactCache:
+        """Cache of the parameter (created on first access)."""
+        if self._cache is None:
+            self._cache = _CompactCache()
+        return self._cache
+
+    @property
+    def name(self) -> str:
+        """Name of the parameter."""
+        return self._skeleton.qcodes_list[-1]
+
+    @property
+    def full_name(self) -> str:
+        """Name of the parameter including the names of its parents."""
+        return f"{self._instrument.full_name}_{self.name}"
+
+    @property
+    def unit(self) -> t.Optional[str]:
+        """Unit of the parameter."""
+        return self._skeleton.unit
+
+    @property
+    def docstring(self) -> t.Optional[str]:
+        """Description of the node."""
+        return self._skeleton.docstring
+
+    @property
+    def instrument(self) -> t.Any:
+        """Parent QCoDeS node of the parameter."""
+        return self._instrument
+
+    @property
+    def root_instrument(self) -> t.Any:
+        """Root QCoDeS instrument the parameter belongs to."""
+        return self._instrument.root_instrument
+
+    @property
+    def node_info(self) -> NodeInfo:
+        """Zurich Instrument node representation of the Parameter."""
+        return self.tk_node.node_info
+
+    @property
+    def zi_node(self) -> str:
+        """Zurich Instrument node path of the Parameter."""
+        return self._skeleton.zi_node
+
+    @property
+    def tk_node(self) -> Node:
+        """Toolkit node of the Parameter (created on first access)."""
+        if self._tk_node is None:
+            self._tk_node = Node(self._nodetree, self._skeleton.raw_tree)
+        return self._tk_node
+
+
 class ZINode(InstrumentChannel):
     """Zurich Instrument specific QCoDeS InstrumentChannel.
 
@@ -421,6 +1426,11 @@ class ZINode(InstrumentChannel):
         with self._snapshot_cache.snapshot(self._zi_node) if update else nullcontext():
             return super().print_readable_snapshot(update, max_chars)
 
+    @property
+    def zi_node(self) -> t.Optional[str]:
+        """Zurich Instrument node path of the node."""
+        return self._zi_node
+
 
 class ZIChannelList(ChannelList):
     """Zurich Instrument specific QCoDeS InstrumentChannel.
@@ -522,6 +1532,32 @@ class ZIInstrument(Instrument):
         with self._snapshot_cache.snapshot() if update else nullcontext():
             return super().print_readable_snapshot(update, max_chars)
 
+    @property
+    def snapshot_cache(self) -> ZISnapshotHelper:
+        """Helper that bundles the gets of a snapshot.
+
+        Can be used to configure a time-to-live for the snapshot values
+        (``snapshot_cache.ttl``), to discard them
+        (``snapshot_cache.invalidate()``) or to start a live mirror of the
+        nodes (``snapshot_cache.start_live_mirror()``).
+        """
+        return self._snapshot_cache
+
+    @property
+    def set_if_changed(self) -> SetIfChanged:
+        """Option to skip sets of parameters whose value is unchanged.
+
+        Disabled by default. Can be enabled permanently
+        (``set_if_changed.enabled = True``) or temporarily
+        (``with device.set_if_changed(max_age=10):``).
+        """
+        return self._snapshot_cache.set_if_changed
+
+    def close(self) -> None:
+        """Stop the live mirror of the snapshot and close the instrument."""
+        self._snapshot_cache.stop_live_mirror()
+        super().close()
+
 
 class NodeDict(Mapping):
     """Mapping of dictionary structure results.
@@ -540,7 +1576,7 @@ class NodeDict(Mapping):
         return repr(self._result)
 
     def __getitem__(self, key: t.Union[str, ZIParameter]):
-        if isinstance(key, ZIParameter):
+        if isinstance(key, (ZIParameter, ZICompactParameter)):
             return self._result[key.zi_node.lower()]
         return self._result[key]
 
@@ -558,6 +1594,29 @@ class NodeDict(Mapping):
         return self._result.to_dict()
 
 
+def get_entry_value(raw_value: t.Any) -> t.Any:
+    """Value of a single entry of a flat get.
+
+    Args:
+        raw_value: Entry of the result of a flat ``zhinst.core`` get.
+
+    Returns:
+        Value of the entry.
+    """
+    try:
+        return raw_value["value"][0]
+    except TypeError:
+        # ZIVectorData have a different structure
+        value = raw_value[0]
+        return value["vector"] if isinstance(value, dict) else value
+    except IndexError:
+        # HF2 has no timestamp
+        return raw_value[0]
+    except KeyError:
+        # HF2 returns sample nodes as well
+        return raw_value
+
+
 def tk_node_to_qcodes_list(tk_node: Node) -> t.List[str]:
     """Convert a toolkit node to a list of elements that form a QCoDeS object.
 
@@ -598,17 +1657,80 @@ def tk_node_to_parameter(root: t.Any, tk_node: Node) -> t.Any:
     Returns:
         QCoDeS Parameter that matches the given tk node.
     """
-    qcodes_list = list(tk_node.raw_tree)
-    if qcodes_list[-1].isdigit():
-        qcodes_list.append("value")
+    raw_tree = tk_node.raw_tree
+    name = tk_node_to_qcodes_list(tk_node)[-1]
+    parents = raw_tree if raw_tree[-1].isdigit() else raw_tree[:-1]
     current_layer = root
-    for element in qcodes_list[:-1]:
-        qcodes_list = tk_node_to_qcodes_list(tk_node)
+    for element in parents:
         if element.isdigit():
             current_layer = current_layer[int(element)]
         else:
             current_layer = current_layer.submodules[element]
-    return current_layer.parameters[qcodes_list[-1]]
+    return current_layer.parameters[name]
+
+
+def _get_child(
+    layer, parents: t.List[str], index: int, snapshot_cache: ZISnapshotHelper
+) -> ZINode:
+    """Get a single child element of a layer.
+
+    Reuse the existing child and automatically create it if it doesn`t
+    exist.
+
+    Args:
+        layer: Layer of which the child should be returned.
+        parents: Nested parents of a node as str.
+        index: Index of the child element within the parents.
+        snapshot_cache: Object of the snapshot cache.
+
+    Returns:
+        ZINode: child element
+    """
+    weird_nodes = ["tamp0", "tamp1"]
+    node = parents[index]
+    if node[-1].isdigit() and node not in weird_nodes:
+        offset = 0
+        for char in reversed(node):
+            if char.isdigit():
+                offset += 1
+            else:
+                break
+        number = int(node[-offset:])
+        name = node[:-offset]
+        if not layer.submodules or name not in layer.submodules:
+            # create channel_list
+            channel_list = ZIChannelList(
+                layer,
+                name,
+                ZINode,
+                zi_node="/".join(parents[:index] + [name]),
+                snapshot_cache=snapshot_cache,
+            )
+            layer.add_submodule(name, channel_list)
+        if len(layer.submodules[name]) <= number:
+            # Add new items to list until the required length is reached. (#31)
+            current_length = len(layer.submodules[name])
+            for item in range(number - current_length + 1):
+                module = ZINode(
+                    layer,
+                    name + str(current_length + item),
+                    zi_node="/".join(
+                        parents[:index] + [name, str(current_length + item)]
+                    ),
+                    snapshot_cache=snapshot_cache,
+                )
+                layer.submodules[name].append(module)
+        return layer.submodules[name][number]
+    if node not in layer.submodules:
+        module = ZINode(
+            layer,
+            node,
+            zi_node="/".join(parents[: index + 1]),
+            snapshot_cache=snapshot_cache,
+        )
+        layer.add_submodule(node, module)
+        return module
+    return layer.submodules.get(node)
 
 
 def _get_submodule(
@@ -626,54 +1748,387 @@ def _get_submodule(
     Returns:
         ZINode: direct parent of the node
     """
-    weird_nodes = ["tamp0", "tamp1"]
     current_layer = layer
-    for i, node in enumerate(parents):
-        if node[-1].isdigit() and node not in weird_nodes:
-            offset = 0
-            for char in reversed(node):
-                if char.isdigit():
-                    offset += 1
-                else:
-                    break
-            number = int(node[-offset:])
-            name = node[:-offset]
-            if not current_layer.submodules or name not in current_layer.submodules:
-                # create channel_list
-                channel_list = ZIChannelList(
-                    current_layer,
-                    name,
-                    ZINode,
-                    zi_node="/".join(parents[:i] + [name]),
-                    snapshot_cache=snapshot_cache,
-                )
-                current_layer.add_submodule(name, channel_list)
-            if len(current_layer.submodules[name]) <= number:
-                # Add new items to list until the required length is reached. (#31)
-                current_length = len(current_layer.submodules[name])
-                for item in range(number - current_length + 1):
-                    module = ZINode(
-                        current_layer,
-                        name + str(current_length + item),
-                        zi_node="/".join(
-                            parents[:i] + [name, str(current_length + item)]
-                        ),
-                        snapshot_cache=snapshot_cache,
-                    )
-                    current_layer.submodules[name].append(module)
-            current_layer = current_layer.submodules[name][number]
-        elif node not in current_layer.submodules:
-            module = ZINode(
-                current_layer,
-                node,
-                zi_node="/".join(parents[: i + 1]),
-                snapshot_cache=snapshot_cache,
+    for i in range(len(parents)):
+        current_layer = _get_child(current_layer, parents, i, snapshot_cache)
+    return current_layer
+
+
+def _get_cached_submodule(
+    layer,
+    parents: t.List[str],
+    snapshot_cache: ZISnapshotHelper,
+    submodules: t.Dict[t.Tuple[str, ...], t.Any],
+) -> ZINode:
+    """Get the nested parent element for a node with a cache of the parents.
+
+    Every parent (and each of its ancestors) is only looked up once, nodes
+    with the same parent reuse the cached element.
+
+    Args:
+        layer: Root layer.
+        parents: Nested parents of a node as str.
+        snapshot_cache: Object of the snapshot cache.
+        submodules: Already known parent elements by their nested parents.
+
+    Returns:
+        ZINode: direct parent of the node
+    """
+    key = tuple(parents)
+    submodule = submodules.get(key)
+    if submodule is None:
+        if parents:
+            parent = _get_cached_submodule(
+                layer, parents[:-1], snapshot_cache, submodules
             )
-            current_layer.add_submodule(node, module)
-            current_layer = module
+            submodule = _get_child(parent, parents, len(parents) - 1, snapshot_cache)
         else:
-            current_layer = current_layer.submodules.get(node)
-    return current_layer
+            submodule = layer
+        submodules[key] = submodule
+    return submodule
+
+
+class ParameterSkeleton(t.NamedTuple):
+    """Static description of the QCoDeS parameter of a single toolkit node.
+
+    The skeleton only consists of JSON serializable elements and is
+    independent of a connection to a data server.
+    """
+
+    raw_tree: t.Tuple[str, ...]
+    qcodes_list: t.List[str]
+    zi_node: str
+    docstring: t.Optional[str]
+    unit: t.Optional[str]
+    is_complex: bool
+    do_snapshot: bool
+
+
+def is_snapshot_node(info: t.Dict[str, t.Any]) -> bool:
+    """Check if the parameter of a node is part of the snapshot.
+
+    Streaming, vector, write only and blacklisted nodes are excluded.
+
+    Args:
+        info: Node information of the toolkit node.
+
+    Returns:
+        Flag if the value of the node is included in a snapshot.
+    """
+    path = info.get("Node", "").lower().split("/")
+    return (
+        "Stream" not in info.get("Properties", "")
+        and "Vector" not in info.get("Type", "")
+        and "Read" in info.get("Properties", "")
+        and not any(x in path for x in _SNAPSHOT_BLACKLIST)
+    )
+
+
+def parameter_skeleton(node: Node, info: t.Dict[str, t.Any]) -> ParameterSkeleton:
+    """Generate the parameter skeleton for a toolkit node.
+
+    Args:
+        node: Toolkit node.
+        info: Node information of the toolkit node.
+
+    Returns:
+        Skeleton of the QCoDeS parameter.
+    """
+    zi_node = info["Node"]
+    return ParameterSkeleton(
+        raw_tree=tuple(node.raw_tree),
+        qcodes_list=tk_node_to_qcodes_list(node),
+        zi_node=zi_node,
+        docstring=info.get("Description"),
+        unit=info.get("Unit")
+        if info.get("Unit") not in ["None", "Dependent"]
+        else None,
+        is_complex=bool(re.match(_IS_COMPLEX, zi_node.lower())),
+        do_snapshot=is_snapshot_node(info),
+    )
+
+
+def nodetree_skeleton(
+    nodetree: NodeTree, blacklist: tuple = tuple()
+) -> t.List[ParameterSkeleton]:
+    """Generate the parameter skeletons for all nodes of a nodetree.
+
+    Args:
+        nodetree: underlying toolkit node tree.
+        blacklist: nodes to be blacklisted.
+
+    Returns:
+        Skeletons of all QCoDeS parameters in the order of the nodetree.
+    """
+    return [
+        parameter_skeleton(node, info)
+        for node, info in nodetree
+        if info.get("Node", "") not in blacklist
+    ]
+
+
+def _add_parameter(
+    parent,
+    skeleton: ParameterSkeleton,
+    node: t.Optional[Node],
+    nodetree: NodeTree,
+    snapshot_cache: ZISnapshotHelper,
+    compact: bool = False,
+) -> None:
+    """Add a single ZIParameter for a toolkit node to its parent.
+
+    Args:
+        parent: QCoDeS parent of the parameter.
+        skeleton: Skeleton of the parameter.
+        node: Toolkit node of the parameter. If None it is created once it is
+            needed.
+        nodetree: underlying toolkit node tree.
+        snapshot_cache: Instance of the SnapshotHelper.
+        compact: Flag if a :class:`ZICompactParameter` should be added instead
+            of a :class:`ZIParameter`. (default = False)
+    """
+    if compact:
+        parent.parameters[skeleton.qcodes_list[-1]] = ZICompactParameter(
+            skeleton, parent, nodetree, snapshot_cache
+        )
+        return
+    if node is None:
+        node = Node(nodetree, skeleton.raw_tree)
+    parent.add_parameter(
+        parameter_class=ZIParameter,
+        name=skeleton.qcodes_list[-1],
+        docstring=skeleton.docstring,
+        unit=skeleton.unit,
+        get_cmd=node._get,
+        set_cmd=node._set,
+        vals=ComplexNumbers() if skeleton.is_complex else None,
+        snapshot_value=skeleton.do_snapshot,
+        snapshot_get=skeleton.do_snapshot,
+        zi_node=skeleton.zi_node,
+        tk_node=node,
+        snapshot_cache=snapshot_cache,
+    )
+
+
+class _LazyLayer:
+    """Pending nodes of a single QCoDeS layer.
+
+    The nodes are only converted into QCoDeS parameters and submodules once
+    the layer is accessed for the first time. Direct children of the layer
+    receive their nodes as pending nodes as well. That way only the accessed
+    branches of the nodetree are ever materialized.
+
+    Args:
+        layer: QCoDeS layer the pending nodes belong to.
+        depth: Index of the layer within the QCoDeS list of a node.
+        nodetree: underlying toolkit node tree.
+        snapshot_cache: Instance of the SnapshotHelper.
+        compact: Flag if compact parameters should be created.
+            (default = False)
+    """
+
+    def __init__(
+        self,
+        layer,
+        depth: int,
+        nodetree: NodeTree,
+        snapshot_cache: ZISnapshotHelper,
+        compact: bool = False,
+    ):
+        self._layer = layer
+        self._depth = depth
+        self._nodetree = nodetree
+        self._snapshot_cache = snapshot_cache
+        self._compact = compact
+        self._pending: t.List[t.Tuple[ParameterSkeleton, t.Optional[Node]]] = []
+        self._names: t.Set[str] = set()
+        self._loaded = False
+
+    @classmethod
+    def install(
+        cls,
+        layer,
+        depth: int,
+        nodetree: NodeTree,
+        snapshot_cache: ZISnapshotHelper,
+        compact: bool = False,
+    ) -> "_LazyLayer":
+        """Get the lazy layer of a QCoDeS layer.
+
+        Already existing parameters and submodules of the layer are kept.
+
+        Args:
+            layer: QCoDeS layer.
+            depth: Index of the layer within the QCoDeS list of a node.
+            nodetree: underlying toolkit node tree.
+            snapshot_cache: Instance of the SnapshotHelper.
+            compact: Flag if compact parameters should be created.
+                (default = False)
+
+        Returns:
+            Lazy layer of the QCoDeS layer.
+        """
+        if isinstance(layer.parameters, _LazyDict):
+            return layer.parameters.lazy_layer
+        lazy_layer = cls(layer, depth, nodetree, snapshot_cache, compact)
+        layer.parameters = _LazyDict(lazy_layer, layer.parameters)
+        layer.submodules = _LazyDict(lazy_layer, layer.submodules)
+        return lazy_layer
+
+    def add(self, skeleton: ParameterSkeleton, node: t.Optional[Node]) -> None:
+        """Add a node to the layer.
+
+        Args:
+            skeleton: Skeleton of the parameter.
+            node: Toolkit node. If None it is created once it is needed.
+        """
+        if self._loaded:
+            self._materialize(skeleton, node)
+        else:
+            self._pending.append((skeleton, node))
+            name = skeleton.qcodes_list[self._depth]
+            self._names.add(name)
+            # Numbered nodes become elements of a channel list
+            self._names.add(name.rstrip("0123456789"))
+
+    def may_contain(self, key: t.Any) -> bool:
+        """Check if materializing the layer could create an item.
+
+        Args:
+            key: Name of the parameter or submodule.
+
+        Returns:
+            Flag if a pending node would create an item with the name.
+        """
+        return not self._loaded and key in self._names
+
+    def load(self) -> None:
+        """Materialize all pending nodes of the layer."""
+        if self._loaded:
+            return
+        self._loaded = True
+        self._names = set()
+        pending, self._pending = self._pending, []
+        for skeleton, node in pending:
+            self._materialize(skeleton, node)
+
+    def _materialize(self, skeleton: ParameterSkeleton, node: t.Optional[Node]) -> None:
+        """Add a node either as parameter or forward it to the next layer.
+
+        Args:
+            skeleton: Skeleton of the parameter.
+            node: Toolkit node. If None it is created once it is needed.
+        """
+        try:
+            if len(skeleton.qcodes_list) == self._depth + 1:
+                _add_parameter(
+                    self._layer,
+                    skeleton,
+                    node,
+                    self._nodetree,
+                    self._snapshot_cache,
+                    self._compact,
+                )
+                return
+            child = _get_child(
+                self._layer, skeleton.qcodes_list, self._depth, self._snapshot_cache
+            )
+        except ValueError as e:
+            print(f"Node {skeleton.zi_node} could not be added as parameter\n", e)
+            return
+        _LazyLayer.install(
+            child,
+            self._depth + 1,
+            self._nodetree,
+            self._snapshot_cache,
+            self._compact,
+        ).add(skeleton, node)
+
+
+class _LazyDict(dict):
+    """Dictionary that materializes its lazy layer before it is read.
+
+    Used for the ``parameters`` and ``submodules`` of a lazy QCoDeS layer.
+
+    Args:
+        lazy_layer: Lazy layer the dictionary belongs to.
+        initial: Already existing items.
+    """
+
+    def __init__(self, lazy_layer: _LazyLayer, initial: t.Dict[str, t.Any]):
+        super().__init__(initial)
+        self._lazy_layer = lazy_layer
+
+    @property
+    def lazy_layer(self) -> _LazyLayer:
+        """Lazy layer the dictionary belongs to."""
+        return self._lazy_layer
+
+    def __getitem__(self, key):
+        # Attribute lookups of QCoDeS end here for every missing attribute.
+        # Only load the layer if the pending nodes can contain the key.
+        if self._lazy_layer.may_contain(key):
+            self._lazy_layer.load()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        if self._lazy_layer.may_contain(key):
+            self._lazy_layer.load()
+        return super().__contains__(key)
+
+    def __iter__(self):
+        self._lazy_layer.load()
+        return super().__iter__()
+
+    def __len__(self):
+        self._lazy_layer.load()
+        return super().__len__()
+
+    def __repr__(self):
+        self._lazy_layer.load()
+        return super().__repr__()
+
+    def get(self, key, default=None):
+        if self._lazy_layer.may_contain(key):
+            self._lazy_layer.load()
+        return super().get(key, default)
+
+    def keys(self):
+        self._lazy_layer.load()
+        return super().keys()
+
+    def values(self):
+        self._lazy_layer.load()
+        return super().values()
+
+    def items(self):
+        self._lazy_layer.load()
+        return super().items()
+
+
+def _skeleton_nodes(
+    nodetree: NodeTree,
+    blacklist: tuple,
+    skeleton: t.Optional[t.List[ParameterSkeleton]],
+) -> t.Iterator[t.Tuple[ParameterSkeleton, t.Optional[Node]]]:
+    """Iterate over the parameter skeletons and toolkit nodes of a nodetree.
+
+    Args:
+        nodetree: underlying toolkit node tree.
+        blacklist: nodes to be blacklisted.
+        skeleton: Precomputed parameter skeletons. If specified the toolkit
+            nodes are not created and None is returned instead.
+
+    Yields:
+        Parameter skeleton and toolkit node.
+    """
+    if skeleton is not None:
+        for item in skeleton:
+            yield item, None
+        return
+    for node, info in nodetree:
+        if info.get("Node", "") not in blacklist:
+            yield parameter_skeleton(node, info), node
 
 
 def init_nodetree(
@@ -681,6 +2136,10 @@ def init_nodetree(
     nodetree: NodeTree,
     snapshot_cache: ZISnapshotHelper,
     blacklist: tuple = tuple(),
+    *,
+    lazy: bool = False,
+    skeleton: t.Optional[t.List[ParameterSkeleton]] = None,
+    compact: bool = False,
 ) -> None:
     """Generate nested qcodes parameter from the device nodetree.
 
@@ -689,41 +2148,29 @@ def init_nodetree(
         nodetree: underlying toolkit node tree.
         snapshot_cache: Instance of the SnapshotHelper.
         blacklist: nodes to be blacklisted.
+        lazy: Flag if the parameters and submodules should only be created
+            once they are accessed for the first time. (default = False)
+        skeleton: Precomputed parameter skeletons of the nodetree
+            (see :func:`nodetree_skeleton`). If specified the nodes of the
+            nodetree are not iterated and the blacklist is ignored.
+            (default = None)
+        compact: Flag if lightweight :class:`ZICompactParameter` should be
+            created instead of QCoDeS parameters. (default = False)
     """
-    snapshot_blacklist = ["fwlog", "values"]
-
-    is_complex = re.compile("demods/./sample")
-
-    for node, info in nodetree:
-        if info.get("Node", "") in blacklist:
-            continue
+    lazy_layer = (
+        _LazyLayer.install(layer, 0, nodetree, snapshot_cache, compact)
+        if lazy
+        else None
+    )
+    submodules: t.Dict[t.Tuple[str, ...], t.Any] = {}
+    for item, node in _skeleton_nodes(nodetree, blacklist, skeleton):
         try:
-            qcodes_list = tk_node_to_qcodes_list(node)
-            name = qcodes_list[-1]
-            parent = _get_submodule(layer, qcodes_list[:-1], snapshot_cache)
-            do_snapshot = (
-                "Stream" not in info.get("Properties")
-                and "ZIVector" not in info.get("Type")
-                and "Read" in info.get("Properties")
-                and not any(x in node.raw_tree for x in snapshot_blacklist)
-            )
-            parent.add_parameter(
-                parameter_class=ZIParameter,
-                name=name,
-                docstring=info.get("Description"),
-                unit=info.get("Unit")
-                if info.get("Unit") not in ["None", "Dependent"]
-                else None,
-                get_cmd=node._get,
-                set_cmd=node._set,
-                vals=ComplexNumbers()
-                if re.match(is_complex, info.get("Node").lower())
-                else None,
-                snapshot_value=do_snapshot,
-                snapshot_get=do_snapshot,
-                zi_node=info.get("Node"),
-                tk_node=node,
-                snapshot_cache=snapshot_cache,
+            if lazy_layer is not None:
+                lazy_layer.add(item, node)
+                continue
+            parent = _get_cached_submodule(
+                layer, item.qcodes_list[:-1], snapshot_cache, submodules
             )
+            _add_parameter(parent, item, node, nodetree, snapshot_cache, compact)
         except ValueError as e:
-            print(f"Node {info.get('Node')} could not be added as parameter\n", e)
+            print(f"Node {item.zi_node} could not be added as parameter\n", e)
@@ -0,0 +1,349 @@
+"""Recording of LabOne module results to HDF5 or NetCDF files."""
+import importlib
+import queue
+import threading
+import typing as t
+from collections.abc import Mapping
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+T = t.TypeVar("T")
+
+# Suffixes of NetCDF files. All other files are written as plain HDF5 files.
+_NETCDF_SUFFIXES = [".nc", ".nc4", ".netcdf"]
+
+
+def _import(name: str) -> t.Any:
+    """Import the optional dependency of a file format."""
+    try:
+        return importlib.import_module(name)
+    except ModuleNotFoundError as e:
+        raise ModuleNotFoundError(
+            f"Recording to this file format requires {name} (pip install {name})."
+        ) from e
+
+
+def _record_id(record: t.Mapping[str, t.Any]) -> t.Optional[int]:
+    """Creation time of a record. None if the record has no timestamp."""
+    created = record.get("header", {}).get("createdtimestamp")
+    if created is None:
+        created = record.get("timestamp")
+    if created is None:
+        return None
+    return int(np.ravel(created)[0])
+
+
+def _records(data: t.Any) -> t.Iterator[t.Mapping[str, t.Any]]:
+    """All records in the result of a single node.
+
+    Sweeper results are nested lists of records. Processed DAQ module results
+    consist of named tuples.
+    """
+    if isinstance(data, Mapping):
+        yield data
+    elif hasattr(data, "_asdict"):
+        yield data._asdict()
+    elif isinstance(data, (list, tuple)):
+        for element in data:
+            yield from _records(element)
+
+
+def _fields(record: t.Mapping[str, t.Any]) -> t.Dict[str, np.ndarray]:
+    """Numeric fields of a record."""
+    fields = {}
+    for name, value in record.items():
+        if name in ["header", "shape"] or value is None:
+            continue
+        array = np.asarray(value)
+        if array.dtype.kind in "biufc":
+            fields[name] = array
+    return fields
+
+
+class _HDF5File:
+    """Chunked and compressed datasets in a HDF5 file."""
+
+    def __init__(self, path: Path, compression: str, compression_level: int):
+        self._file = _import("h5py").File(path, "w")
+        self._compression = compression
+        self._compression_level = compression_level
+
+    def resize(self, name: str, array: np.ndarray, length: int) -> t.Any:
+        """Resize the dataset of a field to the specified number of records."""
+        if name not in self._file:
+            self._file.create_dataset(
+                name,
+                shape=(0,) + array.shape,
+                maxshape=(None,) + array.shape,
+                dtype=array.dtype,
+                chunks=True,
+                compression=self._compression,
+                compression_opts=self._compression_level,
+            )
+        dataset = self._file[name]
+        dataset.resize(length, axis=0)
+        return dataset
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class _NetCDFFile:
+    """Chunked and compressed variables in a NetCDF4 file.
+
+    Each node is stored in a group with an unlimited ``record`` dimension.
+    Complex fields are split into a real and an imaginary part since NetCDF
+    has no complex data type.
+    """
+
+    def __init__(self, path: Path, compression: str, compression_level: int):
+        self._file = _import("h5netcdf").File(path, "w")
+        self._compression = compression
+        self._compression_level = compression_level
+
+    def resize(self, name: str, array: np.ndarray, length: int) -> t.Any:
+        """Resize the variable of a field to the specified number of records."""
+        group_name, variable_name = name.rsplit("/", 1)
+        if group_name not in self._file:
+            self._file.create_group(group_name)
+        group = self._file[group_name]
+        if "record" not in group.dimensions:
+            group.dimensions["record"] = None
+        if variable_name not in group.variables:
+            dimensions = ["record"]
+            for axis, size in enumerate(array.shape):
+                dimension = f"{variable_name}_{axis}"
+                group.dimensions[dimension] = size
+                dimensions.append(dimension)
+            group.create_variable(
+                variable_name,
+                tuple(dimensions),
+                dtype=array.dtype,
+                chunks=True,
+                compression=self._compression,
+                compression_opts=self._compression_level,
+            )
+        if group.dimensions["record"].size != length:
+            group.resize_dimension("record", length)
+        return group.variables[variable_name]
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class Recorder:
+    """Writes the results of a LabOne module to a file.
+
+    Every result passed to :meth:`write` is queued and written to the file by
+    a background thread. The module loop is therefore not stalled by the
+    file access. Each field of a node is stored in a chunked and compressed
+    dataset named ``<node path>/<field>`` with one entry per record (e.g. a
+    DAQ burst or a scope shot).
+
+    In the ``append`` mode records are identified by their creation
+    timestamp and only new records are appended. Results that contain all
+    records every time (e.g. the sweeper, whose sweeps are updated in place)
+    use the ``replace`` mode, where the datasets always contain the records
+    of the latest result.
+
+    Files with the suffix ``.nc`` are written as NetCDF4 files (requires
+    h5netcdf), all others as HDF5 files (requires h5py).
+
+    Args:
+        path: Path of the file. An existing file is overwritten.
+        mode: Either ``append`` or ``replace``. (default = "append")
+        compression: Compression filter of the datasets. (default = "gzip")
+        compression_level: Compression level of the datasets. (default = 4)
+        max_pending: Maximum number of results that are queued. If the writer
+            falls behind, :meth:`write` blocks until there is space in the
+            queue. (default = 100)
+    """
+
+    def __init__(
+        self,
+        path: t.Union[str, Path],
+        *,
+        mode: str = "append",
+        compression: str = "gzip",
+        compression_level: int = 4,
+        max_pending: int = 100,
+    ):
+        if mode not in ["append", "replace"]:
+            raise ValueError(f"Invalid recording mode {mode}.")
+        self._path = Path(path)
+        self._mode = mode
+        self._netcdf = self._path.suffix.lower() in _NETCDF_SUFFIXES
+        file_class = _NetCDFFile if self._netcdf else _HDF5File
+        self._file = file_class(self._path, compression, compression_level)
+        self._queue: "queue.Queue[t.Optional[t.Mapping[str, t.Any]]]" = queue.Queue(
+            max_pending
+        )
+        self._last_ids: t.Dict[str, int] = {}
+        self._lengths: t.Dict[str, int] = {}
+        self._records = 0
+        self._exception: t.Optional[Exception] = None
+        self._thread: t.Optional[threading.Thread] = threading.Thread(
+            target=self._run, name="zhinst-qcodes-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write(self, result: t.Mapping[str, t.Any]) -> None:
+        """Queue the result of a module read for writing.
+
+        Args:
+            result: Result of the module read with the node paths as keys.
+
+        Raises:
+            RuntimeError: If the recorder is closed.
+            Exception: The exception that terminated the writer thread (if
+                any).
+        """
+        if self._thread is None:
+            raise RuntimeError(f"The recorder of {self._path} is closed.")
+        if self._exception is not None:
+            self.close()
+        self._queue.put(result)
+
+    def close(self) -> None:
+        """Write all queued results and close the file.
+
+        Raises:
+            Exception: The exception that terminated the writer thread (if
+                any).
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._file.close()
+        if self._exception is not None:
+            exception, self._exception = self._exception, None
+            raise exception
+
+    def _run(self) -> None:
+        """Write loop of the background thread."""
+        while True:
+            result = self._queue.get()
+            if result is None:
+                return
+            if self._exception is not None:
+                continue
+            try:
+                for path, data in result.items():
+                    self._write_node(str(path).lower(), data)
+            except Exception as e:
+                self._exception = e
+
+    def _write_node(self, path: str, data: t.Any) -> None:
+        """Write the records of a single node."""
+        records = list(_records(data))
+        if self._mode == "replace":
+            self._lengths[path] = 0
+        else:
+            last_id = self._last_ids.get(path)
+            new_records = []
+            for record in records:
+                record_id = _record_id(record)
+                if record_id is None or last_id is None or record_id > last_id:
+                    new_records.append(record)
+                    last_id = record_id if record_id is not None else last_id
+            if last_id is not None:
+                self._last_ids[path] = last_id
+            records = new_records
+        for record in records:
+            index = self._lengths.get(path, 0)
+            for name, array in _fields(record).items():
+                for field_name, field in self._split(name, array):
+                    dataset = self._file.resize(
+                        f"{path.strip('/')}/{field_name}", field, index + 1
+                    )
+                    dataset[index] = field
+            self._lengths[path] = index + 1
+            self._records += 1
+
+    def _split(self, name: str, array: np.ndarray) -> t.List[t.Tuple[str, np.ndarray]]:
+        """Split complex fields into real and imaginary part for NetCDF."""
+        if self._netcdf and array.dtype.kind == "c":
+            return [(f"{name}_real", array.real), (f"{name}_imag", array.imag)]
+        return [(name, array)]
+
+    @property
+    def path(self) -> Path:
+        """Path of the file."""
+        return self._path
+
+    @property
+    def records(self) -> int:
+        """Number of records that were written."""
+        return self._records
+
+    @property
+    def is_running(self) -> bool:
+        """Flag if the writer thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+
+@contextmanager
+def record_to(
+    module: t.Any,
+    path: t.Union[str, Path],
+    *,
+    mode: str = "append",
+    compression: str = "gzip",
+    compression_level: int = 4,
+) -> t.Iterator[Recorder]:
+    """Record the results of a module to a file.
+
+    While the context is active every result read from the module is written
+    to the file by a :class:`Recorder`.
+
+    Args:
+        module: QCoDeS driver of the module.
+        path: Path of the file. An existing file is overwritten.
+        mode: Recording mode (see :class:`Recorder`). (default = "append")
+        compression: Compression filter of the datasets. (default = "gzip")
+        compression_level: Compression level of the datasets. (default = 4)
+
+    Yields:
+        Recorder of the module.
+
+    Raises:
+        RuntimeError: If the module is already recording.
+    """
+    if getattr(module, "_recorder", None) is not None:
+        raise RuntimeError(f"{module.name} is already recording.")
+    recorder = Recorder(
+        path, mode=mode, compression=compression, compression_level=compression_level
+    )
+    module._recorder = recorder
+    try:
+        yield recorder
+    finally:
+        module._recorder = None
+        recorder.close()
+
+
+def record(module: t.Any, result: T) -> T:
+    """Pass the result of a module read to the recorder of the module.
+
+    Args:
+        module: QCoDeS driver of the module.
+        result: Result of the module read with the node paths as keys.
+
+    Returns:
+        The unchanged result.
+    """
+    recorder = getattr(module, "_recorder", None)
+    if recorder is not None:
+        recorder.write(result)
+    return result
@@ -0,0 +1,309 @@
+"""Compilation and upload helpers for sequencer programs."""
+import hashlib
+import json
+import os
+import threading
+import typing as t
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+
+from zhinst.core import compile_seqc
+
+from zhinst.qcodes import waveform_memory
+from zhinst.qcodes.qcodes_adaptions import ZINode
+
+CompileArguments = t.Tuple[str, str, str, int, t.Dict[str, t.Any]]
+CompileResult = t.Tuple[bytes, t.Dict[str, t.Any]]
+
+
+def compile_arguments(
+    awg: ZINode, sequencer_program: t.Any, **kwargs: t.Union[str, int]
+) -> CompileArguments:
+    """Arguments for ``zhinst.core.compile_seqc`` for a specific AWG core.
+
+    Mirrors the arguments the toolkit uses inside ``compile_sequencer_program``
+    but only consists of plain python objects. The result can therefore be
+    passed to another process.
+
+    Args:
+        awg: AWG core node (e.g. ``device.awgs[0]``).
+        sequencer_program: The sequencer program to compile.
+        **kwargs: Additional compiler arguments (e.g. samplerate).
+
+    Returns:
+        Sequencer program, device type, device options, index of the AWG core
+        and the compiler keyword arguments.
+    """
+    device = awg.root_instrument
+    path = awg.zi_node.lower().split("/")
+    index = next(int(element) for element in reversed(path) if element.isdigit())
+    if "SHFQC" in device.device_type:
+        kwargs["sequencer"] = "sg" if "sgchannels" in path else "qa"
+    elif "HDAWG" in device.device_type and "samplerate" not in kwargs:
+        kwargs["samplerate"] = device.system.clocks.sampleclock.freq()
+    return (
+        str(sequencer_program),
+        device.device_type,
+        device.device_options(),
+        index,
+        kwargs,
+    )
+
+
+def compile_program(arguments: CompileArguments) -> CompileResult:
+    """Compile a sequencer program.
+
+    Module level function so that it can be executed in a process pool.
+
+    Args:
+        arguments: Compile arguments (see :func:`compile_arguments`).
+
+    Returns:
+        elf: Binary ELF data for sequencer.
+        extra: Extra dictionary with compiler output.
+    """
+    sequencer_program, device_type, device_options, index, kwargs = arguments
+    return compile_seqc(sequencer_program, device_type, device_options, index, **kwargs)
+
+
+class CompileCache:
+    """Content addressed cache of compiled sequencer programs.
+
+    Sweeps often recompile the same sequencer program over and over, although
+    only waveforms or command tables change between the points. The cache
+    stores the ELF and the compiler output of every compilation, keyed by a
+    hash of the sequencer program, the device type, the device options, the
+    index of the AWG core and all compiler arguments (e.g. the samplerate).
+    Identical compilations are therefore only done once.
+
+    The in memory cache evicts the least recently used entry once it holds
+    ``maxsize`` entries. Optionally the entries are also stored on disk,
+    which makes them available across processes. The on disk cache is not
+    limited in size.
+
+    Examples:
+        >>> session.compile_cache = CompileCache(maxsize=64, directory="elf")
+        >>> device.awgs[0].load_sequencer_program(seqc)
+        >>> session.compile_cache.hits, session.compile_cache.misses
+        (0, 1)
+
+    Args:
+        maxsize: Maximum number of entries in memory. (default = 128)
+        directory: Directory in which the entries are additionally stored. If
+            not specified the entries are only held in memory.
+            (default = None)
+    """
+
+    def __init__(
+        self, maxsize: int = 128, directory: t.Optional[t.Union[str, Path]] = None
+    ):
+        if maxsize <= 0:
+            raise ValueError("The maxsize of a compile cache must be positive.")
+        self._maxsize = maxsize
+        self._directory = Path(directory) if directory else None
+        self._entries: "OrderedDict[str, CompileResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(arguments: CompileArguments) -> str:
+        """Hash of the compile arguments.
+
+        Args:
+            arguments: Compile arguments (see :func:`compile_arguments`).
+
+        Returns:
+            Cache key.
+        """
+        content = json.dumps(arguments, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def compile(self, arguments: CompileArguments) -> CompileResult:
+        """Compile a sequencer program or return the cached result.
+
+        Args:
+            arguments: Compile arguments (see :func:`compile_arguments`).
+
+        Returns:
+            elf: Binary ELF data for sequencer.
+            extra: Extra dictionary with compiler output.
+        """
+        result = self.lookup(arguments)
+        if result is None:
+            result = compile_program(arguments)
+            self.store(arguments, result)
+        return result
+
+    def lookup(self, arguments: CompileArguments) -> t.Optional[CompileResult]:
+        """Get the cached result of a compilation.
+
+        Counts as hit or miss.
+
+        Args:
+            arguments: Compile arguments (see :func:`compile_arguments`).
+
+        Returns:
+            Cached ELF and compiler output. None if the compilation is not
+            cached.
+        """
+        key = self.key(arguments)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+        if result is None:
+            result = self._load(key)
+            if result is not None:
+                self._insert(key, result)
+        with self._lock:
+            if result is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return result
+
+    def store(self, arguments: CompileArguments, result: CompileResult) -> None:
+        """Add the result of a compilation to the cache.
+
+        Args:
+            arguments: Compile arguments (see :func:`compile_arguments`).
+            result: ELF and compiler output of the compilation.
+        """
+        key = self.key(arguments)
+        self._insert(key, result)
+        if self._directory is not None:
+            self._dump(key, result)
+
+    def _insert(self, key: str, result: CompileResult) -> None:
+        """Insert an entry into the memory and evict the oldest entries."""
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> t.Optional[CompileResult]:
+        """Load an entry from the disk."""
+        if self._directory is None:
+            return None
+        try:
+            elf = (self._directory / f"{key}.elf").read_bytes()
+            with (self._directory / f"{key}.json").open("r", encoding="UTF-8") as file:
+                extra = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return elf, extra
+
+    def _dump(self, key: str, result: CompileResult) -> None:
+        """Write an entry to the disk."""
+        elf, extra = result
+        path = self._directory / key  # type: ignore[operator]
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # The compiler output is written last since it marks a valid entry.
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(elf)
+            os.replace(tmp_path, path.with_suffix(".elf"))
+            with tmp_path.open("w", encoding="UTF-8") as file:
+                json.dump(extra, file, default=str)
+            os.replace(tmp_path, path.with_suffix(".json"))
+        except OSError as e:
+            warnings.warn(f"Compile cache could not be written to {path}: {e}")
+
+    def clear(self) -> None:
+        """Remove all entries from the cache and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+        if self._directory is not None:
+            for path in self._directory.glob("*.elf"):
+                path.unlink()
+            for path in self._directory.glob("*.json"):
+                path.unlink()
+
+    @property
+    def hits(self) -> int:
+        """Number of compilations that were served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of compilations that were not found in the cache."""
+        return self._misses
+
+    @property
+    def maxsize(self) -> int:
+        """Maximum number of entries in memory."""
+        return self._maxsize
+
+    @property
+    def directory(self) -> t.Optional[Path]:
+        """Directory in which the entries are additionally stored."""
+        return self._directory
+
+
+def _compile_cache(awg: ZINode) -> t.Optional[CompileCache]:
+    """Compile cache of the session an AWG core belongs to."""
+    session = getattr(awg.root_instrument, "session", None)
+    return getattr(session, "compile_cache", None)
+
+
+def compile_sequencer_program(
+    awg: ZINode, sequencer_program: t.Any, **kwargs: t.Union[str, int]
+) -> CompileResult:
+    """Compile a sequencer program for an AWG core.
+
+    Uses the compile cache of the session if available.
+
+    Args:
+        awg: AWG core node (e.g. ``device.awgs[0]``).
+        sequencer_program: The sequencer program to compile.
+        **kwargs: Additional compiler arguments (e.g. samplerate).
+
+    Returns:
+        elf: Binary ELF data for sequencer.
+        extra: Extra dictionary with compiler output.
+    """
+    arguments = compile_arguments(awg, sequencer_program, **kwargs)
+    cache = _compile_cache(awg)
+    if cache is None:
+        return compile_program(arguments)
+    return cache.compile(arguments)
+
+
+def load_sequencer_program(
+    awg: ZINode, sequencer_program: t.Any, **kwargs: t.Union[str, int]
+) -> t.Dict[str, t.Any]:
+    """Compile a sequencer program and upload it to an AWG core.
+
+    Args:
+        awg: AWG core node (e.g. ``device.awgs[0]``).
+        sequencer_program: The sequencer program to upload.
+        **kwargs: Additional compiler arguments (e.g. samplerate).
+
+    Returns:
+        Extra dictionary with compiler output.
+    """
+    elf, compile_info = compile_sequencer_program(awg, sequencer_program, **kwargs)
+    upload_elf(awg, elf)
+    return compile_info
+
+
+def upload_elf(awg: ZINode, elf: bytes) -> None:
+    """Upload a compiled sequencer program to an AWG core.
+
+    The known content of the waveform memory of the AWG core is discarded
+    since the new program defines its own waveforms.
+
+    Args:
+        awg: AWG core node (e.g. ``device.awgs[0]``).
+        elf: Binary ELF data for sequencer.
+    """
+    waveform_memory.invalidate(awg)
+    awg.elf.data(elf)
@@ -1,7 +1,12 @@
 """Connection Manager for the LabOne Python API."""
 from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
+import time
 import typing as t
 
+from zhinst.toolkit import CommandTable, Sequence, Waveforms
 from zhinst.toolkit.session import Devices as TKDevices
 from zhinst.toolkit.session import PollFlags
 from zhinst.toolkit.session import Session as TKSession
@@ -11,65 +16,108 @@ from zhinst.core import ziDAQServer
 
 import zhinst.qcodes.driver.devices as ZIDevices
 import zhinst.qcodes.driver.modules as ZIModules
+from zhinst.qcodes.nodetree_cache import NodetreeCache
+from zhinst.qcodes.sequencer import (
+    CompileCache,
+    compile_arguments,
+    compile_program,
+    upload_elf,
+)
+from zhinst.qcodes.streaming import Stream, to_structured_array
+from zhinst.qcodes.waiting import NodeWaiter, WaitCondition, to_condition
+from zhinst.qcodes.waveform_memory import MemoryWatcher
 from zhinst.qcodes.qcodes_adaptions import (
+    cache_transaction,
+    get_entry_value,
     init_nodetree,
     tk_node_to_parameter,
     ZIParameter,
     ZIInstrument,
+    ZINode,
 )
 
+if t.TYPE_CHECKING:
+    from qcodes.dataset.experiment_container import Experiment
+    from qcodes.station import Station
+
+    from zhinst.qcodes.dataset import DatasetWriter
+
 
 class Devices(MutableMapping):
     """Mapping class for the connected devices.
 
     Maps the connected devices from data server to lazy device objects.
-    On every access the connected devices are read from the data server. This
-    ensures that even if devices get connected/disconnected through another
-    session the list will be up to date.
+    The list of connected devices is read from the data server and reused for
+    ``ttl`` seconds. This ensures that even if devices get
+    connected/disconnected through another session the list will be up to
+    date, without a request to the data server on every access. A device that
+    is not in the list triggers an immediate refresh of the list.
 
     Args:
         session: active session to the data server.
         tk_devices: toolkit devices object.
+        ttl: Time-to-live in seconds of the list of connected devices. 0
+            reads the list on every access. (default = 1)
     """
 
-    def __init__(self, session: "Session", tk_devices: TKDevices):
+    def __init__(self, session: "Session", tk_devices: TKDevices, ttl: float = 1):
         self._tk_devices = tk_devices
         self._session = session
         self._devices: t.Dict[str, ZIDevices.DeviceType] = {}
         self._default_properties: t.Dict[
-            str, t.Tuple[t.Optional[str], t.Optional[bool]]
+            str, t.Tuple[t.Optional[str], t.Optional[bool], bool, bool]
         ] = {}
+        self.ttl = ttl
+        self._connected: t.List[str] = []
+        self._connected_at: t.Optional[float] = None
 
     def __getitem__(self, key) -> ZIDevices.DeviceType:
         key = key.lower()
-        if key in self.connected():
+        if key in self._connected_devices() or key in self.refresh():
             if key not in self._devices:
                 tk_device = self._tk_devices[key]
-                name, raw = self._default_properties.get(key, (None, False))
+                name, raw, lazy, compact = self._default_properties.get(
+                    key, (None, False, False, False)
+                )
                 self._devices[key] = ZIDevices.DEVICE_CLASS_BY_MODEL.get(
                     tk_device.__class__.__name__, ZIDevices.ZIBaseInstrument
-                )(tk_device, self._session, name=name, raw=raw)
+                )(
+                    tk_device,
+                    self._session,
+                    name=name,
+                    raw=raw,
+                    lazy=lazy,
+                    compact=compact,
+                )
             return self._devices[key]
         raise KeyError(key)
 
     def __setitem__(self, key: str, device: ZIDevices.DeviceType) -> None:
-        if device.serial not in self.connected():
+        serial = device.serial
+        if serial not in self._connected_devices() and serial not in self.refresh():
             raise LookupError(
                 "Illegal operation. Devices must be connected through the session."
             )
+        self._session._invalidate_parameter_index(key)
         self._devices[key] = device
 
     def __delitem__(self, key):
+        self._session._invalidate_parameter_index(key)
         self._devices.pop(key, None)
 
     def __iter__(self):
         return iter(self.connected())
 
     def __len__(self):
-        return len(self.connected())
+        return len(self._connected_devices())
 
     def update_device_properties(
-        self, serial: str, name: t.Optional[str], raw: t.Optional[bool]
+        self,
+        serial: str,
+        name: t.Optional[str],
+        raw: t.Optional[bool],
+        lazy: t.Optional[bool] = None,
+        compact: t.Optional[bool] = None,
     ) -> None:
         """Update the properties for a device.
 
@@ -81,6 +129,10 @@ class Devices(MutableMapping):
             name: Optional name of the QCoDeS device object
             raw: Flag if qcodes instance should only created with the nodes and
                 not forwarding the toolkit functions. (default = False)
+            lazy: Flag if the QCoDeS parameters should only be created once
+                they are accessed for the first time. (default = False)
+            compact: Flag if lightweight parameters should be created instead
+                of QCoDeS parameters. (default = False)
 
         Raises:
             RuntimeError: If the device is already created
@@ -90,15 +142,42 @@ class Devices(MutableMapping):
                 f"The Qcodes Instance of {serial} already exists.\n"
                 "The device properties can therfor no longer be changed"
             )
-        self._default_properties[serial.lower()] = (name, raw)
+        self._default_properties[serial.lower()] = (
+            name,
+            raw,
+            bool(lazy),
+            bool(compact),
+        )
 
     def connected(self) -> t.List[str]:
         """Get a list of devices connected to the data server.
 
+        The list is only read from the data server if it is older than the
+        time-to-live (see :meth:`refresh`).
+
         Returns:
             list[str]: List of all connected devices.
         """
-        return self._tk_devices.connected()
+        return list(self._connected_devices())
+
+    def refresh(self) -> t.List[str]:
+        """Read the list of connected devices from the data server.
+
+        Returns:
+            list[str]: List of all connected devices.
+        """
+        self._connected = [serial.lower() for serial in self._tk_devices.connected()]
+        self._connected_at = time.monotonic()
+        return list(self._connected)
+
+    def _connected_devices(self) -> t.List[str]:
+        """Cached list of connected devices (refreshed if expired)."""
+        if (
+            self._connected_at is None
+            or time.monotonic() - self._connected_at >= self.ttl
+        ):
+            self.refresh()
+        return self._connected
 
     def visible(self) -> t.List[str]:
         """Get a list of devices visible to the data server.
@@ -108,6 +187,14 @@ class Devices(MutableMapping):
         """
         return self._tk_devices.visible()
 
+    def created(self) -> t.List[ZIDevices.DeviceType]:
+        """Get a list of the device objects that have been created.
+
+        Returns:
+            List of all created QCoDeS device objects.
+        """
+        return list(self._devices.values())
+
 
 class ModuleHandler:
     """Modules of LabOne.
@@ -568,6 +655,11 @@ class Session(ZIInstrument):
             server_host, server_port, connection=connection, hf2=hf2
         )
         super().__init__(f"zi_session_{len(self.instances())}", self._tk_object.root)
+        self._nodetree_cache: t.Optional[NodetreeCache] = None
+        self._compile_cache: t.Optional[CompileCache] = CompileCache()
+        self._memory_watcher = MemoryWatcher(self)
+        self._node_waiter = NodeWaiter(self)
+        self._parameter_index: t.Dict[str, ZIParameter] = {}
         self._devices = Devices(self, self._tk_object.devices)
         self._modules = ModuleHandler(self, self._tk_object.modules)
         init_nodetree(self, self._tk_object.root, self._snapshot_cache)
@@ -579,6 +671,8 @@ class Session(ZIInstrument):
         interface: t.Optional[str] = None,
         name: t.Optional[str] = None,
         raw: t.Optional[bool] = None,
+        lazy: t.Optional[bool] = None,
+        compact: t.Optional[bool] = None,
     ) -> ZIDevices.DeviceType:
         """Establish a connection to a device.
 
@@ -597,12 +691,19 @@ class Session(ZIInstrument):
                 (default = "zi_{dev_type}_{serial}")
             raw: Flag if qcodes instance should only created with the nodes and
                 not forwarding the toolkit functions. (default = False)
+            lazy: Flag if the QCoDeS parameters should only be created once
+                they are accessed for the first time. Speeds up the connection
+                to devices with a large nodetree. (default = False)
+            compact: Flag if lightweight parameters should be created instead
+                of QCoDeS parameters (see :class:`ZICompactParameter`).
+                Reduces the memory usage of devices with a large nodetree.
+                (default = False)
 
         Returns:
             Device object
         """
-        if name or raw is not None:
-            self._devices.update_device_properties(serial, name, raw)
+        if name or raw is not None or lazy is not None or compact is not None:
+            self._devices.update_device_properties(serial, name, raw, lazy, compact)
         self._tk_object.connect_device(serial, interface=interface)
         return self._devices[serial]
 
@@ -618,7 +719,18 @@ class Session(ZIInstrument):
                 The serial number can be found on the back panel of the instrument.
         """
         self._devices.pop(serial, None)
+        self._invalidate_parameter_index(serial)
         self._tk_object.disconnect_device(serial)
+        self._devices.refresh()
+
+    def close(self) -> None:
+        """Close the dedicated connections of the session and the instrument.
+
+        The connection of the underlying toolkit session stays open.
+        """
+        self._memory_watcher.close()
+        self._node_waiter.close()
+        super().close()
 
     def sync(self) -> None:
         """Synchronize all connected devices.
@@ -670,16 +782,434 @@ class Session(ZIInstrument):
             Polled data in a dictionary. The key is a `Node` object and the
             value is a dictionary with the raw data from the device
         """
-        polled_data_tk = self._tk_object.poll(
+        polled_data_raw = self._tk_object.daq_server.poll(
+            recording_time, int(timeout * 1000), flags=flags.value, flat=True
+        )
+        return {
+            self._path_to_parameter(path): data
+            for path, data in polled_data_raw.items()
+        }
+
+    def poll_columnar(
+        self,
+        recording_time: float = 0.1,
+        timeout: float = 0.5,
+        flags: PollFlags = PollFlags.DEFAULT,
+    ) -> t.Dict[ZIParameter, t.Any]:
+        """Polls all subscribed data and returns it as structured arrays.
+
+        Same as :meth:`poll` but the data of each node is converted into a
+        single structured numpy array with one field per data column (e.g.
+        ``timestamp``, ``x``, ``y`` for demodulator samples). The columns
+        are copied directly from the arrays returned by the data server into
+        the structured array without creating intermediate python objects.
+
+        Data that can not be represented as a flat table (e.g. scope waves or
+        vector nodes) is returned unchanged.
+
+        Args:
+            recording_time: defines the duration of the poll. (Note that not
+                only the newly recorder values are polled but all values since
+                either subscribing or the last pill). Needs to be larger than
+                zero. (default = 0.1)
+            timeout: Adds an additional timeout in seconds on top of
+                `recording_time`. Only relevant when communicating in a slow
+                network. In this case it may be set to a value larger than the
+                expected round-trip time in the network. (default = 0.5)
+            flags: Flags for the polling (see :class `PollFlags`:)
+
+        Returns:
+            Polled data in a dictionary. The key is the QCoDeS parameter and
+            the value is a structured numpy array with the polled samples.
+
+        Examples:
+            >>> device.demods[0].sample.subscribe()
+            >>> data = session.poll_columnar()
+            >>> samples = data[device.demods[0].sample]
+            >>> amplitude = np.abs(samples["x"] + 1j * samples["y"])
+        """
+        polled_data = self.poll(
             recording_time=recording_time, timeout=timeout, flags=flags
         )
-        polled_data = {}
-        for tk_node, data in polled_data_tk.items():
-            tk_node = self._tk_object.raw_path_to_node(tk_node)
+        result = {}
+        for parameter, data in polled_data.items():
+            array = to_structured_array(data)
+            result[parameter] = data if array is None else array
+        return result
+
+    def start_stream(
+        self,
+        parameters: t.Iterable[ZIParameter],
+        *,
+        buffer_size: int = 1_000_000,
+        recording_time: float = 0.05,
+        timeout: float = 0.1,
+        flags: PollFlags = PollFlags.DEFAULT,
+    ) -> Stream:
+        """Start streaming the data of parameters in a background thread.
+
+        The stream subscribes to the parameters on a dedicated connection to
+        the data server and continuously polls them into fixed size ring
+        buffers, independent of the measurement loop. The data can be read at
+        any time with the non-blocking ``read_latest`` and ``drain`` methods
+        of the returned stream.
+
+        Args:
+            parameters: Parameters that should be streamed.
+            buffer_size: Number of samples each ring buffer holds. Unread
+                samples are overwritten (and counted as overflow) once the
+                buffer is full. (default = 1_000_000)
+            recording_time: Duration of a single poll in seconds.
+                (default = 0.05)
+            timeout: Additional timeout in seconds for a single poll.
+                (default = 0.1)
+            flags: Flags for the polling (see :class `PollFlags`:)
+
+        Returns:
+            Running stream. Call ``stop`` on it (or use it as context
+            manager) to end the streaming.
+        """
+        stream = Stream(
+            self,
+            parameters,
+            buffer_size=buffer_size,
+            recording_time=recording_time,
+            timeout=timeout,
+            flags=flags,
+        )
+        stream.start()
+        return stream
+
+    def start_dataset_writer(
+        self,
+        parameters: t.Iterable[ZIParameter],
+        *,
+        name: str = "zhinst_stream",
+        experiment: t.Optional["Experiment"] = None,
+        station: t.Optional["Station"] = None,
+        poll: bool = True,
+        buffer_size: int = 1_000_000,
+        write_interval: float = 0.5,
+    ) -> "DatasetWriter":
+        """Start writing the streamed data of parameters into a QCoDeS dataset.
+
+        The data is collected in ring buffers (see :meth:`start_stream`) and
+        inserted into the dataset by a background thread with a single
+        ``add_result`` call per parameter and write interval.
+
+        Args:
+            parameters: Parameters that should be written.
+            name: Name of the measurement. (default = "zhinst_stream")
+            experiment: Experiment of the dataset. If not specified the default
+                experiment is used. (default = None)
+            station: Station of the measurement. (default = None)
+            poll: Flag if the parameters should be polled on a dedicated
+                connection. If False the results of :meth:`poll` need to be
+                passed to ``write`` of the returned writer. (default = True)
+            buffer_size: Number of samples each ring buffer holds.
+                (default = 1_000_000)
+            write_interval: Time in seconds between two inserts into the
+                dataset. (default = 0.5)
+
+        Returns:
+            Running dataset writer. Call ``stop`` on it (or use it as context
+            manager) to finish the dataset.
+        """
+        from zhinst.qcodes.dataset import DatasetWriter
+
+        writer = DatasetWriter(
+            self,
+            parameters,
+            name=name,
+            experiment=experiment,
+            station=station,
+            poll=poll,
+            buffer_size=buffer_size,
+            write_interval=write_interval,
+        )
+        writer.start()
+        return writer
+
+    def upload_programs(
+        self,
+        programs: t.Dict[ZINode, t.Union[str, Sequence]],
+        *,
+        command_tables: t.Optional[
+            t.Dict[ZINode, t.Union[CommandTable, str, dict]]
+        ] = None,
+        waveforms: t.Optional[t.Dict[ZINode, Waveforms]] = None,
+        enable: bool = True,
+        single: bool = True,
+        timeout: float = 10,
+        max_workers: t.Optional[int] = None,
+        **kwargs: t.Union[str, int],
+    ) -> t.Dict[ZINode, t.Dict[str, t.Any]]:
+        """Compile, upload and arm sequencer programs on multiple AWG cores.
+
+        The programs are compiled in parallel in a process pool (programs
+        found in the compile cache are not compiled again). Each ELF is
+        uploaded as soon as its compilation is finished, followed by the
+        waveforms and command tables. Finally all AWG cores are armed with a
+        single transactional set per device. The total duration is therefore
+        roughly the one of the slowest compilation.
+
+        Examples:
+            >>> session.upload_programs(
+            ...     {hdawg.awgs[0]: seqc_0, shfsg.sgchannels[0].awg: seqc_1},
+            ...     waveforms={hdawg.awgs[0]: waveforms},
+            ... )
+
+        Args:
+            programs: Sequencer program for each AWG core.
+            command_tables: Command table for each AWG core. (default = None)
+            waveforms: Waveforms for each AWG core. (default = None)
+            enable: Flag if the AWG cores should be enabled after the upload.
+                (default = True)
+            single: Flag if the sequencers should be disabled after finishing
+                execution. (default = True)
+            timeout: Maximum time in seconds to wait for the AWG cores to
+                become ready after the upload. (default = 10)
+            max_workers: Maximum number of compiler processes. If not specified
+                the number of processors is used. (default = None)
+            **kwargs: Additional compiler arguments for all programs (see
+                ``compile_sequencer_program``).
+
+        Returns:
+            Compiler output for each AWG core.
+
+        Raises:
+            RuntimeError: If the compilation or the upload failed.
+            TimeoutError: If an AWG core did not become ready in time.
+        """
+        cache = self._compile_cache
+        compile_info = {}
+        arguments = {}
+        for awg, program in programs.items():
+            arguments[awg] = compile_arguments(awg, program, **kwargs)
+            cached = cache.lookup(arguments[awg]) if cache is not None else None
+            if cached is not None:
+                elf, compile_info[awg] = cached
+                upload_elf(awg, elf)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(compile_program, arguments[awg]): awg
+                for awg in programs
+                if awg not in compile_info
+            }
+            for future in as_completed(futures):
+                awg = futures[future]
+                result = future.result()
+                if cache is not None:
+                    cache.store(arguments[awg], result)
+                elf, compile_info[awg] = result
+                upload_elf(awg, elf)
+        self.wait_all([(awg.ready, 1) for awg in programs], timeout=timeout)
+        for awg, awg_waveforms in (waveforms or {}).items():
+            awg.write_to_waveform_memory(awg_waveforms)
+        for awg, command_table in (command_tables or {}).items():
+            awg.commandtable.upload_to_device(command_table)
+        if enable:
+            with self.set_transaction():
+                for awg in programs:
+                    awg.single(single)
+                    awg.enable(1)
+        return compile_info
+
+    def wait_all(
+        self,
+        conditions: t.Sequence[WaitCondition],
+        *,
+        timeout: float = 10,
+        sleep_time: float = 0.005,
+    ) -> None:
+        """Wait until all conditions are met.
+
+        The nodes of all conditions are watched together over a single
+        subscription, even if they belong to different devices. The wait
+        therefore only takes as long as the slowest condition instead of the
+        sum of the serial waits.
+
+        Examples:
+            >>> session.wait_all(
+            ...     [hdawg.awgs[0], shfqa.qachannels[0].readout, pqsc],
+            ...     timeout=10,
+            ... )
+            >>> session.wait_all([(hdawg.awgs[0].ready, 1)])
+
+        Args:
+            conditions: Driver objects with a ``wait_done`` function (e.g.
+                AWG cores, readout, spectroscopy, SHF scopes or the PQSC) or
+                tuples of parameter, expected value and optionally an invert
+                flag.
+            timeout: Maximum wait time in seconds for all conditions.
+                (default = 10)
+            sleep_time: Sleep interval in seconds if the nodes can not be
+                subscribed to. (default = 0.005)
+
+        Raises:
+            RuntimeError: If an AWG core is in continuous mode.
+            TypeError: If a driver object has no done condition that can be
+                watched (e.g. LabOne modules).
+            TimeoutError: If the conditions are not met within the timeout.
+        """
+        self._node_waiter.wait(
+            [to_condition(condition) for condition in conditions],
+            timeout=timeout,
+            sleep_time=sleep_time,
+        )
+
+    def wait_any(
+        self,
+        conditions: t.Sequence[WaitCondition],
+        *,
+        timeout: float = 10,
+        sleep_time: float = 0.005,
+    ) -> t.List[WaitCondition]:
+        """Wait until at least one of the conditions is met.
+
+        Like :meth:`wait_all` the nodes of all conditions are watched together
+        over a single subscription.
+
+        Examples:
+            >>> session.wait_any([hdawg.awgs[0], hdawg.awgs[1]])
+            [<AWG: zi_HDAWG_dev1234_awgs_1>]
+
+        Args:
+            conditions: Driver objects with a ``wait_done`` function (e.g.
+                AWG cores, readout, spectroscopy, SHF scopes or the PQSC) or
+                tuples of parameter, expected value and optionally an invert
+                flag.
+            timeout: Maximum wait time in seconds. (default = 10)
+            sleep_time: Sleep interval in seconds if the nodes can not be
+                subscribed to. (default = 0.005)
+
+        Returns:
+            Passed conditions that are met.
+
+        Raises:
+            RuntimeError: If an AWG core is in continuous mode.
+            TypeError: If a driver object has no done condition that can be
+                watched (e.g. LabOne modules).
+            TimeoutError: If none of the conditions is met within the timeout.
+        """
+        converted = [to_condition(condition) for condition in conditions]
+        met = self._node_waiter.wait(
+            converted, timeout=timeout, sleep_time=sleep_time, require_all=False
+        )
+        return [
+            condition
+            for condition, converted_condition in zip(conditions, converted)
+            if converted_condition in met
+        ]
+
+    @contextmanager
+    def set_transaction(
+        self, *, deep: bool = False, skip_unchanged: bool = False
+    ) -> t.Iterator[None]:
+        """Context manager for a transactional set across all devices.
+
+        In comparison to the device level transaction manager this manager
+        affects all created devices and the nodes of the session itself. All
+        set commands within the with block are buffered and sent to the data
+        server with a single set command at the end of the block.
+        (All other operations, e.g. getting the value of a node, will not be
+        affected)
+
+        The validation and the cache update of the QCoDeS parameters are
+        done once per parameter when the transaction is committed. If the
+        transaction fails the caches are left untouched.
+
+        Warning:
+            The set is always performed as deep set if called on device nodes.
+
+        Examples:
+            >>> with session.set_transaction():
+                    hdawg.sigouts[0].on(1)
+                    shfqc.qachannels[0].centerfreq(6e9)
+
+        Args:
+            deep: Flag if the values acknowledged by the devices should be
+                read back with a single get after the transaction. The QCoDeS
+                cache of the parameters is updated with the acknowledged
+                values. (default = False)
+            skip_unchanged: Flag if sets of values that are known to be
+                unchanged should be skipped (see
+                :attr:`ZIBaseInstrument.set_if_changed`). (default = False)
+        """
+        roots = [self._tk_object.root] + [
+            device._tk_object.root for device in self._devices.created()
+        ]
+        started = []
+        with cache_transaction(roots, skip_unchanged=skip_unchanged) as transaction:
+            try:
+                for root in roots:
+                    root.transaction.start()
+                    started.append(root)
+                yield
+                settings = [
+                    setting for root in roots for setting in root.transaction.result()
+                ]
+            finally:
+                for root in started:
+                    root.transaction.stop()
+            transaction.validate()
+            if settings:
+                self._tk_object.daq_server.set(settings)
+        if deep and settings:
+            self._update_acknowledged(dict.fromkeys(path for path, _ in settings))
+
+    def _update_acknowledged(self, paths: t.Iterable[str]) -> None:
+        """Read nodes with a single get and update the QCoDeS caches.
+
+        Args:
+            paths: Raw node paths.
+        """
+        result = self._tk_object.daq_server.get(
+            ",".join(paths), flat=True, settingsonly=False
+        )
+        timestamp = datetime.now()
+        for path, raw_value in result.items():
+            try:
+                parameter = self._path_to_parameter(path)
+            except (KeyError, IndexError):
+                continue
+            value = parameter.tk_node._parse_get_value(get_entry_value(raw_value))
+            parameter.cache._update_with(
+                value=value, raw_value=value, timestamp=timestamp
+            )
+
+    def _path_to_parameter(self, path: str) -> ZIParameter:
+        """Convert a raw node path into the matching QCoDeS parameter.
+
+        The parameters are stored in an index so that the conversion is only
+        done once per node. The index entries of a device are removed when it
+        gets disconnected.
+
+        Args:
+            path: Raw node path (e.g. /dev1234/demods/0/sample).
+
+        Returns:
+            QCoDeS parameter of the node.
+        """
+        path = path.lower()
+        try:
+            return self._parameter_index[path]
+        except KeyError:
+            tk_node = self._tk_object.raw_path_to_node(path)
             device = self.devices[tk_node.root.prefix_hide]
             parameter = tk_node_to_parameter(device, tk_node)
-            polled_data[parameter] = data
-        return polled_data
+            self._parameter_index[path] = parameter
+            return parameter
+
+    def _invalidate_parameter_index(self, serial: str) -> None:
+        """Remove all parameters of a device from the parameter index.
+
+        Args:
+            serial: Serial of the device.
+        """
+        prefix = f"/{serial.lower()}/"
+        for path in [path for path in self._parameter_index if path.startswith(prefix)]:
+            del self._parameter_index[path]
 
     @property
     def devices(self) -> Devices:
@@ -691,6 +1221,54 @@ class Session(ZIInstrument):
         """Modules of LabOne."""
         return self._modules
 
+    @property
+    def nodetree_cache(self) -> t.Optional[NodetreeCache]:
+        """Persistent cache for the QCoDeS parameters of new devices.
+
+        If set, the QCoDeS parameters of all devices created afterwards
+        through this session are built from the cached parameter skeleton of
+        the device type, options and firmware revision. (default = None)
+        """
+        return self._nodetree_cache
+
+    @nodetree_cache.setter
+    def nodetree_cache(self, cache: t.Optional[NodetreeCache]) -> None:
+        self._nodetree_cache = cache
+
+    @property
+    def compile_cache(self) -> t.Optional[CompileCache]:
+        """Cache for compiled sequencer programs.
+
+        Used by ``compile_sequencer_program``, ``load_sequencer_program`` and
+        :meth:`upload_programs`. Set to None to disable the caching.
+        """
+        return self._compile_cache
+
+    @compile_cache.setter
+    def compile_cache(self, cache: t.Optional[CompileCache]) -> None:
+        self._compile_cache = cache
+
+    @property
+    def memory_watcher(self) -> MemoryWatcher:
+        """Watcher for changes of the waveform memories by other clients.
+
+        The driver keeps a copy of the waveforms and integration weights it
+        writes and reads. The watcher detects changes by other clients and
+        invalidates the copies. Set ``memory_watcher.enabled = False`` to
+        trust the copies unconditionally.
+        """
+        return self._memory_watcher
+
+    @property
+    def node_waiter(self) -> NodeWaiter:
+        """Waits for node values by subscribing to the nodes.
+
+        Used by ``wait_for_state_change`` and the ``wait_done`` functions of
+        the drivers. Set ``node_waiter.enabled = False`` to get the value of
+        the nodes periodically instead.
+        """
+        return self._node_waiter
+
     @property
     def is_hf2_server(self) -> bool:
         """Flag if the data server is a HF2 Data Server."""
@@ -0,0 +1,439 @@
+"""Background streaming of subscribed node data."""
+import threading
+import time
+import typing as t
+from collections import deque
+from collections.abc import Mapping
+
+import numpy as np
+from zhinst.core import ziDAQServer
+from zhinst.toolkit.session import PollFlags
+
+from zhinst.qcodes import recording
+from zhinst.qcodes.qcodes_adaptions import ZIParameter
+
+if t.TYPE_CHECKING:
+    from zhinst.qcodes.driver.modules.daq_module import ZIDAQModule
+    from zhinst.qcodes.session import Session
+
+
+def to_structured_array(data: t.Any) -> t.Optional[np.ndarray]:
+    """Convert the polled data of a single node into a structured array.
+
+    The polled data of most nodes consists of a dictionary with an one
+    dimensional array for each field (e.g. ``timestamp``, ``x``, ``y``).
+    Each of these arrays becomes a column of the structured array.
+
+    Args:
+        data: Polled data of a single node.
+
+    Returns:
+        Structured array or None if the data can not be converted.
+    """
+    if not isinstance(data, Mapping) or not data:
+        return None
+    columns = list(data.values())
+    if any(
+        not isinstance(column, np.ndarray)
+        or column.ndim != 1
+        or len(column) != len(columns[0])
+        for column in columns
+    ):
+        return None
+    length = len(columns[0])
+    result = np.empty(
+        length, dtype=[(name, column.dtype) for name, column in data.items()]
+    )
+    for name, column in data.items():
+        result[name] = column
+    return result
+
+
+class RingBuffer:
+    """Fixed size ring buffer for structured sample arrays.
+
+    The buffer is allocated once the first samples are appended (the data
+    type of the samples is not known before). If more samples are appended
+    than read the oldest unread samples are overwritten and counted as
+    overflow.
+
+    All methods are thread safe.
+
+    Args:
+        capacity: Maximum number of samples the buffer holds.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("The capacity of a ring buffer must be positive.")
+        self._capacity = capacity
+        self._buffer: t.Optional[np.ndarray] = None
+        self._written = 0
+        self._read = 0
+        self._overflows = 0
+        self._lock = threading.Lock()
+
+    def append(self, samples: np.ndarray) -> None:
+        """Append samples to the buffer.
+
+        Args:
+            samples: Structured array with the new samples.
+
+        Raises:
+            ValueError: If the data type of the samples does not match the
+                data type of the previous samples.
+        """
+        with self._lock:
+            if self._buffer is None:
+                self._buffer = np.empty(self._capacity, dtype=samples.dtype)
+            elif samples.dtype != self._buffer.dtype:
+                raise ValueError(
+                    f"Samples of type {samples.dtype} can not be appended to a "
+                    f"buffer of type {self._buffer.dtype}."
+                )
+            total = len(samples)
+            samples = samples[-self._capacity :]  # noqa: E203
+            start = (self._written + total - len(samples)) % self._capacity
+            first = min(len(samples), self._capacity - start)
+            self._buffer[start : start + first] = samples[:first]  # noqa: E203
+            self._buffer[: len(samples) - first] = samples[first:]
+            self._written += total
+            unread = self._written - self._read
+            if unread > self._capacity:
+                self._overflows += unread - self._capacity
+                self._read = self._written - self._capacity
+
+    def _copy(self, start: int, stop: int) -> np.ndarray:
+        """Copy the samples between two absolute sample indexes."""
+        if self._buffer is None:
+            # The data type is only known once the first samples arrived
+            return np.empty(0)
+        if start == stop:
+            return self._buffer[:0].copy()
+        indexes = np.arange(start, stop) % self._capacity
+        return self._buffer[indexes]
+
+    def read_latest(self, count: t.Optional[int] = None) -> np.ndarray:
+        """Get the latest samples without consuming them.
+
+        Args:
+            count: Maximum number of samples. If not specified all samples
+                in the buffer are returned. (default = None)
+
+        Returns:
+            Copy of the latest samples (oldest first).
+        """
+        with self._lock:
+            available = min(self._written, self._capacity)
+            count = available if count is None else min(count, available)
+            return self._copy(self._written - count, self._written)
+
+    def drain(self) -> np.ndarray:
+        """Get and consume all unread samples.
+
+        Returns:
+            Copy of the unread samples (oldest first).
+        """
+        with self._lock:
+            samples = self._copy(self._read, self._written)
+            self._read = self._written
+            return samples
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of samples the buffer holds."""
+        return self._capacity
+
+    @property
+    def unread(self) -> int:
+        """Number of samples that have not been drained yet."""
+        with self._lock:
+            return self._written - self._read
+
+    @property
+    def overflows(self) -> int:
+        """Number of unread samples that were overwritten."""
+        return self._overflows
+
+
+class Stream:
+    """Background poller that streams subscribed nodes into ring buffers.
+
+    The stream uses a dedicated connection to the data server. The polling
+    of the data is therefore independent from the user session and not
+    affected by the execution of the measurement loop (e.g. plotting or
+    saving data). The data of each parameter is stored in a fixed size
+    :class:`RingBuffer` which keeps the memory consumption bounded.
+
+    The stream can be used as a context manager.
+
+    Examples:
+        >>> with session.start_stream([device.demods[0].sample]) as stream:
+        ...     time.sleep(1)
+        ...     samples = stream.drain(device.demods[0].sample)
+
+    Args:
+        session: Session to the data server.
+        parameters: Parameters that should be streamed.
+        buffer_size: Number of samples each ring buffer holds.
+            (default = 1_000_000)
+        recording_time: Duration of a single poll in seconds.
+            (default = 0.05)
+        timeout: Additional timeout in seconds for a single poll.
+            (default = 0.1)
+        flags: Flags for the polling (see :class `PollFlags`:)
+    """
+
+    def __init__(
+        self,
+        session: "Session",
+        parameters: t.Iterable[ZIParameter],
+        *,
+        buffer_size: int = 1_000_000,
+        recording_time: float = 0.05,
+        timeout: float = 0.1,
+        flags: PollFlags = PollFlags.DEFAULT,
+    ):
+        self._session = session
+        self._parameters = {
+            parameter.zi_node.lower(): parameter for parameter in parameters
+        }
+        self._buffers = {
+            parameter: RingBuffer(buffer_size)
+            for parameter in self._parameters.values()
+        }
+        self._recording_time = recording_time
+        self._timeout = timeout
+        self._flags = flags
+        self._connection: t.Optional[ziDAQServer] = None
+        self._thread: t.Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._exception: t.Optional[Exception] = None
+
+    def __enter__(self) -> "Stream":
+        if not self.is_running:
+            self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Subscribe to the parameters and start the poll thread.
+
+        Raises:
+            RuntimeError: If the stream is already running.
+        """
+        if self.is_running:
+            raise RuntimeError("The stream is already running.")
+        self._connection = ziDAQServer(
+            self._session.server_host,
+            self._session.server_port,
+            1 if self._session.is_hf2_server else 6,
+        )
+        for path in self._parameters:
+            self._connection.subscribe(path)
+        self._exception = None
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="zhinst-qcodes-stream", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the poll thread and unsubscribe from the parameters.
+
+        The data in the ring buffers stays available.
+
+        Raises:
+            Exception: The exception that terminated the poll thread (if any).
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._connection is not None:
+            self._connection.unsubscribe("*")
+            self._connection.disconnect()
+            self._connection = None
+        if self._exception is not None:
+            exception, self._exception = self._exception, None
+            raise exception
+
+    def _run(self) -> None:
+        """Poll loop of the background thread."""
+        try:
+            while not self._stop_event.is_set():
+                polled_data = self._connection.poll(  # type: ignore[union-attr]
+                    self._recording_time,
+                    int(self._timeout * 1000),
+                    flags=self._flags.value,
+                    flat=True,
+                )
+                for path, data in polled_data.items():
+                    parameter = self._parameters.get(path.lower())
+                    if parameter is None:
+                        continue
+                    samples = to_structured_array(data)
+                    if samples is None:
+                        raise TypeError(
+                            f"The data of {parameter.zi_node} can not be streamed "
+                            "into a ring buffer."
+                        )
+                    self._buffers[parameter].append(samples)
+        except Exception as e:
+            self._exception = e
+
+    def read_latest(
+        self, parameter: ZIParameter, count: t.Optional[int] = None
+    ) -> np.ndarray:
+        """Get the latest samples of a parameter without consuming them.
+
+        Args:
+            parameter: Streamed parameter.
+            count: Maximum number of samples. If not specified all samples
+                in the buffer are returned. (default = None)
+
+        Returns:
+            Structured array with the latest samples (oldest first).
+        """
+        return self._buffers[parameter].read_latest(count)
+
+    def drain(
+        self, parameter: t.Optional[ZIParameter] = None
+    ) -> t.Union[np.ndarray, t.Dict[ZIParameter, np.ndarray]]:
+        """Get and consume all unread samples.
+
+        Args:
+            parameter: Streamed parameter. If not specified the unread samples
+                of all parameters are returned. (default = None)
+
+        Returns:
+            Structured array with the unread samples (oldest first). If no
+            parameter is specified a dictionary with the samples of each
+            parameter.
+        """
+        if parameter is not None:
+            return self._buffers[parameter].drain()
+        return {
+            parameter: buffer.drain() for parameter, buffer in self._buffers.items()
+        }
+
+    @property
+    def buffers(self) -> t.Dict[ZIParameter, RingBuffer]:
+        """Ring buffers of the streamed parameters."""
+        return self._buffers
+
+    @property
+    def overflows(self) -> t.Dict[ZIParameter, int]:
+        """Number of overwritten samples for each parameter."""
+        return {
+            parameter: buffer.overflows for parameter, buffer in self._buffers.items()
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """Flag if the poll thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+
+class DAQChunk(t.NamedTuple):
+    """New bursts of a signal recorded by the DAQ module.
+
+    The rows of all bursts are concatenated.
+
+    Attributes:
+        value: Values of the bursts (one row per grid row).
+        timestamp: Timestamps of the values. None if the bursts contain no
+            timestamps (e.g. FFT signals).
+        bursts: Number of bursts in the chunk.
+    """
+
+    value: np.ndarray
+    timestamp: t.Optional[np.ndarray]
+    bursts: int
+
+
+def _burst_id(burst: t.Mapping[str, t.Any]) -> int:
+    """Creation time of a DAQ module burst (unique per signal)."""
+    created = burst.get("header", {}).get("createdtimestamp")
+    if created is None:
+        created = burst["timestamp"]
+    return int(np.ravel(created)[0])
+
+
+def _to_daq_chunk(bursts: t.List[t.Mapping[str, t.Any]]) -> DAQChunk:
+    """Concatenate the raw bursts of a signal."""
+    value = np.concatenate([np.atleast_2d(burst["value"]) for burst in bursts])
+    timestamp = None
+    if all("timestamp" in burst for burst in bursts):
+        timestamp = np.concatenate(
+            [np.atleast_2d(burst["timestamp"]) for burst in bursts]
+        )
+    return DAQChunk(value, timestamp, len(bursts))
+
+
+def stream_daq_module(
+    module: "ZIDAQModule",
+    *,
+    chunk_size: t.Optional[int] = None,
+    poll_interval: float = 0.05,
+) -> t.Iterator[t.Dict[t.Union[ZIParameter, str], DAQChunk]]:
+    """Iterate over the new bursts of a running DAQ module.
+
+    In contrast to ``read`` only the bursts that were not yielded before are
+    returned. Bursts are identified by their creation timestamp, the
+    iterator therefore only needs to remember the last burst of each signal
+    and the memory consumption stays bounded, no matter how long the
+    acquisition runs.
+
+    The iteration ends once the module is finished and all bursts are
+    yielded.
+
+    Args:
+        module: DAQ module that is executed.
+        chunk_size: Maximum number of bursts per signal in a single chunk. If
+            not specified all new bursts are yielded at once. (default = None)
+        poll_interval: Time in seconds between two reads of the module.
+            (default = 0.05)
+
+    Yields:
+        New bursts of each signal keyed by the QCoDeS parameter (or the node
+        path if the node does not belong to a created device).
+
+    Raises:
+        ValueError: If the chunk size is not positive.
+    """
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError("The chunk size must be positive.")
+    last_ids: t.Dict[str, int] = {}
+    parameters: t.Dict[str, t.Union[ZIParameter, str]] = {}
+    pending: t.Dict[str, t.Deque[t.Mapping[str, t.Any]]] = {}
+    while True:
+        finished = module.raw_module.finished()
+        result = recording.record(module, module.raw_module.read(flat=True))
+        for path, bursts in result.items():
+            if not bursts or not isinstance(bursts[0], Mapping):
+                # module native nodes
+                continue
+            last_id = last_ids.get(path)
+            for burst in bursts:
+                burst_id = _burst_id(burst)
+                if last_id is None or burst_id > last_id:
+                    pending.setdefault(path, deque()).append(burst)
+                    last_id = burst_id
+            last_ids[path] = last_id  # type: ignore[assignment]
+        while any(pending.values()):
+            chunk = {}
+            for path, bursts in pending.items():
+                count = len(bursts) if chunk_size is None else chunk_size
+                new_bursts = [bursts.popleft() for _ in range(min(count, len(bursts)))]
+                if not new_bursts:
+                    continue
+                if path not in parameters:
+                    parameters[path] = module._get_node(path)
+                chunk[parameters[path]] = _to_daq_chunk(new_bursts)
+            yield chunk
+        if finished:
+            return
+        time.sleep(poll_interval)
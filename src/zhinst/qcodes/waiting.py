@@ -0,0 +1,461 @@
+"""Event driven waiting for node values."""
+import threading
+import time
+import typing as t
+from collections.abc import Mapping
+
+from zhinst.core import ziDAQServer
+
+if t.TYPE_CHECKING:
+    from zhinst.qcodes.qcodes_adaptions import ZIParameter
+    from zhinst.qcodes.session import Session
+
+# Duration of a single poll while waiting for value changes in seconds.
+_POLL_INTERVAL = 0.001
+
+
+class Condition(t.NamedTuple):
+    """Expected value of a node.
+
+    Attributes:
+        path: Node path.
+        value: Expected (integer) value of the node.
+        invert: Flag if the condition is met for any value except ``value``.
+    """
+
+    path: str
+    value: int
+    invert: bool = False
+
+    def is_met(self, value: t.Any) -> bool:
+        """Check if the condition is met for a value of the node.
+
+        Args:
+            value: Current value of the node.
+
+        Returns:
+            Flag if the condition is met.
+        """
+        return (value == self.value) != self.invert
+
+
+# Driver object with a done condition, (parameter, value) or
+# (parameter, value, invert).
+WaitCondition = t.Any
+
+
+def done_condition(node: t.Any) -> t.Optional[t.Tuple["ZIParameter", int]]:
+    """Get the parameter and value that indicate that a node is done.
+
+    Mirrors the conditions used by the ``wait_done`` functions of the drivers.
+    The condition is defined by the ``_done_condition`` function of the
+    generated node classes.
+
+    Args:
+        node: QCoDeS node or instrument that has a ``wait_done`` function.
+
+    Returns:
+        Parameter and the value it has once the node is done. None if the
+        condition of the node is unknown.
+
+    Raises:
+        RuntimeError: If an AWG core is in continuous mode.
+    """
+    condition = getattr(type(node), "_done_condition", None)
+    if condition is None:
+        return None
+    return condition(node)
+
+
+def sequencer_done(node: t.Any) -> t.Tuple["ZIParameter", int]:
+    """Done condition of an AWG core or a generator.
+
+    Args:
+        node: AWG core or generator node.
+
+    Returns:
+        Enable parameter of the sequencer and 0.
+
+    Raises:
+        RuntimeError: If the sequencer is in continuous mode.
+    """
+    if not node.single():
+        raise RuntimeError(f"{node.name} is in continuous mode.")
+    return node.enable, 0
+
+
+def result_done(node: t.Any) -> t.Tuple["ZIParameter", int]:
+    """Done condition of a readout or spectroscopy node.
+
+    Args:
+        node: Readout or spectroscopy node.
+
+    Returns:
+        Enable parameter of the result logger and 0.
+    """
+    return node.result.enable, 0
+
+
+def enable_done(node: t.Any) -> t.Tuple["ZIParameter", int]:
+    """Done condition of a node that disables itself (e.g. the scope).
+
+    Args:
+        node: Node with an enable parameter.
+
+    Returns:
+        Enable parameter of the node and 0.
+    """
+    return node.enable, 0
+
+
+def execution_done(node: t.Any) -> t.Tuple["ZIParameter", int]:
+    """Done condition of the PQSC.
+
+    Args:
+        node: PQSC instrument.
+
+    Returns:
+        Enable parameter of the execution engine and 0.
+    """
+    return node.execution.enable, 0
+
+
+def _latest(data: t.Any) -> t.Tuple[t.Optional[int], t.Any]:
+    """Timestamp and value of the latest sample in a flat get or poll result.
+
+    The timestamp is None if the result has no timestamps.
+    """
+    if isinstance(data, Mapping):
+        timestamps = data.get("timestamp")
+        if timestamps is None or not len(timestamps):
+            return None, data["value"][-1]
+        return timestamps[-1], data["value"][-1]
+    # HF2 has no timestamp -> no dict
+    return None, data[-1]
+
+
+def _update_values(
+    values: t.Dict[str, t.Tuple[t.Optional[int], t.Any]], result: t.Dict[str, t.Any]
+) -> None:
+    """Apply a flat get or poll result to the latest known node values.
+
+    Samples older than the known value (e.g. events polled after a get) are
+    ignored.
+    """
+    for path, data in result.items():
+        path = path.lower()
+        timestamp, value = _latest(data)
+        known = values.get(path)
+        if (
+            known is not None
+            and timestamp is not None
+            and known[0] is not None
+            and known[0] > timestamp
+        ):
+            continue
+        values[path] = (timestamp, value)
+
+
+def _select(
+    values: t.Dict[str, t.Tuple[t.Optional[int], t.Any]], paths: t.List[str]
+) -> t.Dict[str, t.Tuple[t.Optional[int], t.Any]]:
+    """Known values of a subset of the nodes."""
+    return {path: values[path] for path in paths if path in values}
+
+
+def _met_conditions(
+    conditions: t.Sequence[Condition],
+    values: t.Dict[str, t.Tuple[t.Optional[int], t.Any]],
+) -> t.List[bool]:
+    """Flags if the conditions are met for the known node values."""
+    return [
+        condition.path.lower() in values
+        and condition.is_met(values[condition.path.lower()][1])
+        for condition in conditions
+    ]
+
+
+def to_condition(item: t.Any) -> Condition:
+    """Convert a driver object or a parameter value pair into a condition.
+
+    Args:
+        item: Driver object with a ``wait_done`` function (e.g. an AWG core,
+            a readout or the PQSC), a tuple of parameter and expected value or
+            a tuple of parameter, expected value and invert flag.
+
+    Returns:
+        Condition of the item.
+
+    Raises:
+        RuntimeError: If an AWG core is in continuous mode.
+        TypeError: If the item can not be converted into a condition.
+    """
+    if isinstance(item, Condition):
+        return item
+    if isinstance(item, tuple):
+        parameter, value, *invert = item
+        if isinstance(value, str):
+            value = int(parameter.node_info.enum[value])
+        return Condition(parameter.zi_node, value, *invert)
+    condition = done_condition(item)
+    if condition is None:
+        raise TypeError(f"{item!r} has no done condition that can be watched.")
+    parameter, value = condition
+    return Condition(parameter.zi_node, value)
+
+
+class NodeWaiter:
+    """Waits for node values by subscribing to the nodes.
+
+    Instead of getting the value of a node periodically the nodes are
+    subscribed to on a dedicated connection to the data server. The waiting
+    thread blocks on the value changes and therefore wakes up within a
+    millisecond once a condition is met. Nodes that can not be subscribed to
+    fall back to polling their value.
+
+    Multiple threads can wait at the same time. The connection is only
+    locked for the single calls to the data server. All value changes are
+    collected in a table shared by the waiting threads, independent of the
+    thread that polled them.
+
+    Args:
+        session: Session to the data server.
+    """
+
+    def __init__(self, session: "Session"):
+        self._session = session
+        self._connection: t.Optional[ziDAQServer] = None
+        self._lock = threading.Lock()
+        self._subscriptions: t.Dict[str, int] = {}
+        self._values: t.Dict[str, t.Tuple[t.Optional[int], t.Any]] = {}
+        self.enabled = True
+
+    def _connect(self) -> ziDAQServer:
+        """Dedicated connection to the data server (created on first use)."""
+        if self._connection is None:
+            self._connection = ziDAQServer(
+                self._session.server_host,
+                self._session.server_port,
+                1 if self._session.is_hf2_server else 6,
+            )
+        return self._connection
+
+    def _subscribe(self, paths: t.List[str]) -> bool:
+        """Subscribe to nodes that are not subscribed to yet.
+
+        Needs to be called with the lock held.
+
+        Returns:
+            Flag if all nodes are subscribed to.
+        """
+        new_paths = [path for path in paths if path not in self._subscriptions]
+        if new_paths:
+            try:
+                self._connect().subscribe(new_paths)
+            except RuntimeError:
+                return False
+        for path in paths:
+            self._subscriptions[path] = self._subscriptions.get(path, 0) + 1
+        return True
+
+    def _unsubscribe(self, paths: t.List[str]) -> None:
+        """Unsubscribe from nodes no other wait is watching.
+
+        Needs to be called with the lock held.
+        """
+        unused = []
+        for path in paths:
+            count = self._subscriptions.pop(path, 0) - 1
+            if count > 0:
+                self._subscriptions[path] = count
+            else:
+                self._values.pop(path, None)
+                unused.append(path)
+        if unused and self._connection is not None:
+            self._connection.unsubscribe(unused)
+
+    def _get(self, paths: t.List[str]) -> t.Dict[str, t.Any]:
+        """Get the current value of nodes.
+
+        Needs to be called with the lock held.
+        """
+        return self._connect().get(",".join(paths), flat=True, settingsonly=False)
+
+    def wait(
+        self,
+        conditions: t.Sequence[Condition],
+        *,
+        timeout: float = 2,
+        sleep_time: float = 0.005,
+        require_all: bool = True,
+    ) -> t.List[Condition]:
+        """Wait until all (or any) conditions are met.
+
+        All nodes are watched together over a single subscription. The wait
+        therefore only takes as long as the slowest condition.
+
+        Args:
+            conditions: Conditions that should be met.
+            timeout: Maximum wait time in seconds. (default = 2)
+            sleep_time: Sleep interval in seconds if the nodes can not be
+                subscribed to. (default = 0.005)
+            require_all: Flag if all conditions need to be met. If False the
+                wait returns as soon as a single condition is met.
+                (default = True)
+
+        Returns:
+            Conditions that are met.
+
+        Raises:
+            TimeoutError: If the conditions are not met within the timeout.
+        """
+        if not conditions:
+            return []
+        deadline = time.monotonic() + timeout
+        paths = sorted({condition.path.lower() for condition in conditions})
+        done = all if require_all else any
+        values: t.Dict[str, t.Tuple[t.Optional[int], t.Any]] = {}
+        with self._lock:
+            subscribed = self.enabled and self._subscribe(paths)
+        try:
+            with self._lock:
+                result = self._get(paths)
+                if subscribed:
+                    _update_values(self._values, result)
+                    values = _select(self._values, paths)
+            if not subscribed:
+                _update_values(values, result)
+            met = _met_conditions(conditions, values)
+            while not done(met):
+                if time.monotonic() >= deadline:
+                    current = {path: value for path, (_, value) in values.items()}
+                    raise TimeoutError(
+                        f"{', '.join(paths)} did not change to the expected "
+                        f"value within {timeout}s. Current values: {current}"
+                    )
+                if subscribed:
+                    with self._lock:
+                        _update_values(
+                            self._values,
+                            self._connect().poll(_POLL_INTERVAL, 0, flat=True),
+                        )
+                        values = _select(self._values, paths)
+                else:
+                    time.sleep(sleep_time)
+                    with self._lock:
+                        result = self._get(paths)
+                    _update_values(values, result)
+                met = _met_conditions(conditions, values)
+        finally:
+            if subscribed:
+                with self._lock:
+                    self._unsubscribe(paths)
+        return [condition for condition, is_met in zip(conditions, met) if is_met]
+
+    def wait_for_state_change(
+        self,
+        parameter: "ZIParameter",
+        value: t.Union[int, str],
+        *,
+        invert: bool = False,
+        timeout: float = 2,
+        sleep_time: float = 0.005,
+    ) -> None:
+        """Waits until a parameter has the expected state/value.
+
+        Args:
+            parameter: Parameter to wait for.
+            value: Expected value of the node. Enumerated values can also be
+                passed by their name.
+            invert: Instead of waiting for the value, the function will wait for
+                any value except the passed value instead. (default = False)
+            timeout: Maximum wait time in seconds. (default = 2)
+            sleep_time: Sleep interval in seconds if the node can not be
+                subscribed to. (default = 0.005)
+
+        Raises:
+            TimeoutError: If the node did not change to the expected value
+                within the timeout.
+        """
+        self.wait(
+            [to_condition((parameter, value, invert))],
+            timeout=timeout,
+            sleep_time=sleep_time,
+        )
+
+    def close(self) -> None:
+        """Close the connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.disconnect()
+                self._connection = None
+            self._subscriptions.clear()
+            self._values.clear()
+
+
+def _waiter(node: t.Any) -> t.Optional[NodeWaiter]:
+    """Node waiter of the session a node belongs to."""
+    root = node.root_instrument
+    session = getattr(root, "session", root)
+    waiter = getattr(session, "node_waiter", None)
+    if not isinstance(waiter, NodeWaiter) or not waiter.enabled:
+        return None
+    return waiter
+
+
+def wait_for_state_change(
+    parameter: "ZIParameter",
+    value: t.Union[int, str],
+    *,
+    invert: bool = False,
+    timeout: float = 2,
+    sleep_time: float = 0.005,
+) -> None:
+    """Waits until a parameter has the expected state/value.
+
+    Uses the node waiter of the session if available and falls back to the
+    polling of the toolkit node otherwise.
+
+    Args:
+        parameter: Parameter to wait for.
+        value: Expected value of the node.
+        invert: Instead of waiting for the value, the function will wait for
+            any value except the passed value instead. (default = False)
+        timeout: Maximum wait time in seconds. (default = 2)
+        sleep_time: Sleep interval in seconds if the node can not be
+            subscribed to. (default = 0.005)
+
+    Raises:
+        TimeoutError: If the node did not change to the expected value
+            within the timeout.
+    """
+    waiter = _waiter(parameter)
+    if waiter is None:
+        parameter.tk_node.wait_for_state_change(
+            value, invert=invert, timeout=timeout, sleep_time=sleep_time
+        )
+        return
+    waiter.wait_for_state_change(
+        parameter, value, invert=invert, timeout=timeout, sleep_time=sleep_time
+    )
+
+
+def wait_done(node: t.Any, *, timeout: float = 10, sleep_time: float = 0.005) -> None:
+    """Wait until a node is finished.
+
+    Args:
+        node: Driver object to wait for (e.g. an AWG core).
+        timeout: The maximum waiting time in seconds. (default = 10)
+        sleep_time: Sleep interval in seconds if the node can not be
+            subscribed to. (default = 0.005)
+
+    Raises:
+        RuntimeError: If an AWG core is in continuous mode.
+        TimeoutError: If the node did not finish within the timeout.
+    """
+    condition = done_condition(node)
+    if condition is None:
+        node._tk_object.wait_done(timeout=timeout, sleep_time=sleep_time)
+        return
+    parameter, value = condition
+    wait_for_state_change(parameter, value, timeout=timeout, sleep_time=sleep_time)
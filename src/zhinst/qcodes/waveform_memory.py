@@ -0,0 +1,585 @@
+"""Driver side bookkeeping of the waveform memory of AWG cores.
+
+The driver keeps a write-through copy of every waveform (and integration
+weight) it writes to or reads from a device. Uploads only transfer the slots
+that changed and reads are served from memory as long as the copy is valid.
+
+The copy is discarded when a new sequencer program is loaded (also if the
+ELF is set directly through ``awg.elf.data``), the device is reset to its
+factory defaults or another client changes the memory (detected through a
+subscription on a dedicated connection, see :class:`MemoryWatcher`).
+"""
+import hashlib
+import threading
+import typing as t
+import weakref
+
+import numpy as np
+from zhinst.core import ziDAQServer
+from zhinst.toolkit import Waveforms
+
+from zhinst.qcodes.qcodes_adaptions import ZINode
+
+if t.TYPE_CHECKING:
+    from zhinst.qcodes.session import Session
+
+_MEMORIES: "weakref.WeakKeyDictionary[ZINode, WaveformMemory]" = (
+    weakref.WeakKeyDictionary()
+)
+# Location of the slots inside the nodes of the different memories
+# (node prefix relative to the QCoDeS node, suffix after the slot).
+_AWG_WAVES = ("/waveform/waves/", "")
+_GENERATOR_WAVES = ("/waveforms/", "/wave")
+_READOUT_WEIGHTS = ("/integration/weights/", "/wave")
+
+
+def _update_hash(hash_object: t.Any, value: t.Any) -> None:
+    """Feed a (nested) waveform into a hash object."""
+    if value is None:
+        hash_object.update(b"N")
+    elif isinstance(value, (tuple, list)):
+        hash_object.update(f"T{len(value)}".encode())
+        for item in value:
+            _update_hash(hash_object, item)
+    else:
+        array = np.ascontiguousarray(value)
+        hash_object.update(f"A{array.dtype.str}{array.shape}".encode())
+        hash_object.update(array)
+
+
+def _copy(value: t.Any) -> t.Any:
+    """Copy a (nested) waveform."""
+    if value is None:
+        return None
+    if isinstance(value, (tuple, list)):
+        return type(value)(_copy(item) for item in value)
+    return np.array(value, copy=True)
+
+
+def waveform_digest(value: t.Any) -> bytes:
+    """Content hash of a single waveform slot.
+
+    Args:
+        value: Waveform (or tuple of waves and markers) of a single slot.
+
+    Returns:
+        Digest of the waveform.
+    """
+    hash_object = hashlib.blake2b(digest_size=16)
+    _update_hash(hash_object, value)
+    return hash_object.digest()
+
+
+def waveform_digests(
+    waveforms: t.Union[Waveforms, dict], slots: t.Optional[t.Iterable[int]] = None
+) -> t.Dict[int, bytes]:
+    """Content hash of every waveform slot.
+
+    Args:
+        waveforms: Waveforms.
+        slots: Slots that should be considered. If not specified all slots
+            of waveforms are considered. (default = None)
+
+    Returns:
+        Digest of every slot.
+    """
+    return {
+        slot: waveform_digest(waveforms[slot])
+        for slot in waveforms
+        if not slots or slot in slots
+    }
+
+
+class WaveformMemory:
+    """Content of the waveform memory of an AWG core as known by the driver.
+
+    Holds a copy and a hash of every waveform slot the driver wrote to or
+    read from the waveform memory. This allows to only upload the slots that
+    changed since the last upload and to answer reads without a transfer.
+    """
+
+    def __init__(self):
+        self._digests: t.Dict[int, bytes] = {}
+        self._values: t.Dict[int, t.Any] = {}
+        self._complete = False
+        self._pending_events: t.Dict[int, int] = {}
+        self._program: t.Any = None
+        self._lock = threading.Lock()
+
+    def changed(self, digests: t.Dict[int, bytes]) -> t.Dict[int, bytes]:
+        """Get the slots whose content differs from the waveform memory.
+
+        Args:
+            digests: Digest of the new content of every slot (see
+                :func:`waveform_digests`).
+
+        Returns:
+            Digest of the new content of every changed slot.
+        """
+        with self._lock:
+            return {
+                slot: digest
+                for slot, digest in digests.items()
+                if self._digests.get(slot) != digest
+            }
+
+    def update(
+        self,
+        waveforms: t.Union[Waveforms, dict],
+        digests: t.Dict[int, bytes],
+        *,
+        written: bool = True,
+    ) -> None:
+        """Update the content of slots.
+
+        Args:
+            waveforms: Waveforms that contain the new content.
+            digests: Digest of the new content of the updated slots.
+            written: Flag if the slots were written by the driver. Each
+                write causes a change event that must not be treated as
+                an external change. (default = True)
+        """
+        values = {slot: _copy(waveforms[slot]) for slot in digests}
+        with self._lock:
+            self._digests.update(digests)
+            self._values.update(values)
+            if written:
+                for slot in digests:
+                    self._pending_events[slot] = self._pending_events.get(slot, 0) + 1
+
+    def read(self, slots: t.Optional[t.Iterable[int]] = None) -> t.Optional[Waveforms]:
+        """Get the content of slots.
+
+        Args:
+            slots: Requested slots. If not specified all slots are returned
+                (only possible if the complete content is known).
+                (default = None)
+
+        Returns:
+            Waveforms with the requested slots. None if the content is not
+            known.
+        """
+        with self._lock:
+            if slots is None:
+                if not self._complete:
+                    return None
+                slots = list(self._values)
+            elif any(slot not in self._values for slot in slots):
+                return None
+            waveforms = Waveforms()
+            for slot in slots:
+                waveforms[slot] = _copy(self._values[slot])
+            return waveforms
+
+    def mark_complete(self) -> None:
+        """Mark the known content as the complete content of the memory."""
+        with self._lock:
+            self._complete = True
+
+    def external_change(self, slot: int, count: int = 1) -> None:
+        """Process change events of a slot.
+
+        Events caused by writes of the driver itself are ignored. Any other
+        event invalidates the memory.
+
+        Args:
+            slot: Slot that changed.
+            count: Number of change events. (default = 1)
+        """
+        with self._lock:
+            pending = self._pending_events.get(slot, 0)
+            self._pending_events[slot] = max(pending - count, 0)
+            if count <= pending:
+                return
+        self.invalidate()
+
+    def check_program(self, program: t.Any) -> None:
+        """Forget the content of the memory if the sequencer program changed.
+
+        Args:
+            program: Identifier of the currently loaded sequencer program
+                (see :func:`loaded_program`).
+        """
+        with self._lock:
+            if program == self._program:
+                return
+            self._program = program
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Forget the content of the waveform memory.
+
+        Needs to be called whenever the waveform memory is changed outside of
+        the driver (e.g. by uploading a new sequencer program).
+        """
+        with self._lock:
+            self._digests.clear()
+            self._values.clear()
+            self._complete = False
+
+    @property
+    def slots(self) -> t.List[int]:
+        """Slots with a known content."""
+        return list(self._digests)
+
+    @property
+    def complete(self) -> bool:
+        """Flag if the known content is the complete content of the memory."""
+        return self._complete
+
+
+class MemoryWatcher:
+    """Detects changes of waveform memories by other clients.
+
+    Subscribes to the nodes of all cached memories on a dedicated connection
+    to the data server. Before a read is served from memory or a write
+    compares the content the received change events are processed. Every
+    change that was not caused by the driver itself invalidates the
+    corresponding memory.
+
+    Args:
+        session: Session to the data server.
+    """
+
+    def __init__(self, session: "Session"):
+        self._session = session
+        self._connection: t.Optional[ziDAQServer] = None
+        self._watched: t.Dict[str, t.Tuple[WaveformMemory, str]] = {}
+        self._lock = threading.Lock()
+        self.enabled = True
+
+    def watch(self, memory: WaveformMemory, prefix: str, suffix: str = "") -> None:
+        """Subscribe to the nodes of a memory.
+
+        Args:
+            memory: Memory that should be watched.
+            prefix: Node path up to the slot.
+            suffix: Node path after the slot. (default = "")
+        """
+        prefix = prefix.lower()
+        with self._lock:
+            if not self.enabled or prefix in self._watched:
+                return
+            if self._connection is None:
+                self._connection = ziDAQServer(
+                    self._session.server_host,
+                    self._session.server_port,
+                    1 if self._session.is_hf2_server else 6,
+                )
+            self._connection.subscribe(f"{prefix}*{suffix}")
+            self._watched[prefix] = (memory, suffix)
+
+    def check(self) -> None:
+        """Process the change events received since the last check."""
+        with self._lock:
+            if self._connection is None:
+                return
+            events = self._connection.poll(0.001, 0, flat=True)
+            for path, data in events.items():
+                path = path.lower()
+                for prefix, (memory, suffix) in self._watched.items():
+                    if not path.startswith(prefix) or not path.endswith(suffix):
+                        continue
+                    slot = path[len(prefix) : len(path) - len(suffix)]  # noqa: E203
+                    if slot.isdigit():
+                        count = len(data) if isinstance(data, list) else 1
+                        memory.external_change(int(slot), count)
+
+    def close(self) -> None:
+        """Unsubscribe from all nodes and close the connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.unsubscribe("*")
+                self._connection.disconnect()
+                self._connection = None
+            self._watched.clear()
+
+
+def _watcher(node: ZINode) -> t.Optional[MemoryWatcher]:
+    """Memory watcher of the session a node belongs to."""
+    session = getattr(node.root_instrument, "session", None)
+    watcher = getattr(session, "memory_watcher", None)
+    return watcher if isinstance(watcher, MemoryWatcher) else None
+
+
+def waveform_memory(
+    node: ZINode, paths: t.Optional[t.Tuple[str, str]] = None
+) -> WaveformMemory:
+    """Get the waveform memory bookkeeping of an AWG core.
+
+    Args:
+        node: AWG core node (e.g. ``device.awgs[0]``).
+        paths: Location of the slots inside the nodes relative to the node.
+            If specified the nodes are watched for external changes.
+            (default = None)
+
+    Returns:
+        Waveform memory of the node.
+    """
+    try:
+        return _MEMORIES[node]
+    except KeyError:
+        memory = _MEMORIES[node] = WaveformMemory()
+    watcher = _watcher(node) if paths else None
+    if watcher is not None:
+        watcher.watch(memory, node.zi_node + paths[0], paths[1])  # type: ignore
+    return memory
+
+
+def loaded_program(node: ZINode) -> t.Any:
+    """Identifier of the sequencer program of a node.
+
+    The timestamp of the last set of the ELF node changes with every program
+    upload through the driver, including a direct ``awg.elf.data(elf)``.
+
+    Args:
+        node: AWG core node (e.g. ``device.awgs[0]``).
+
+    Returns:
+        Identifier of the program. None if the node has no sequencer.
+    """
+    elf = getattr(node, "elf", None)
+    return None if elf is None else elf.data.cache.timestamp
+
+
+def _memory(node: ZINode, paths: t.Tuple[str, str]) -> WaveformMemory:
+    """Waveform memory of a node with all known changes processed."""
+    memory = waveform_memory(node, paths)
+    memory.check_program(loaded_program(node))
+    watcher = _watcher(node)
+    if watcher is not None:
+        watcher.check()
+    return memory
+
+
+def invalidate(node: ZINode) -> None:
+    """Forget the content of the waveform memory of an AWG core.
+
+    Args:
+        node: AWG core node (e.g. ``device.awgs[0]``).
+    """
+    memory = _MEMORIES.get(node)
+    if memory is not None:
+        memory.invalidate()
+
+
+def _read(
+    node: ZINode,
+    paths: t.Tuple[str, str],
+    slots: t.Optional[t.List[int]],
+    read_function: t.Callable[[], Waveforms],
+) -> Waveforms:
+    """Serve a read from memory or read from the device and fill the memory."""
+    memory = _memory(node, paths)
+    waveforms = memory.read(slots)
+    if waveforms is not None:
+        return waveforms
+    waveforms = read_function()
+    memory.update(waveforms, waveform_digests(waveforms), written=False)
+    if slots is None:
+        memory.mark_complete()
+    return waveforms
+
+
+def write_to_waveform_memory(
+    awg: ZINode,
+    waveforms: Waveforms,
+    indexes: t.Optional[list] = None,
+    *,
+    force: bool = False,
+) -> None:
+    """Write the changed waveforms to the waveform memory of an AWG core.
+
+    Args:
+        awg: AWG core node (e.g. ``device.awgs[0]``).
+        waveforms: Waveforms that should be uploaded.
+        indexes: Specify a list of indexes that should be uploaded. If
+            nothing is specified all available indexes in waveforms will
+            be uploaded. (default = None)
+        force: Flag if all waveforms should be uploaded, even the ones that
+            did not change since the last upload. (default = False)
+    """
+    memory = _memory(awg, _AWG_WAVES)
+    if force:
+        memory.invalidate()
+    changed = memory.changed(waveform_digests(waveforms, indexes))
+    if not changed:
+        return
+    awg._tk_object.write_to_waveform_memory(waveforms=waveforms, indexes=list(changed))
+    memory.update(waveforms, changed)
+
+
+def read_from_waveform_memory(
+    awg: ZINode, indexes: t.Optional[t.List[int]] = None
+) -> Waveforms:
+    """Read waveforms from the waveform memory of an AWG core.
+
+    Args:
+        awg: AWG core node (e.g. ``device.awgs[0]``).
+        indexes: List of waveform indexes to read from the device. If not
+            specified all assigned waveforms will be downloaded.
+
+    Returns:
+        Waveform object with the downloaded waveforms.
+    """
+    return _read(
+        awg,
+        _AWG_WAVES,
+        indexes,
+        lambda: awg._tk_object.read_from_waveform_memory(indexes=indexes),
+    )
+
+
+def _write_slots(
+    node: ZINode,
+    paths: t.Tuple[str, str],
+    waveforms: t.Union[Waveforms, dict],
+    clear_existing: bool,
+    force: bool,
+    write_function: t.Callable[[t.Union[Waveforms, dict]], None],
+) -> None:
+    """Write the changed slots of a memory that supports clearing."""
+    memory = _memory(node, paths)
+    if force:
+        memory.invalidate()
+    digests = waveform_digests(waveforms)
+    changed = memory.changed(digests)
+    if clear_existing:
+        if not changed and memory.complete and sorted(memory.slots) == sorted(digests):
+            return
+        write_function(waveforms)
+        memory.invalidate()
+        memory.update(waveforms, digests)
+        memory.mark_complete()
+        return
+    if not changed:
+        return
+    subset = {} if isinstance(waveforms, dict) else Waveforms()
+    for slot in changed:
+        subset[slot] = waveforms[slot]
+    write_function(subset)
+    memory.update(waveforms, changed)
+
+
+def write_pulses(
+    generator: ZINode,
+    pulses: t.Union[Waveforms, dict],
+    *,
+    clear_existing: bool = True,
+    force: bool = False,
+) -> None:
+    """Write the changed pulses to the waveform memory of a generator.
+
+    If ``clear_existing`` is set the upload is skipped entirely if the
+    waveform memory already contains exactly the passed pulses. Otherwise
+    only the changed pulses are uploaded.
+
+    Args:
+        generator: Generator node (e.g. ``device.qachannels[0].generator``).
+        pulses: Waveforms that should be uploaded.
+        clear_existing: Flag whether to clear the waveform memory before the
+            present upload. (default = True)
+        force: Flag if all waveforms should be uploaded, even the ones that
+            did not change since the last upload. (default = False)
+    """
+    _write_slots(
+        generator,
+        _GENERATOR_WAVES,
+        pulses,
+        clear_existing,
+        force,
+        lambda subset: generator._tk_object.write_to_waveform_memory(
+            pulses=subset, clear_existing=clear_existing
+        ),
+    )
+
+
+def read_pulses(generator: ZINode, slots: t.Optional[t.List[int]] = None) -> Waveforms:
+    """Read pulses from the waveform memory of a generator.
+
+    Args:
+        generator: Generator node (e.g. ``device.qachannels[0].generator``).
+        slots: List of waveform indexes to read from the device. If not
+            specified all assigned waveforms will be downloaded.
+
+    Returns:
+        Mutable mapping of the downloaded waveforms.
+    """
+    return _read(
+        generator,
+        _GENERATOR_WAVES,
+        slots,
+        lambda: generator._tk_object.read_from_waveform_memory(slots=slots),
+    )
+
+
+def write_integration_weights(
+    readout: ZINode,
+    weights: t.Union[Waveforms, dict],
+    *,
+    integration_delay: float = 0.0,
+    clear_existing: bool = True,
+) -> None:
+    """Configure the weighted integration of a readout.
+
+    The weights are always uploaded (the integration delay is part of the
+    configuration) but kept in memory for later reads.
+
+    Args:
+        readout: Readout node (e.g. ``device.qachannels[0].readout``).
+        weights: Dictionary containing the complex weight vectors, where
+            keys correspond to the indices of the integration units to be
+            configured.
+        integration_delay: Delay in seconds before starting the readout.
+            (default = 0.0)
+        clear_existing: Flag whether to clear the waveform memory before
+            the present upload. (default = True)
+    """
+    _write_slots(
+        readout,
+        _READOUT_WEIGHTS,
+        weights,
+        clear_existing,
+        True,
+        lambda subset: readout._tk_object.write_integration_weights(
+            weights=subset,
+            integration_delay=integration_delay,
+            clear_existing=clear_existing,
+        ),
+    )
+
+
+def read_integration_weights(
+    readout: ZINode, slots: t.Optional[t.List[int]] = None
+) -> Waveforms:
+    """Read integration weights from the waveform memory of a readout.
+
+    Args:
+        readout: Readout node (e.g. ``device.qachannels[0].readout``).
+        slots: List of weight slots to read from the device. If not specified
+            all available weights will be downloaded.
+
+    Returns:
+        Mutable mapping of the downloaded weights.
+    """
+    return _read(
+        readout,
+        _READOUT_WEIGHTS,
+        slots,
+        lambda: readout._tk_object.read_integration_weights(slots=slots),
+    )
+
+
+def factory_reset(device: t.Any, deep: bool = True) -> None:
+    """Load the factory default settings and forget the memory content.
+
+    Args:
+        device: QCoDeS device.
+        deep: A flag that specifies if a synchronization
+            should be performed between the device and the data
+            server after loading the factory preset (default: True).
+    """
+    for node, memory in list(_MEMORIES.items()):
+        if node.root_instrument is device:
+            memory.invalidate()
+    device._tk_object.factory_reset(deep=deep)
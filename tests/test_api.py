@@ -12,4 +12,7 @@ def test_api_all():
         PQSC,
         MFIA,
         MFLI,
+        NodetreeCache,
+        AsyncSession,
+        CompileCache,
     )
@@ -0,0 +1,59 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from zhinst.qcodes import AsyncSession
+from zhinst.qcodes.waiting import NodeWaiter
+
+
+def test_wait_for_state_change():
+    values = iter([1, 1, 0])
+    parameter = MagicMock(side_effect=lambda **kwargs: next(values))
+
+    async def run():
+        async with AsyncSession(MagicMock()) as async_session:
+            await async_session.wait_for_state_change(parameter, 0, sleep_time=0)
+
+    asyncio.run(run())
+    assert parameter.call_count == 3
+    parameter.assert_called_with(enum=False)
+
+
+def test_wait_for_state_change_timeout():
+    parameter = MagicMock(return_value=1)
+
+    async def run():
+        async with AsyncSession(MagicMock()) as async_session:
+            await async_session.wait_for_state_change(
+                parameter, 0, timeout=0.01, sleep_time=0
+            )
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+def test_wait_for_state_change_node_waiter():
+    session = MagicMock()
+    session.is_hf2_server = False
+    session.node_waiter = NodeWaiter(session)
+    parameter = MagicMock(zi_node="/dev1234/awgs/0/enable")
+
+    async def run():
+        async with AsyncSession(session) as async_session:
+            await async_session.wait_for_state_change(parameter, 0)
+
+    with patch("zhinst.qcodes.waiting.ziDAQServer") as daq_server:
+        connection = daq_server.return_value
+        connection.get.return_value = {
+            "/dev1234/awgs/0/enable": {"timestamp": [1], "value": [1]}
+        }
+        connection.poll.side_effect = [
+            {},
+            {"/dev1234/awgs/0/enable": {"timestamp": [2], "value": [0]}},
+        ]
+        asyncio.run(run())
+    connection.subscribe.assert_called_once_with(["/dev1234/awgs/0/enable"])
+    connection.unsubscribe.assert_called_once_with(["/dev1234/awgs/0/enable"])
+    assert connection.poll.call_count == 2
+    parameter.assert_not_called()
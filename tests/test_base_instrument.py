@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+
+from zhinst.qcodes.driver.devices.base import ZIBaseInstrument
+
+
+def test_get_many():
+    device = MagicMock()
+    device._get_paths = lambda *args, **kwargs: ZIBaseInstrument._get_paths(
+        device, *args, **kwargs
+    )
+    root = device._tk_object.root
+    root.connection.get.return_value = {
+        "/dev1234/oscs/0/freq": {"timestamp": [1], "value": [10e6]},
+        "/dev1234/oscs/1/freq": {"timestamp": [1], "value": [12e6]},
+    }
+    root.raw_path_to_node.return_value._parse_get_value.side_effect = (
+        lambda value, **kwargs: value
+    )
+    parameters = [MagicMock(zi_node=f"/DEV1234/OSCS/{i}/FREQ") for i in range(2)]
+
+    result = ZIBaseInstrument.get_many(device, parameters)
+
+    root.connection.get.assert_called_once_with(
+        "/dev1234/oscs/0/freq,/dev1234/oscs/1/freq", flat=True, settingsonly=False
+    )
+    assert result["/dev1234/oscs/0/freq"] == 10e6
+    assert result["/dev1234/oscs/1/freq"] == 12e6
+    for parameter, value in zip(parameters, [10e6, 12e6]):
+        assert parameter.cache._update_with.call_args.kwargs["value"] == value
+
+
+def test_get_many_empty():
+    device = MagicMock()
+    assert len(ZIBaseInstrument.get_many(device, [])) == 0
+    device._tk_object.root.connection.get.assert_not_called()
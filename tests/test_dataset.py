@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from zhinst.qcodes.dataset import DatasetWriter
+from zhinst.qcodes.qcodes_adaptions import ParameterSkeleton, ZICompactParameter
+
+
+def test_dataset_writer_batches_chunks():
+    parameter = MagicMock()
+    parameter.zi_node = "/DEV1234/demods/0/sample"
+    parameter.full_name = "zi_dev1234_demods0_sample"
+    other = MagicMock()
+    other.zi_node = "/dev1234/demods/1/sample"
+    with patch("zhinst.qcodes.dataset.Measurement") as measurement:
+        datasaver = measurement.return_value.run.return_value.__enter__.return_value
+        writer = DatasetWriter(
+            MagicMock(), [parameter], poll=False, write_interval=0.01
+        )
+        writer.start()
+        for offset in [0, 3]:
+            writer.write(
+                {
+                    parameter: {
+                        "timestamp": np.arange(3) + offset,
+                        "x": np.ones(3),
+                        "y": np.zeros(3),
+                    },
+                    other: {"timestamp": np.arange(3), "x": np.ones(3)},
+                }
+            )
+        writer.stop()
+
+    registered = [
+        call.args[0]
+        for call in measurement.return_value.register_custom_parameter.call_args_list
+    ]
+    assert registered == [
+        "zi_dev1234_demods0_sample_timestamp",
+        "zi_dev1234_demods0_sample_x",
+        "zi_dev1234_demods0_sample_y",
+    ]
+    timestamps = np.concatenate(
+        [call.args[0][1] for call in datasaver.add_result.call_args_list]
+    )
+    np.testing.assert_array_equal(timestamps, np.arange(6))
+    assert datasaver.add_result.call_count <= 2
+    assert writer.samples == 6
+    assert writer.dataset is datasaver.dataset
+
+
+def test_dataset_writer_compact_parameter():
+    skeleton = ParameterSkeleton(
+        raw_tree=("demods", "0", "sample"),
+        qcodes_list=["demods", "0", "sample"],
+        zi_node="/DEV1234/DEMODS/0/SAMPLE",
+        docstring="Demodulator sample",
+        unit=None,
+        is_complex=False,
+        do_snapshot=False,
+    )
+    parameter = ZICompactParameter(
+        skeleton, MagicMock(full_name="zi_dev1234_demods0"), MagicMock(), MagicMock()
+    )
+    with patch("zhinst.qcodes.dataset.Measurement") as measurement:
+        writer = DatasetWriter(
+            MagicMock(), [parameter], poll=False, write_interval=0.01
+        )
+        writer.start()
+        writer.write({parameter: {"timestamp": np.arange(3), "x": np.ones(3)}})
+        writer.stop()
+
+    register = measurement.return_value.register_custom_parameter
+    register.assert_called_with(
+        "zi_dev1234_demods0_sample_x",
+        label="sample x",
+        setpoints=("zi_dev1234_demods0_sample_timestamp",),
+        paramtype="array",
+    )
+    assert writer.samples == 3
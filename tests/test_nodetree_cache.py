@@ -0,0 +1,19 @@
+from fixtures import mock_connection, data_dir, session
+
+from zhinst.qcodes import NodetreeCache
+from zhinst.qcodes.qcodes_adaptions import nodetree_skeleton
+
+
+def test_store_and_load(session, tmp_path):
+    nodetree = session.toolkit_session.root
+    skeleton = nodetree_skeleton(nodetree)
+    cache = NodetreeCache(tmp_path)
+    key = {"device_type": "TEST", "options": "", "fwrevision": 1}
+
+    assert cache.load(key, "zi") is None
+    cache.store(key, skeleton, "zi")
+    assert cache.load(key, "zi") == skeleton
+    assert cache.load({**key, "fwrevision": 2}, "zi") is None
+
+    cache.clear()
+    assert cache.load(key, "zi") is None
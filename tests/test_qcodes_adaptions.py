@@ -0,0 +1,287 @@
+from datetime import datetime, timedelta
+from unittest.mock import ANY, MagicMock, patch
+
+import numpy as np
+
+from fixtures import mock_connection, data_dir, session
+
+from zhinst.qcodes.qcodes_adaptions import (
+    ParameterSkeleton,
+    ZICompactParameter,
+    ZIInstrument,
+    ZISnapshotHelper,
+    active_cache_transaction,
+    cache_transaction,
+    decode_values,
+    init_nodetree,
+    tk_node_to_parameter,
+)
+
+
+class TestLazyNodetree:
+    def test_lazy_init_nodetree(self, session):
+        nodetree = session.toolkit_session.root
+        instrument = ZIInstrument("zi_lazy_test", nodetree)
+        try:
+            parameters = set(dict.keys(instrument.parameters))
+            submodules = set(dict.keys(instrument.submodules))
+            init_nodetree(instrument, nodetree, instrument._snapshot_cache, lazy=True)
+            assert not hasattr(instrument, "not_a_node")
+            assert set(dict.keys(instrument.parameters)) == parameters
+            assert set(dict.keys(instrument.submodules)) == submodules
+            for node, _ in nodetree:
+                assert (
+                    tk_node_to_parameter(instrument, node).zi_node
+                    == tk_node_to_parameter(session, node).zi_node
+                )
+            assert list(instrument.submodules) == list(session.submodules)
+        finally:
+            instrument.close()
+
+    def test_compact_init_nodetree(self, session):
+        nodetree = session.toolkit_session.root
+        instrument = ZIInstrument("zi_compact_test", nodetree)
+        try:
+            init_nodetree(
+                instrument, nodetree, instrument._snapshot_cache, compact=True
+            )
+            for node, _ in nodetree:
+                parameter = tk_node_to_parameter(instrument, node)
+                assert isinstance(parameter, ZICompactParameter)
+                assert parameter.zi_node == tk_node_to_parameter(session, node).zi_node
+        finally:
+            instrument.close()
+
+    def test_init_nodetree_parents_once(self):
+        skeleton = [
+            ParameterSkeleton(
+                raw_tree=("demods", "0", name),
+                qcodes_list=["demods0", name],
+                zi_node=f"/DEV1234/DEMODS/0/{name.upper()}",
+                docstring="",
+                unit="",
+                is_complex=False,
+                do_snapshot=True,
+            )
+            for name in ["enable", "rate", "order"]
+        ]
+        layer = MagicMock()
+        with patch("zhinst.qcodes.qcodes_adaptions._get_child") as get_child, patch(
+            "zhinst.qcodes.qcodes_adaptions._add_parameter"
+        ) as add_parameter:
+            init_nodetree(layer, MagicMock(), MagicMock(), skeleton=skeleton)
+        get_child.assert_called_once_with(layer, ["demods0"], 0, ANY)
+        assert add_parameter.call_count == 3
+        for call in add_parameter.call_args_list:
+            assert call.args[0] is get_child.return_value
+
+
+class TestCompactParameter:
+    def test_compact_parameter(self):
+        skeleton = ParameterSkeleton(
+            raw_tree=("a", "b"),
+            qcodes_list=["a", "b"],
+            zi_node="/DEV1234/A/B",
+            docstring="Test node",
+            unit="V",
+            is_complex=False,
+            do_snapshot=True,
+        )
+        nodetree = MagicMock()
+        nodetree.prefix_hide = "dev1234"
+        nodetree.connection.get.return_value = {
+            "/dev1234/a/b": {"timestamp": [1], "value": [0.5]}
+        }
+        helper = ZISnapshotHelper(nodetree)
+        parameter = ZICompactParameter(
+            skeleton, MagicMock(full_name="dev_a"), nodetree, helper
+        )
+        assert not hasattr(parameter, "__dict__")
+        with helper.snapshot():
+            state = parameter.snapshot()
+        assert state["value"] == 0.5
+        assert state["full_name"] == "dev_a_b"
+        assert state["unit"] == "V"
+        assert parameter.cache.get() == 0.5
+        assert parameter.tk_node is parameter.tk_node
+
+
+class TestCacheTransaction:
+    def test_cache_transaction(self):
+        nodetree = MagicMock()
+        parameter = MagicMock()
+        with cache_transaction([nodetree]) as transaction:
+            assert active_cache_transaction(nodetree) is transaction
+            transaction.add(parameter, 1)
+            transaction.add(parameter, 2)
+            transaction.validate()
+            parameter.cache._update_with.assert_not_called()
+        assert active_cache_transaction(nodetree) is None
+        parameter.validate.assert_called_once_with(2)
+        parameter.cache._update_with.assert_called_once()
+        assert parameter.cache._update_with.call_args.kwargs["value"] == 2
+        parameter._snapshot_cache.invalidate.assert_called_once()
+
+    def test_cache_transaction_rollback(self):
+        nodetree = MagicMock()
+        parameter = MagicMock()
+        try:
+            with cache_transaction([nodetree]) as transaction:
+                transaction.add(parameter, 1)
+                raise RuntimeError("set failed")
+        except RuntimeError:
+            pass
+        assert active_cache_transaction(nodetree) is None
+        parameter.cache._update_with.assert_not_called()
+
+
+class TestSetIfChanged:
+    def test_set_if_changed(self):
+        helper = ZISnapshotHelper(MagicMock())
+        set_filter = helper.set_if_changed
+        parameter = MagicMock(zi_node="/dev1234/a")
+        parameter.cache.get.return_value = 1.0
+        parameter.cache.timestamp = datetime.now()
+        assert not set_filter.skip(parameter, 1.0)
+        with set_filter(max_age=10):
+            assert set_filter.skip(parameter, 1.0)
+            assert not set_filter.skip(parameter, 2.0)
+            parameter.cache.timestamp = datetime.now() - timedelta(seconds=20)
+            assert not set_filter.skip(parameter, 1.0)
+        assert not set_filter.enabled
+        assert (set_filter.changed, set_filter.skipped) == (2, 1)
+
+    def test_set_if_changed_live_mirror(self):
+        helper = ZISnapshotHelper(MagicMock())
+        helper._mirror_path = "/dev1234"
+        helper._mirror = {"/dev1234/a": {"timestamp": [1], "value": [0]}}
+        parameter = MagicMock(zi_node="/DEV1234/A", _snapshot_cache=helper)
+        with helper.set_if_changed():
+            assert not helper.set_if_changed.skip(parameter, 1)
+            with cache_transaction([MagicMock()]) as transaction:
+                transaction.add(parameter, 1)
+            assert helper.set_if_changed.skip(parameter, 1)
+            # Older changes do not replace the set value
+            helper._apply_changes({"/dev1234/a": {"timestamp": [0], "value": [0]}})
+            assert helper.set_if_changed.skip(parameter, 1)
+            helper._apply_changes({"/dev1234/a": {"timestamp": [2], "value": [2]}})
+            assert helper.set_if_changed.skip(parameter, 2)
+            helper.update_mirror("/dev1234/b", 1)
+        assert "/dev1234/b" not in helper._mirror
+
+    def test_set_if_changed_transaction(self):
+        helper = ZISnapshotHelper(MagicMock())
+        parameter = MagicMock(zi_node="/dev1234/a")
+        parameter.cache.get.return_value = 1
+        with cache_transaction([MagicMock()], skip_unchanged=True) as transaction:
+            assert helper.set_if_changed.skip(parameter, 1, transaction)
+            transaction.add(parameter, 2)
+            assert not helper.set_if_changed.skip(parameter, 1, transaction)
+            assert helper.set_if_changed.skip(parameter, 2, transaction)
+
+
+class TestSnapshotHelper:
+    def test_snapshot_ttl(self):
+        nodetree = MagicMock()
+        nodetree.prefix_hide = "dev1234"
+        helper = ZISnapshotHelper(nodetree, ttl=10)
+        with helper.snapshot():
+            pass
+        with helper.snapshot("/dev1234/demods/0"):
+            pass
+        nodetree.connection.get.assert_called_once()
+        helper.invalidate()
+        with helper.snapshot():
+            pass
+        assert nodetree.connection.get.call_count == 2
+
+    def test_snapshot_without_ttl(self):
+        nodetree = MagicMock()
+        nodetree.prefix_hide = "dev1234"
+        helper = ZISnapshotHelper(nodetree)
+        with helper.snapshot():
+            pass
+        with helper.snapshot():
+            pass
+        assert nodetree.connection.get.call_count == 2
+
+    def test_snapshot_live_mirror(self):
+        nodetree = MagicMock()
+        nodetree.prefix_hide = "dev1234"
+        nodetree.__iter__.return_value = iter(
+            [
+                (None, {"Node": "/DEV1234/SIGOUTS/0/ON", "Properties": "Read, Write"}),
+                (None, {"Node": "/DEV1234/DEMODS/0/SAMPLE", "Properties": "Stream"}),
+            ]
+        )
+        connection = MagicMock()
+        connection.get.return_value = {
+            "/dev1234/sigouts/0/on": {"timestamp": [1], "value": [0]}
+        }
+        connection.poll.return_value = {}
+        helper = ZISnapshotHelper(nodetree)
+        helper.start_live_mirror(connection=connection, poll_interval=0.001)
+        try:
+            connection.subscribe.assert_called_once_with(["/dev1234/sigouts/0/on"])
+            helper._apply_changes(
+                {"/dev1234/sigouts/0/on": {"timestamp": [2, 3], "value": [0, 1]}}
+            )
+            with helper.snapshot():
+                assert helper._value_dict["/dev1234/sigouts/0/on"]["value"] == [1]
+            nodetree.connection.get.assert_not_called()
+            assert helper.live
+        finally:
+            helper.stop_live_mirror()
+        assert not helper.live
+        connection.disconnect.assert_called_once()
+
+    def test_snapshot_batches_misses(self):
+        nodetree = MagicMock()
+        nodetree.prefix_hide = "dev1234"
+        nodetree.__iter__.side_effect = lambda: iter(
+            [
+                (None, {"Node": "/DEV1234/A/B", "Properties": "Read, Write"}),
+                (None, {"Node": "/DEV1234/A/C", "Properties": "Read"}),
+                (None, {"Node": "/DEV1234/A/D", "Properties": "Read"}),
+                (None, {"Node": "/DEV1234/A/VALUES/0", "Properties": "Read"}),
+                (None, {"Node": "/DEV1234/A/FWLOG", "Properties": "Read"}),
+                (None, {"Node": "/DEV1234/A/E", "Properties": "Write"}),
+            ]
+        )
+        nodetree.connection.get.side_effect = [
+            {"/dev1234/a/b": {"timestamp": [1], "value": [1]}},
+            {"/dev1234/a/c": {"timestamp": [1], "value": [2]}},
+        ]
+        helper = ZISnapshotHelper(nodetree)
+        parameters = [MagicMock(zi_node=f"/DEV1234/A/{x}") for x in "BCD"]
+        fallback = MagicMock(return_value=3)
+        with helper.snapshot():
+            values = [helper.get(parameter, fallback) for parameter in parameters]
+        assert values == [1, 2, 3]
+        assert nodetree.connection.get.call_count == 2
+        nodetree.connection.get.assert_called_with(
+            "/dev1234/a/c,/dev1234/a/d", flat=True
+        )
+        fallback.assert_called_once()
+        assert helper.misses == 2
+        assert helper.fallbacks == 1
+        assert helper.missed_nodes == ["/dev1234/a/c", "/dev1234/a/d"]
+
+    def test_decode_values(self):
+        result = {
+            "/DEV1234/A": {"timestamp": np.array([1]), "value": np.array([1])},
+            "/dev1234/b": {"timestamp": np.array([1]), "value": np.array([0.5])},
+            "/dev1234/c": {"timestamp": np.array([1]), "value": np.array([1 + 2j])},
+            "/dev1234/d": {"timestamp": np.array([1]), "value": ["test"]},
+            "/dev1234/e": {"timestamp": np.array([]), "value": np.array([])},
+        }
+        values = decode_values(result)
+        assert values == {
+            "/dev1234/a": 1,
+            "/dev1234/b": 0.5,
+            "/dev1234/c": "(1+2j)",
+            "/dev1234/d": "test",
+        }
+        assert type(values["/dev1234/a"]) is int
+        # HF2 has no timestamp -> no dict
+        assert decode_values({"/dev1234/a": np.array([3])}) == {"/dev1234/a": 3}
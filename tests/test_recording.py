@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from zhinst.qcodes.recording import Recorder, record, record_to
+
+h5py = pytest.importorskip("h5py")
+
+
+def _burst(created, samples=4):
+    return {
+        "header": {"createdtimestamp": np.array([created])},
+        "timestamp": np.arange(samples).reshape(1, samples) + created,
+        "value": np.ones((1, samples)) * created,
+    }
+
+
+def test_recorder_append(tmp_path):
+    path = tmp_path / "result.h5"
+    with Recorder(path) as recorder:
+        recorder.write(
+            {
+                "/dev1234/demods/0/sample.x": [_burst(1), _burst(2)],
+                "/triggernode": ["/dev1234/demods/0/sample.r"],
+            }
+        )
+        recorder.write({"/dev1234/demods/0/sample.x": [_burst(2), _burst(3)]})
+    assert recorder.records == 3
+    with h5py.File(path, "r") as file:
+        value = file["dev1234/demods/0/sample.x/value"]
+        assert value.shape == (3, 1, 4)
+        assert value.compression == "gzip"
+        np.testing.assert_array_equal(value[:, 0, 0], [1, 2, 3])
+        assert file["dev1234/demods/0/sample.x/timestamp"].shape == (3, 1, 4)
+        assert "triggernode" not in file
+
+
+def test_recorder_replace(tmp_path):
+    path = tmp_path / "result.h5"
+    with Recorder(path, mode="replace") as recorder:
+        for value in [0, 1]:
+            sweep = {"header": {"createdtimestamp": [1]}, "x": np.full(5, value)}
+            recorder.write({"/dev1234/demods/0/sample": [[sweep]]})
+    with h5py.File(path, "r") as file:
+        np.testing.assert_array_equal(
+            file["dev1234/demods/0/sample/x"][()], np.ones((1, 5))
+        )
+
+
+def test_recorder_netcdf(tmp_path):
+    pytest.importorskip("h5netcdf")
+    path = tmp_path / "result.nc"
+    with Recorder(path) as recorder:
+        recorder.write(
+            {"/dev1234/scopes/0/wave": [{"timestamp": 5, "wave": np.ones((2, 8)) * 1j}]}
+        )
+    with h5py.File(path, "r") as file:
+        assert file["dev1234/scopes/0/wave/wave_imag"].shape == (1, 2, 8)
+        assert file["dev1234/scopes/0/wave/wave_real"].shape == (1, 2, 8)
+
+
+def test_recorder_netcdf_replace(tmp_path):
+    h5netcdf = pytest.importorskip("h5netcdf")
+    path = tmp_path / "result.nc"
+    with Recorder(path, mode="replace") as recorder:
+        for count in [3, 1]:
+            sweeps = [
+                {"header": {"createdtimestamp": [index]}, "x": np.full(5, count)}
+                for index in range(count)
+            ]
+            recorder.write({"/dev1234/demods/0/sample": [sweeps]})
+    with h5netcdf.File(path, "r") as file:
+        group = file["dev1234/demods/0/sample"]
+        assert group.dimensions["record"].size == 1
+        np.testing.assert_array_equal(group.variables["x"][()], np.ones((1, 5)))
+
+
+def test_record_to(tmp_path):
+    module = MagicMock(_recorder=None)
+    with record_to(module, tmp_path / "result.h5") as recorder:
+        assert module._recorder is recorder
+        with pytest.raises(RuntimeError):
+            with record_to(module, tmp_path / "other.h5"):
+                pass
+        result = {"/dev1234/demods/0/sample.x": [_burst(1)]}
+        assert record(module, result) is result
+    assert module._recorder is None
+    assert recorder.records == 1
+    assert not recorder.is_running
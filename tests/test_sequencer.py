@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock, patch
+
+from zhinst.qcodes import CompileCache
+from zhinst.qcodes.sequencer import compile_arguments
+
+ARGUMENTS = ("const a = 1;", "HDAWG8", "MF\nME", 0, {"samplerate": 2.4e9})
+
+
+def test_compile_cache():
+    cache = CompileCache(maxsize=1)
+    with patch(
+        "zhinst.qcodes.sequencer.compile_seqc", return_value=(b"elf", {"a": 1})
+    ) as compile_seqc:
+        assert cache.compile(ARGUMENTS) == (b"elf", {"a": 1})
+        assert cache.compile(ARGUMENTS) == (b"elf", {"a": 1})
+        compile_seqc.assert_called_once_with(
+            "const a = 1;", "HDAWG8", "MF\nME", 0, samplerate=2.4e9
+        )
+        assert (cache.hits, cache.misses) == (1, 1)
+        other = ARGUMENTS[:4] + ({"samplerate": 2.0e9},)
+        cache.compile(other)
+        assert len(cache) == 1
+        assert cache.lookup(ARGUMENTS) is None
+        assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_compile_cache_directory(tmp_path):
+    CompileCache(directory=tmp_path).store(ARGUMENTS, (b"elf", {"a": 1}))
+    cache = CompileCache(directory=tmp_path)
+    assert cache.lookup(ARGUMENTS) == (b"elf", {"a": 1})
+    cache.clear()
+    assert cache.lookup(ARGUMENTS) is None
+
+
+def _awg(device_type, path):
+    awg = MagicMock(zi_node=path)
+    awg.root_instrument.device_type = device_type
+    awg.root_instrument.device_options.return_value = "MF"
+    awg.root_instrument.system.clocks.sampleclock.freq.return_value = 2.4e9
+    return awg
+
+
+def test_compile_arguments():
+    awg = _awg("SHFQC", "/DEV12000/SGCHANNELS/2/AWG")
+    assert compile_arguments(awg, "const a = 1;") == (
+        "const a = 1;",
+        "SHFQC",
+        "MF",
+        2,
+        {"sequencer": "sg"},
+    )
+    awg = _awg("SHFQC", "/dev12000/qachannels/0/generator")
+    assert compile_arguments(awg, "")[3:] == (0, {"sequencer": "qa"})
+    awg = _awg("HDAWG8", "/dev8000/awgs/3")
+    assert compile_arguments(awg, "")[3:] == (3, {"samplerate": 2.4e9})
+    assert compile_arguments(awg, "", samplerate=1e9)[4] == {"samplerate": 1e9}
+    awg = _awg("UHFQA", "/dev2000/awgs/0")
+    assert compile_arguments(awg, "", a=1)[3:] == (0, {"a": 1})
+    awg.root_instrument.system.clocks.sampleclock.freq.assert_not_called()
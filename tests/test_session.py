@@ -0,0 +1,226 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from unittest.mock import MagicMock, call, patch
+
+import numpy as np
+import pytest
+from zhinst.toolkit.session import PollFlags
+
+from zhinst.qcodes.session import Devices, Session
+
+
+def test_set_transaction():
+    session = MagicMock()
+    device = MagicMock()
+    session._devices.created.return_value = [device]
+    session._tk_object.root.transaction.result.return_value = [("/zi/a", 1)]
+    device._tk_object.root.transaction.result.return_value = [
+        ("/dev1234/a", 2),
+        ("/dev1234/b", 3),
+    ]
+
+    with Session.set_transaction(session, deep=True):
+        pass
+
+    session._tk_object.daq_server.set.assert_called_once_with(
+        [("/zi/a", 1), ("/dev1234/a", 2), ("/dev1234/b", 3)]
+    )
+    session._update_acknowledged.assert_called_once()
+    assert list(session._update_acknowledged.call_args.args[0]) == [
+        "/zi/a",
+        "/dev1234/a",
+        "/dev1234/b",
+    ]
+    for root in [session._tk_object.root, device._tk_object.root]:
+        root.transaction.start.assert_called_once()
+        root.transaction.stop.assert_called_once()
+
+
+def test_set_transaction_error():
+    session = MagicMock()
+    session._devices.created.return_value = []
+    try:
+        with Session.set_transaction(session):
+            raise RuntimeError("test")
+    except RuntimeError:
+        pass
+    session._tk_object.daq_server.set.assert_not_called()
+    session._tk_object.root.transaction.stop.assert_called_once()
+
+
+def test_devices_connected_ttl():
+    tk_devices = MagicMock()
+    tk_devices.connected.return_value = ["dev1234"]
+    devices = Devices(MagicMock(), tk_devices, ttl=60)
+    assert devices.connected() == ["dev1234"]
+    assert len(devices) == 1
+    assert list(devices) == ["dev1234"]
+    tk_devices.connected.assert_called_once()
+    tk_devices.connected.return_value = ["dev1234", "dev5678"]
+    assert devices.refresh() == ["dev1234", "dev5678"]
+    assert len(devices) == 2
+    assert tk_devices.connected.call_count == 2
+    devices.ttl = 0
+    devices.connected()
+    assert tk_devices.connected.call_count == 3
+
+
+def _session_with_index():
+    session = MagicMock()
+    session._parameter_index = {}
+    session._invalidate_parameter_index.side_effect = (
+        lambda serial: Session._invalidate_parameter_index(session, serial)
+    )
+    session._path_to_parameter.side_effect = lambda path: Session._path_to_parameter(
+        session, path
+    )
+    return session
+
+
+def test_poll():
+    session = _session_with_index()
+    session._tk_object.daq_server.poll.return_value = {
+        "/dev1234/demods/0/sample": {"timestamp": np.arange(2), "x": np.ones(2)},
+        # HF2 returns plain arrays without timestamps
+        "/dev1234/demods/0/rate": np.array([1.0]),
+    }
+    with patch("zhinst.qcodes.session.tk_node_to_parameter") as to_parameter:
+        to_parameter.side_effect = lambda device, node: node.path
+        session._tk_object.raw_path_to_node.side_effect = lambda path: MagicMock(
+            path=path
+        )
+        result = Session.poll(session, recording_time=0.2, timeout=1)
+        Session.poll(session)
+    session._tk_object.daq_server.poll.assert_called_with(
+        0.1, 500, flags=PollFlags.DEFAULT.value, flat=True
+    )
+    assert list(result) == ["/dev1234/demods/0/sample", "/dev1234/demods/0/rate"]
+    np.testing.assert_array_equal(result["/dev1234/demods/0/rate"], [1.0])
+    # The parameters are only looked up once
+    assert to_parameter.call_count == 2
+    assert set(session._parameter_index) == {
+        "/dev1234/demods/0/sample",
+        "/dev1234/demods/0/rate",
+    }
+
+
+def test_parameter_index_invalidation():
+    session = _session_with_index()
+    session._parameter_index.update(
+        {"/dev1234/a": 1, "/dev12345/a": 2, "/dev5678/a": 3}
+    )
+    Session.disconnect_device(session, "DEV1234")
+    assert set(session._parameter_index) == {"/dev12345/a", "/dev5678/a"}
+    devices = Devices(session, MagicMock(), ttl=60)
+    devices._connected = ["dev5678"]
+    devices._connected_at = time.monotonic()
+    devices["dev5678"] = MagicMock(serial="dev5678")
+    assert set(session._parameter_index) == {"/dev12345/a"}
+    del devices["dev12345"]
+    assert not session._parameter_index
+
+
+def test_poll_columnar():
+    session = MagicMock()
+    session.poll.return_value = {
+        "sample": {
+            "timestamp": np.arange(3, dtype=np.uint64),
+            "x": np.ones(3),
+            "y": np.zeros(3),
+        },
+        "value": {"timestamp": np.arange(2, dtype=np.uint64), "value": np.ones(2)},
+        "wave": [{"header": {}, "wave": np.ones((2, 4))}],
+    }
+    result = Session.poll_columnar(session)
+    assert result["sample"].dtype.names == ("timestamp", "x", "y")
+    np.testing.assert_array_equal(result["sample"]["timestamp"], np.arange(3))
+    assert result["sample"]["x"].dtype == np.float64
+    assert result["value"].dtype.names == ("timestamp", "value")
+    assert len(result["value"]) == 2
+    assert result["wave"] is session.poll.return_value["wave"]
+
+
+def _upload_session():
+    session = MagicMock()
+    session._compile_cache = None
+    return session
+
+
+@contextmanager
+def _mocked_compiler(compile_program, upload_elf=None):
+    """Compile in threads with a mocked compiler."""
+    with ExitStack() as stack:
+        for target, kwargs in [
+            ("ProcessPoolExecutor", {"new": ThreadPoolExecutor}),
+            (
+                "compile_arguments",
+                {"side_effect": lambda awg, program, **kwargs: (program, kwargs)},
+            ),
+            ("compile_program", {"side_effect": compile_program}),
+            ("upload_elf", {"side_effect": upload_elf}),
+        ]:
+            stack.enter_context(patch(f"zhinst.qcodes.session.{target}", **kwargs))
+        yield
+
+
+def test_upload_programs_order():
+    session = _upload_session()
+    slow, fast = MagicMock(name="slow"), MagicMock(name="fast")
+    fast_uploaded = threading.Event()
+    events = MagicMock()
+
+    def compile_program(arguments):
+        if arguments[0] == "slow":
+            assert fast_uploaded.wait(1)
+        return arguments[0].encode(), {"program": arguments[0]}
+
+    def upload_elf(awg, elf):
+        events.upload_elf(awg, elf)
+        if awg is fast:
+            fast_uploaded.set()
+
+    session.wait_all.side_effect = events.wait_all
+    slow.write_to_waveform_memory.side_effect = events.write_to_waveform_memory
+    fast.commandtable.upload_to_device.side_effect = events.upload_to_device
+    slow.enable.side_effect = lambda value: events.enable(slow)
+    fast.enable.side_effect = lambda value: events.enable(fast)
+    with _mocked_compiler(compile_program, upload_elf):
+        result = Session.upload_programs(
+            session,
+            {slow: "slow", fast: "fast"},
+            waveforms={slow: "waveforms"},
+            command_tables={fast: "ct"},
+            single=False,
+            max_workers=2,
+        )
+    assert result == {slow: {"program": "slow"}, fast: {"program": "fast"}}
+    assert events.mock_calls == [
+        call.upload_elf(fast, b"fast"),
+        call.upload_elf(slow, b"slow"),
+        call.wait_all([(slow.ready, 1), (fast.ready, 1)], timeout=10),
+        call.write_to_waveform_memory("waveforms"),
+        call.upload_to_device("ct"),
+        call.enable(slow),
+        call.enable(fast),
+    ]
+    slow.single.assert_called_once_with(False)
+    session.set_transaction.assert_called_once()
+
+
+def test_upload_programs_compile_error():
+    session = _upload_session()
+    valid, invalid = MagicMock(), MagicMock()
+
+    def compile_program(arguments):
+        if arguments[0] == "invalid":
+            raise RuntimeError("Compilation failed")
+        return b"elf", {}
+
+    with _mocked_compiler(compile_program):
+        with pytest.raises(RuntimeError, match="Compilation failed"):
+            Session.upload_programs(session, {valid: "valid", invalid: "invalid"})
+    session.wait_all.assert_not_called()
+    valid.enable.assert_not_called()
+    invalid.enable.assert_not_called()
@@ -0,0 +1,126 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from zhinst.qcodes.streaming import RingBuffer, Stream, stream_daq_module
+
+
+def _samples(start, stop):
+    samples = np.empty(stop - start, dtype=[("timestamp", "u8"), ("x", "f8")])
+    samples["timestamp"] = np.arange(start, stop)
+    samples["x"] = np.arange(start, stop) * 0.5
+    return samples
+
+
+def test_ring_buffer_wrap():
+    buffer = RingBuffer(5)
+    buffer.append(_samples(0, 3))
+    np.testing.assert_array_equal(buffer.drain()["timestamp"], [0, 1, 2])
+    # The second append wraps across the end of the buffer
+    buffer.append(_samples(3, 7))
+    assert buffer.unread == 4
+    samples = buffer.drain()
+    np.testing.assert_array_equal(samples["timestamp"], [3, 4, 5, 6])
+    np.testing.assert_array_equal(samples["x"], [1.5, 2, 2.5, 3])
+    np.testing.assert_array_equal(buffer.read_latest()["timestamp"], [2, 3, 4, 5, 6])
+    np.testing.assert_array_equal(buffer.read_latest(2)["timestamp"], [5, 6])
+    assert buffer.overflows == 0
+    empty = buffer.drain()
+    assert len(empty) == 0
+    assert empty.dtype == samples.dtype
+
+
+def test_ring_buffer_overflow():
+    buffer = RingBuffer(4)
+    buffer.append(_samples(0, 3))
+    buffer.append(_samples(3, 6))
+    assert buffer.overflows == 2
+    assert buffer.unread == 4
+    np.testing.assert_array_equal(buffer.drain()["timestamp"], [2, 3, 4, 5])
+    # More samples than the capacity in a single append
+    buffer.append(_samples(6, 16))
+    assert buffer.overflows == 8
+    np.testing.assert_array_equal(buffer.drain()["timestamp"], [12, 13, 14, 15])
+    with pytest.raises(ValueError):
+        buffer.append(np.zeros(2))
+
+
+def test_stream_start_stop():
+    session = MagicMock()
+    session.is_hf2_server = False
+    parameter = MagicMock(zi_node="/DEV1234/demods/0/sample")
+    polled = threading.Event()
+
+    def poll(*args, **kwargs):
+        if polled.is_set():
+            return {}
+        polled.set()
+        return {
+            "/dev1234/demods/0/sample": {
+                "timestamp": np.arange(3, dtype=np.uint64),
+                "x": np.ones(3),
+            },
+            "/dev1234/demods/1/sample": {"timestamp": np.arange(2), "x": np.ones(2)},
+        }
+
+    with patch("zhinst.qcodes.streaming.ziDAQServer") as daq_server:
+        connection = daq_server.return_value
+        connection.poll.side_effect = poll
+        stream = Stream(session, [parameter], buffer_size=10)
+        with stream:
+            assert stream.is_running
+            with pytest.raises(RuntimeError):
+                stream.start()
+            assert polled.wait(1)
+        assert not stream.is_running
+    daq_server.assert_called_once_with(session.server_host, session.server_port, 6)
+    connection.subscribe.assert_called_once_with("/dev1234/demods/0/sample")
+    connection.unsubscribe.assert_called_once_with("*")
+    connection.disconnect.assert_called_once()
+    samples = stream.drain(parameter)
+    np.testing.assert_array_equal(samples["timestamp"], [0, 1, 2])
+    assert stream.overflows == {parameter: 0}
+
+
+def test_stream_error():
+    session = MagicMock()
+    parameter = MagicMock(zi_node="/dev1234/demods/0/sample")
+    with patch("zhinst.qcodes.streaming.ziDAQServer") as daq_server:
+        daq_server.return_value.poll.side_effect = RuntimeError("connection lost")
+        stream = Stream(session, [parameter])
+        stream.start()
+        with pytest.raises(RuntimeError, match="connection lost"):
+            stream.stop()
+    daq_server.return_value.disconnect.assert_called_once()
+
+
+def _burst(created, samples=4):
+    return {
+        "header": {"createdtimestamp": np.array([created])},
+        "timestamp": np.arange(samples).reshape(1, samples) + created,
+        "value": np.ones((1, samples)) * created,
+    }
+
+
+def test_stream_daq_module_new_bursts():
+    module = MagicMock()
+    module.raw_module.finished.side_effect = [False, True]
+    module.raw_module.read.side_effect = [
+        {"/dev1234/demods/0/sample.x": [_burst(1), _burst(2), _burst(3)]},
+        {
+            "/dev1234/demods/0/sample.x": [_burst(2), _burst(3), _burst(4)],
+            "/triggernode": ["/dev1234/demods/0/sample.r"],
+        },
+    ]
+    module._get_node.return_value = "x"
+
+    chunks = list(stream_daq_module(module, chunk_size=2, poll_interval=0))
+
+    assert [chunk["x"].bursts for chunk in chunks] == [2, 1, 1]
+    values = np.concatenate([chunk["x"].value for chunk in chunks])
+    assert values.shape == (4, 4)
+    np.testing.assert_array_equal(values[:, 0], [1, 2, 3, 4])
+    assert chunks[0]["x"].timestamp.shape == (2, 4)
+    module._get_node.assert_called_once_with("/dev1234/demods/0/sample.x")
@@ -0,0 +1,145 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from zhinst.qcodes.waiting import (
+    Condition,
+    NodeWaiter,
+    done_condition,
+    sequencer_done,
+    to_condition,
+)
+
+
+def _waiter(connection):
+    waiter = NodeWaiter(MagicMock())
+    waiter._connection = connection
+    return waiter
+
+
+def test_wait_on_value_change_events():
+    connection = MagicMock()
+    connection.get.return_value = {"/dev1234/awgs/0/enable": {"value": [1]}}
+    connection.poll.side_effect = [
+        {},
+        {"/dev1234/awgs/0/enable": {"timestamp": [1, 2], "value": [1, 0]}},
+    ]
+    _waiter(connection).wait([Condition("/DEV1234/awgs/0/enable", 0)])
+    connection.subscribe.assert_called_once_with(["/dev1234/awgs/0/enable"])
+    connection.unsubscribe.assert_called_once_with(["/dev1234/awgs/0/enable"])
+    assert connection.get.call_count == 1
+    assert connection.poll.call_count == 2
+
+
+def test_wait_without_subscription():
+    connection = MagicMock()
+    connection.subscribe.side_effect = RuntimeError
+    connection.get.side_effect = [
+        {"/dev1234/status/time": [1]},
+        {"/dev1234/status/time": [1]},
+        {"/dev1234/status/time": [2]},
+    ]
+    _waiter(connection).wait(
+        [Condition("/dev1234/status/time", 1, invert=True)], sleep_time=0
+    )
+    connection.poll.assert_not_called()
+    connection.unsubscribe.assert_not_called()
+    assert connection.get.call_count == 3
+
+
+def test_wait_timeout():
+    connection = MagicMock()
+    connection.get.return_value = {"/dev1234/awgs/0/enable": {"value": [1]}}
+    connection.poll.return_value = {}
+    with pytest.raises(TimeoutError):
+        _waiter(connection).wait([Condition("/dev1234/awgs/0/enable", 0)], timeout=0.01)
+    connection.unsubscribe.assert_called_once()
+
+
+def test_wait_any():
+    connection = MagicMock()
+    connection.get.return_value = {
+        "/dev1234/awgs/0/enable": {"value": [1]},
+        "/dev5678/awgs/0/enable": {"value": [1]},
+    }
+    connection.poll.side_effect = [{"/dev5678/awgs/0/enable": {"value": [0]}}]
+    conditions = [
+        Condition("/dev1234/awgs/0/enable", 0),
+        Condition("/dev5678/awgs/0/enable", 0),
+    ]
+    met = _waiter(connection).wait(conditions, require_all=False)
+    assert met == [conditions[1]]
+    connection.subscribe.assert_called_once_with(
+        ["/dev1234/awgs/0/enable", "/dev5678/awgs/0/enable"]
+    )
+
+
+def test_wait_concurrently():
+    connection = MagicMock()
+    connection.get.side_effect = lambda paths, **kwargs: {
+        path: {"timestamp": [1], "value": [1]} for path in paths.split(",")
+    }
+    events = iter(
+        [
+            {"/dev1234/awgs/0/enable": {"timestamp": [2], "value": [0]}},
+            {"/dev1234/awgs/1/enable": {"timestamp": [3], "value": [0]}},
+        ]
+    )
+    connection.poll.side_effect = lambda *args, **kwargs: next(events, {})
+    waiter = _waiter(connection)
+    barrier = threading.Barrier(2)
+    errors = []
+
+    def wait(path):
+        try:
+            barrier.wait()
+            waiter.wait([Condition(path, 0)], timeout=1)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=wait, args=(f"/dev1234/awgs/{index}/enable",))
+        for index in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert not waiter._subscriptions
+    unsubscribed = [
+        path for args in connection.unsubscribe.call_args_list for path in args[0][0]
+    ]
+    assert sorted(unsubscribed) == ["/dev1234/awgs/0/enable", "/dev1234/awgs/1/enable"]
+
+
+def test_to_condition():
+    parameter = MagicMock()
+    parameter.zi_node = "/dev1234/awgs/0/ready"
+    parameter.node_info.enum = {"ready": 1}
+    assert to_condition((parameter, 1)) == Condition("/dev1234/awgs/0/ready", 1)
+    assert to_condition((parameter, "ready", True)) == Condition(
+        "/dev1234/awgs/0/ready", 1, True
+    )
+    with pytest.raises(TypeError):
+        to_condition(MagicMock())
+
+
+class _AWG:
+    def __init__(self, single):
+        self.name = "awg_0"
+        self.single = MagicMock(return_value=single)
+        self.enable = MagicMock(zi_node="/dev1234/awgs/0/enable")
+
+    def _done_condition(self):
+        return sequencer_done(self)
+
+
+def test_done_condition():
+    awg = _AWG(single=True)
+    assert done_condition(awg) == (awg.enable, 0)
+    assert to_condition(awg) == Condition("/dev1234/awgs/0/enable", 0)
+    with pytest.raises(RuntimeError):
+        to_condition(_AWG(single=False))
+    assert done_condition(MagicMock()) is None
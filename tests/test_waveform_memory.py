@@ -0,0 +1,137 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from zhinst.toolkit import Waveforms
+
+from zhinst.qcodes.sequencer import upload_elf
+from zhinst.qcodes.waveform_memory import (
+    MemoryWatcher,
+    invalidate,
+    read_from_waveform_memory,
+    read_pulses,
+    write_pulses,
+    write_to_waveform_memory,
+)
+
+
+def test_write_to_waveform_memory_changed_slots():
+    awg = MagicMock()
+    upload = awg._tk_object.write_to_waveform_memory
+    waveforms = Waveforms()
+    waveforms[0] = np.ones(32)
+    waveforms[1] = np.zeros(32)
+
+    write_to_waveform_memory(awg, waveforms)
+    upload.assert_called_once_with(waveforms=waveforms, indexes=[0, 1])
+
+    upload.reset_mock()
+    waveforms[1] = np.ones(32) * 0.5
+    write_to_waveform_memory(awg, waveforms)
+    upload.assert_called_once_with(waveforms=waveforms, indexes=[1])
+
+    upload.reset_mock()
+    write_to_waveform_memory(awg, waveforms)
+    upload.assert_not_called()
+
+    write_to_waveform_memory(awg, waveforms, force=True)
+    upload.assert_called_once_with(waveforms=waveforms, indexes=[0, 1])
+
+    upload.reset_mock()
+    invalidate(awg)
+    write_to_waveform_memory(awg, waveforms, indexes=[0])
+    upload.assert_called_once_with(waveforms=waveforms, indexes=[0])
+
+
+def test_read_from_waveform_memory_cached():
+    awg = MagicMock()
+    waveforms = Waveforms()
+    waveforms[0] = np.ones(32)
+    write_to_waveform_memory(awg, waveforms)
+
+    result = read_from_waveform_memory(awg, indexes=[0])
+    awg._tk_object.read_from_waveform_memory.assert_not_called()
+    np.testing.assert_array_equal(result[0][0], np.ones(32))
+
+    device_waveforms = Waveforms()
+    device_waveforms[0] = np.ones(32)
+    device_waveforms[1] = np.zeros(32)
+    awg._tk_object.read_from_waveform_memory.return_value = device_waveforms
+    read_from_waveform_memory(awg)
+    awg._tk_object.read_from_waveform_memory.assert_called_once_with(indexes=None)
+    assert list(read_from_waveform_memory(awg)) == [0, 1]
+    awg._tk_object.read_from_waveform_memory.assert_called_once()
+
+    invalidate(awg)
+    read_from_waveform_memory(awg, indexes=[0])
+    assert awg._tk_object.read_from_waveform_memory.call_count == 2
+
+
+def test_write_to_waveform_memory_after_elf_upload():
+    awg = MagicMock()
+    elf_data = awg.elf.data
+    elf_data.cache.timestamp = None
+    # QCoDeS updates the cache timestamp on every set
+    elf_data.side_effect = lambda elf: setattr(
+        elf_data.cache, "timestamp", datetime.now()
+    )
+    upload = awg._tk_object.write_to_waveform_memory
+    waveforms = Waveforms()
+    waveforms[0] = np.ones(32)
+
+    upload_elf(awg, b"elf")
+    write_to_waveform_memory(awg, waveforms)
+    upload.assert_called_once_with(waveforms=waveforms, indexes=[0])
+
+    upload.reset_mock()
+    awg.elf.data(b"other elf")
+    write_to_waveform_memory(awg, waveforms)
+    upload.assert_called_once_with(waveforms=waveforms, indexes=[0])
+
+    upload.reset_mock()
+    write_to_waveform_memory(awg, waveforms)
+    upload.assert_not_called()
+
+
+def test_write_to_waveform_memory_external_change():
+    awg = MagicMock(zi_node="/dev8000/awgs/0")
+    session = awg.root_instrument.session
+    session.is_hf2_server = False
+    upload = awg._tk_object.write_to_waveform_memory
+    waveforms = Waveforms()
+    waveforms[0] = np.ones(32)
+    event = {"/dev8000/awgs/0/waveform/waves/0": [{"vector": np.ones(32)}]}
+
+    with patch("zhinst.qcodes.waveform_memory.ziDAQServer") as daq_server:
+        session.memory_watcher = MemoryWatcher(session)
+        connection = daq_server.return_value
+        connection.poll.side_effect = [{}, event, event]
+        write_to_waveform_memory(awg, waveforms)
+        connection.subscribe.assert_called_once_with("/dev8000/awgs/0/waveform/waves/*")
+        upload.assert_called_once()
+        # Event of the own write
+        write_to_waveform_memory(awg, waveforms)
+        upload.assert_called_once()
+        # Change by another client
+        write_to_waveform_memory(awg, waveforms)
+        assert upload.call_count == 2
+        session.memory_watcher.close()
+    connection.disconnect.assert_called_once()
+
+
+def test_write_pulses_after_partial_read():
+    generator = MagicMock()
+    upload = generator._tk_object.write_to_waveform_memory
+    pulses = Waveforms()
+    pulses[0] = np.ones(32)
+    generator._tk_object.read_from_waveform_memory.return_value = pulses
+    read_pulses(generator, slots=[0])
+
+    # Other slots of the memory are unknown and need to be cleared
+    write_pulses(generator, {0: np.ones(32)}, clear_existing=True)
+    upload.assert_called_once()
+    assert upload.call_args.kwargs["clear_existing"]
+
+    upload.reset_mock()
+    write_pulses(generator, {0: np.ones(32)}, clear_existing=True)
+    upload.assert_not_called()